@@ -1,7 +1,10 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, PrivateAttr
+from typing import Iterator, List, Optional
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import abc
+import os
 from ..dstability import DStability
+from .algorithm_cache import AlgorithmCache
 
 
 class AlgorithmExecutionError(Exception):
@@ -12,6 +15,64 @@ class AlgorithmInputCheckError(Exception):
     pass
 
 
+class AlgorithmResult(BaseModel):
+    """The result of an algorithm for one of the models passed to Algorithm.map
+
+    Args:
+        index (int): the index of the model in the list of models
+        models (List[DStability]): the resulting models, one model unless multiple_results was set
+        error (Optional[Exception]): AlgorithmInputCheckError or AlgorithmExecutionError if the algorithm failed
+    """
+
+    index: int
+    models: List[DStability] = []
+    error: Optional[Exception] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def model(self) -> Optional[DStability]:
+        if len(self.models) == 0:
+            return None
+        return self.models[0]
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+
+def _map_model(
+    algorithm: type, index: int, ds: DStability, multiple_results: bool, parameters
+) -> AlgorithmResult:
+    try:
+        alg = algorithm(ds=ds, **parameters)
+        alg._check_input()
+    except Exception as e:
+        return AlgorithmResult(
+            index=index,
+            error=AlgorithmInputCheckError(
+                f"Could not execute algorithm, got error '{e}'"
+            ),
+        )
+
+    try:
+        if multiple_results:
+            models = alg._execute_multiple_results()
+        else:
+            models = [alg._execute()]
+            models[0]._post_process()
+    except Exception as e:
+        return AlgorithmResult(
+            index=index,
+            error=AlgorithmExecutionError(
+                f"Could not execute algorithm, got error '{e}'"
+            ),
+        )
+
+    return AlgorithmResult(index=index, models=models)
+
+
 class Algorithm(BaseModel, metaclass=abc.ABCMeta):
     """Base class for all algorithms
 
@@ -21,7 +82,27 @@ class Algorithm(BaseModel, metaclass=abc.ABCMeta):
     ds: DStability
     log: List[str] = []
 
-    def execute(self) -> DStability:
+    # if set the algorithm changes ds instead of a fork of ds, see Pipeline
+    _in_place: bool = PrivateAttr(default=False)
+
+    def execute(self, cache: Optional[AlgorithmCache] = None) -> DStability:
+        """Execute the algorithm
+
+        Args:
+            cache (Optional[AlgorithmCache], optional): Take the result from (or add the result to) this cache. Defaults to None (no caching).
+
+        Raises:
+            AlgorithmInputCheckError: If the input check fails
+
+        Returns:
+            DStability: The resulting model
+        """
+        if cache is not None:
+            key = cache.key(self)
+            ds = cache.get(key)
+            if ds is not None:
+                return ds
+
         try:
             self._check_input()
         except Exception as e:
@@ -32,6 +113,9 @@ class Algorithm(BaseModel, metaclass=abc.ABCMeta):
         ds = self._execute()
         ds._post_process()
 
+        if cache is not None:
+            cache.put(key, ds)
+
         return ds
 
     def execute_multiple_results(self) -> List[DStability]:
@@ -44,6 +128,97 @@ class Algorithm(BaseModel, metaclass=abc.ABCMeta):
 
         return self._execute_multiple_results()
 
+    def iter_results(self) -> Iterator[DStability]:
+        """Get the results of an algorithm with multiple results one at a time
+
+        Unlike execute_multiple_results the next model is only created when it is
+        requested so only the model you are working on has to be kept in memory.
+
+        Raises:
+            AlgorithmExecutionError: If the input check fails
+
+        Returns:
+            Iterator[DStability]: The resulting models
+        """
+        try:
+            self._check_input()
+        except Exception as e:
+            raise AlgorithmExecutionError(
+                f"Could not execute algorithm, got error '{e}'"
+            )
+
+        return self._iter_results()
+
+    @classmethod
+    def map(
+        cls,
+        models: List[DStability],
+        max_workers: Optional[int] = None,
+        multiple_results: bool = False,
+        **parameters,
+    ) -> Iterator[AlgorithmResult]:
+        """Apply this algorithm with the same parameters to all models in a process pool
+
+        The results are yielded as soon as they are available so they are not in the
+        order of the models, use the index of the result to find the model. If the
+        input check or the execution fails for a model the error is added to the
+        result for that model and the other models are still handled.
+
+        Args:
+            models (List[DStability]): The models
+            max_workers (Optional[int], optional): The maximum number of processes. Defaults to None (the number of cpus).
+            multiple_results (bool, optional): Use execute_multiple_results instead of execute. Defaults to False.
+            parameters: The parameters of the algorithm (all fields except ds)
+
+        Yields:
+            Iterator[AlgorithmResult]: The result for each model
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        # only send a few models at a time to the pool so the models are not all
+        # pickled at once and the caller can process the results in the meantime
+        inputs = enumerate(models)
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            pending = set()
+
+            def submit_next() -> bool:
+                try:
+                    index, ds = next(inputs)
+                except StopIteration:
+                    return False
+                pending.add(
+                    executor.submit(
+                        _map_model, cls, index, ds, multiple_results, parameters
+                    )
+                )
+                return True
+
+            for _ in range(2 * max_workers):
+                if not submit_next():
+                    break
+
+            while len(pending) > 0:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    submit_next()
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _clone(self) -> DStability:
+        """Get the model to change, a fork of the input model unless the algorithm is
+        executed in place
+
+        Returns:
+            DStability: The model to change
+        """
+        if self._in_place:
+            return self.ds
+        return self.ds.fork()
+
     @abc.abstractmethod
     def _check_input(self):
         raise NotImplementedError
@@ -53,3 +228,7 @@ class Algorithm(BaseModel, metaclass=abc.ABCMeta):
 
     def _execute_multiple_results(self) -> List[DStability]:
         raise NotImplementedError
+
+    def _iter_results(self) -> Iterator[DStability]:
+        # algorithms that can create their results one by one should override this
+        yield from self._execute_multiple_results()
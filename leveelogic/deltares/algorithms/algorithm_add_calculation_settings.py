@@ -1,5 +1,4 @@
 from typing import List, Tuple
-from copy import deepcopy
 from shapely.geometry import Polygon, MultiPolygon
 from ...geolib.models.dstability.internal import (
     AnalysisTypeEnum,
@@ -13,7 +12,6 @@ from .algorithm import Algorithm, AlgorithmInputCheckError
 from ..dstability import DStability
 from ...geometry.characteristic_point import CharacteristicPointType
 
-
 DEFAULT_TANGENT_HEIGHT = 5.0
 
 
@@ -47,7 +45,8 @@ class AlgorithmAddCalculationSettings(Algorithm):
         return True
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
+        ds = self._clone()
+        ds.make_writable("calculationsettings")
 
         # the result depends on the calculation method
         if ds.get_analysis_type() == AnalysisTypeEnum.BISHOP_BRUTE_FORCE:
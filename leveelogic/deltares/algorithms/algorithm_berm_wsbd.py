@@ -1,4 +1,3 @@
-from copy import deepcopy
 from math import isnan, nan
 import numpy as np
 from typing import List
@@ -6,7 +5,6 @@ from typing import List
 from ...geolib.geometry import Point
 from ..dstability import DStability
 from .algorithm import Algorithm, AlgorithmInputCheckError
-from ...helpers import polyline_polyline_intersections
 
 
 class AlgorithmBermWSBD(Algorithm):
@@ -99,7 +97,7 @@ class AlgorithmBermWSBD(Algorithm):
                 )
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
+        ds = self._clone()
 
         if self.fill_ditch:
             fp1 = self.ds.get_closest_point_from_x(self.ditch_embankement_side)
@@ -149,7 +147,7 @@ class AlgorithmBermWSBD(Algorithm):
             raise ValueError("No valid berm option given")
 
         # get all intersections with the top of the berm
-        intersections = polyline_polyline_intersections([p3, p4], ds.surface)
+        intersections = ds.surface_intersections([p3, p4])
 
         # get all intersections on the left side of the toe of the levee
         left_intersections = [p for p in intersections if p[0] < p1[0]]
@@ -170,7 +168,7 @@ class AlgorithmBermWSBD(Algorithm):
             pB[1] - (ds.right - pB[0]) / self.slope_bottom,
         )
 
-        intersections = polyline_polyline_intersections([pB, p5], ds.surface)
+        intersections = ds.surface_intersections([pB, p5])
         # if we have no intersections then we do not intersect the surface on the left side
         if len(intersections) == 0:
             raise ValueError(
@@ -178,7 +176,7 @@ class AlgorithmBermWSBD(Algorithm):
             )
         pC = intersections[-1]
 
-        intersections = polyline_polyline_intersections([pA, pB, pC], ds.surface)
+        intersections = ds.surface_intersections([pA, pB, pC])
         intersections = [(round(p[0], 3), round(p[1], 3)) for p in intersections]
 
         if not (round(pA[0], 3), round(pA[1], 3)) in intersections:
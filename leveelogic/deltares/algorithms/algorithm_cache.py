@@ -0,0 +1,168 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Optional, Union
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from uuid import uuid4
+import os
+import pickle
+
+from ..dstability import DStability
+
+
+class AlgorithmCache(BaseModel):
+    """A cache for the results of algorithms
+
+    The key of a result is a hash of the input model content, the algorithm class and
+    the parameters of the algorithm. The last max_items results are kept in memory and
+    if a folder is given the results are also written to disk so they can be used in
+    other sessions. If the files in the folder take more than max_disk_size bytes the
+    least recently used files are removed.
+
+    The cache returns forks of the cached models so changing a returned model with the
+    methods of the DStability class will not change the cache.
+
+    Example:
+        cache = AlgorithmCache(folder="algorithm_cache")
+        ds_berm = AlgorithmBermWSBD(ds=ds, soilcode="K1", height=2.0, width=6.0).execute(cache=cache)
+
+    Args:
+        max_items (int): the maximum number of results in memory, defaults to 128
+        folder (Optional[Union[Path, str]]): the folder for the results on disk, defaults to None (memory only)
+        max_disk_size (int): the maximum size of the files in the folder in bytes, defaults to 1GB
+        hits (int): the number of results taken from the cache
+        misses (int): the number of results that were not in the cache
+    """
+
+    max_items: int = 128
+    folder: Optional[Union[Path, str]] = None
+    max_disk_size: int = 1_000_000_000
+    hits: int = 0
+    misses: int = 0
+
+    _items: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: Lock = PrivateAttr(default_factory=Lock)
+
+    def key(self, algorithm: BaseModel) -> str:
+        """Get the key for the result of the given algorithm
+
+        Args:
+            algorithm (Algorithm): The algorithm with its input model and parameters
+
+        Returns:
+            str: The sha256 hash of the input
+        """
+        s = "|".join(
+            [
+                f"{type(algorithm).__module__}.{type(algorithm).__qualname__}",
+                algorithm.json(exclude={"ds", "log"}),
+                algorithm.ds.content_hash(),
+                # most algorithms change the current stage of the model
+                "{},{}".format(*algorithm.ds._get_stage_key()),
+            ]
+        )
+        return sha256(s.encode("utf-8")).hexdigest()
+
+    def _filename(self, key: str) -> Path:
+        return Path(self.folder) / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[DStability]:
+        """Get a result from the cache
+
+        Args:
+            key (str): The key, see key
+
+        Returns:
+            Optional[DStability]: A fork of the cached model or None if the key is not in the cache
+        """
+        with self._lock:
+            ds = self._items.get(key)
+            if ds is not None:
+                self._items.move_to_end(key)
+
+        if ds is None and self.folder is not None:
+            filename = self._filename(key)
+            try:
+                with open(filename, "rb") as f:
+                    ds = pickle.load(f)
+                # the modification time is used to find the least recently used files
+                os.utime(filename)
+                self._add(key, ds)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # unreadable files (for example written by another version) are removed
+                filename.unlink(missing_ok=True)
+
+        with self._lock:
+            if ds is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ds.fork()
+
+    def put(self, key: str, ds: DStability):
+        """Add a result to the cache
+
+        Args:
+            key (str): The key, see key
+            ds (DStability): The result of the algorithm
+        """
+        ds = ds.fork()
+        self._add(key, ds)
+
+        if self.folder is not None:
+            folder = Path(self.folder)
+            folder.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so other processes never read a half
+            # written file
+            tmp_file = folder / f"{key}_{uuid4().hex}.tmp"
+            try:
+                with open(tmp_file, "wb") as f:
+                    pickle.dump(ds, f)
+                os.replace(tmp_file, self._filename(key))
+            finally:
+                tmp_file.unlink(missing_ok=True)
+            self._evict_files()
+
+    def clear(self, disk: bool = False):
+        """Remove all results from memory
+
+        Args:
+            disk (bool, optional): Also remove the files in the folder. Defaults to False.
+        """
+        with self._lock:
+            self._items.clear()
+        if disk and self.folder is not None:
+            for filename in Path(self.folder).glob("*.pkl"):
+                filename.unlink(missing_ok=True)
+
+    @property
+    def disk_size(self) -> int:
+        if self.folder is None or not Path(self.folder).is_dir():
+            return 0
+        return sum([f.stat().st_size for f in Path(self.folder).glob("*.pkl")])
+
+    def _add(self, key: str, ds: DStability):
+        with self._lock:
+            self._items[key] = ds
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def _evict_files(self):
+        files = []
+        for filename in Path(self.folder).glob("*.pkl"):
+            try:
+                stat = filename.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+
+        total_size = sum([f[1] for f in files])
+        for _, size, filename in sorted(files, key=lambda f: f[0]):
+            if total_size <= self.max_disk_size:
+                break
+            filename.unlink(missing_ok=True)
+            total_size -= size
@@ -1,17 +1,23 @@
-from typing import List, Tuple
-from copy import deepcopy
-from shapely.geometry import Polygon, MultiPolygon
+from typing import Dict, List, Tuple
+from shapely.geometry import Polygon
+import numpy as np
+import shapely
 
 from .algorithm import Algorithm
 from ..dstability import DStability
-from ...geometry.soilpolygon import SoilPolygon
+from ...geometry.geometry_store import GeometryStore
+from ...geometry.topology import TOPOLOGY_DECIMALS, insert_nodes, signed_area
+
+# parts of layers smaller than this area are ignored
+MIN_PART_AREA = 1e-6
 
 
 class AlgorithmCut(Algorithm):
     """This algorithm will cut out the given polygon from the current geometry
 
-    WARNING; You will lose information from the original calculation. This algorithm
-    will ONLY save the layers.
+    Only the layers that intersect the cut are changed, the rest of the model (loads,
+    waternet, calculation settings etc.) is kept. Layers that fall apart in more parts
+    get an extra layer for each part, layers that are cut out completely are removed.
 
     Args:
         points (List[Tuple[float, float]]): list of points that form the lower boundary of the cut
@@ -23,37 +29,74 @@ class AlgorithmCut(Algorithm):
         pass
 
     def _execute(self) -> DStability:
+        ds = self._clone()
+        geometry = ds.geometry
+
         # create a polygon for the crosssection
         top_polygon_points = [
-            (self.ds.left, self.ds.top + 1.0),
-            (self.ds.right, self.ds.top + 1.0),
+            (ds.left, ds.top + 1.0),
+            (ds.right, ds.top + 1.0),
         ]
         top_polygon_points += self.points[::-1]
         top_polygon = Polygon(top_polygon_points)
 
-        # cut it out of the current soillayers
-        final_soilpolygons = []
-        for spg in self.ds.soilpolygons:
-            layer_polygon = Polygon(spg.points)
-            intersections = layer_polygon.difference(top_polygon)
+        # only the layers that intersect the cut can change
+        polygons = geometry.layer_polygons()
+        indices = shapely.STRtree(polygons).query(top_polygon, predicate="intersects")
+        differences = shapely.difference(polygons[indices], top_polygon)
+        changed = (
+            shapely.area(differences) < shapely.area(polygons[indices]) - MIN_PART_AREA
+        )
+        indices, differences = indices[changed], differences[changed]
 
-            if intersections.is_empty:
+        parts, part_index = shapely.get_parts(differences, return_index=True)
+        areas = shapely.area(parts)
+
+        # the original points are kept as they are, the new points are rounded so the
+        # layers on both sides of an edge get exactly the same point
+        original_points = set(map(tuple, geometry.points.tolist()))
+        new_nodes = []
+        layer_parts: Dict[int, List[np.ndarray]] = {int(i): [] for i in indices}
+        for j in np.argsort(-areas, kind="stable").tolist():
+            if areas[j] < MIN_PART_AREA:
                 continue
-            elif type(intersections) == Polygon:
-                final_soilpolygons.append(
-                    SoilPolygon.from_shapely(intersections, spg.soilcode)
-                )
-            elif type(intersections) == MultiPolygon:
-                for geom in intersections.geoms:
-                    final_soilpolygons.append(
-                        SoilPolygon.from_shapely(geom, spg.soilcode)
-                    )
+            layer_index = int(indices[part_index[j]])
+            points = shapely.get_coordinates(parts[j].exterior)[:-1]
+            is_new = np.array(
+                [tuple(p) not in original_points for p in points.tolist()]
+            )
+            points[is_new] = np.round(points[is_new], TOPOLOGY_DECIMALS)
+            new_nodes.append(points[is_new])
+            # remove the duplicate points that can be created by rounding
+            points = points[np.any(points != np.roll(points, 1, axis=0), axis=1)]
+            # keep the orientation of the original layer
+            if np.sign(signed_area(points)) != np.sign(
+                signed_area(geometry.layer(layer_index))
+            ):
+                points = points[::-1]
+            layer_parts[layer_index].append(points)
+
+        # the new points that are on an edge of another layer are added to that layer
+        rings, ring_keys = [], []
+        for i in range(geometry.num_layers):
+            if i in layer_parts:
+                rings += layer_parts[i]
+                ring_keys += [(i, k) for k in range(len(layer_parts[i]))]
             else:
-                t = type(intersections)
-                raise ValueError("Unhandled intersection type")
+                rings.append(geometry.layer(i))
+                ring_keys.append((i, None))
+        if len(new_nodes) > 0:
+            for r, points in insert_nodes(rings, np.vstack(new_nodes)).items():
+                i, k = ring_keys[r]
+                if k is None:
+                    layer_parts[i] = [points]
+                else:
+                    layer_parts[i][k] = points
 
-        # return the final result
-        ds = DStability.from_soilpolygons(
-            final_soilpolygons, self.ds.soilcollection, old_ds=self.ds
+        ds.replace_layers(
+            {
+                geometry.layer_ids[i]: [GeometryStore.to_list(p) for p in parts]
+                for i, parts in layer_parts.items()
+            }
         )
         return ds
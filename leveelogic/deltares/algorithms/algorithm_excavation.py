@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from ...geolib.geometry.one import Point
 from .algorithm import Algorithm
 from ..dstability import DStability
@@ -26,7 +24,12 @@ class AlgorithmExcavation(Algorithm):
             raise ValueError(f"The excavation exceeds the limits of the geometry.")
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
+        ds = self._clone()
+        # add the excavation to the current stage of the model
+        scenario_index, stage_index = ds._get_stage_key()
+        ds.make_writable(
+            "decorations", scenario_index=scenario_index, stage_index=stage_index
+        )
 
         x1 = self.x - self.width / 2.0
         x2 = self.x + self.width / 2.0
@@ -43,6 +46,11 @@ class AlgorithmExcavation(Algorithm):
         excavation_points.append(Point(x=x2, z=z2))
 
         # finally.. we can add this excavation using the adjusted geolib version
-        ds.model.add_excavation(label="excavation", points=excavation_points)
+        ds.model.add_excavation(
+            label="excavation",
+            points=excavation_points,
+            scenario_index=scenario_index,
+            stage_index=stage_index,
+        )
 
         return ds
@@ -1,5 +1,4 @@
-from typing import List
-from copy import deepcopy
+from typing import Iterator, List
 import numpy as np
 
 from ...geolib.models.dstability.internal import PersistablePoint
@@ -28,10 +27,19 @@ class AlgorithmFCPhreaticLineWSBD(Algorithm):
         pass
 
     def _execute_multiple_results(self) -> List[DStability]:
-        result = []
+        return list(self._iter_results())
 
-        for z in np.arange(self.min_level, self.max_level + self.step * 0.5, self.step):
-            ds = deepcopy(self.ds)
+    def _iter_results(self) -> Iterator[DStability]:
+        levels = np.arange(self.min_level, self.max_level + self.step * 0.5, self.step)
+
+        # the geometry is the same for all levels so get all intersections in one call
+        all_surface_intersections = self.ds.surface_intersections_many(
+            [[(self.ds.left, z), (self.ds.right, z)] for z in levels]
+        )
+
+        for z, surface_intersections in zip(levels, all_surface_intersections):
+            ds = self.ds.fork()
+            ds.make_writable("waternets", all_stages=True)
             # get the dx, dz between point 2 and 3 of the phreatic line
             p2 = ds.phreatic_line.Points[1]
             p3 = ds.phreatic_line.Points[2]
@@ -39,12 +47,8 @@ class AlgorithmFCPhreaticLineWSBD(Algorithm):
             dx = float(p3.X) - float(p2.X)
             dz = float(p3.Z) - float(p2.Z)
 
-            surface_intersections = ds.surface_intersections(
-                [(ds.left, z), (ds.right, z)]
-            )
-
             if len(surface_intersections) == 0:
-                self.log.append("No surface intersection at z={z:.2f}")
+                self.log.append(f"No surface intersection at z={z:.2f}")
                 continue
 
             # first point simply get the z value
@@ -131,6 +135,4 @@ class AlgorithmFCPhreaticLineWSBD(Algorithm):
             new_points += org_points[4:]
             ds.set_headline_coordinates("Stijghoogtelijn 3 (PL3)", new_points)
 
-            result.append(ds)
-
-        return result
+            yield ds
@@ -1,10 +1,13 @@
 from typing import List, Tuple
-from copy import deepcopy
-from shapely.geometry import Polygon, MultiPolygon
+from shapely.geometry import Polygon
+import shapely
 
 from .algorithm import Algorithm
 from ..dstability import DStability
-from ...geometry.soilpolygon import SoilPolygon
+from ...geometry.geometry_store import GeometryStore
+
+# parts of the fill smaller than this area are ignored
+MIN_FILL_AREA = 0.01
 
 
 class AlgorithmFill(Algorithm):
@@ -25,37 +28,31 @@ class AlgorithmFill(Algorithm):
             )
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
+        ds = self._clone()
         # create a polygon for the crosssection
-        polygon_points = self.points
-        polygon_points += [
-            (self.points[-1][0], self.ds.bottom),
-            (self.points[0][0], self.ds.bottom),
+        polygon_points = self.points + [
+            (self.points[-1][0], ds.bottom),
+            (self.points[0][0], ds.bottom),
         ]
         fill_polygon = Polygon(polygon_points)
 
-        current_polygon = Polygon(self.ds.boundary)
-
-        new_soilpolygons = []  # layers to add
-        intersections = fill_polygon.difference(current_polygon)
-        if intersections.is_empty:
-            pass
-        elif type(intersections) == Polygon:
-            if intersections.area > 0.01:
-                new_soilpolygons.append(
-                    SoilPolygon.from_shapely(intersections, self.soilcode)
-                )
-        elif type(intersections) == MultiPolygon:
-            for geom in intersections.geoms:
-                if geom.area > 0.01:
-                    new_soilpolygons.append(
-                        SoilPolygon.from_shapely(geom, self.soilcode)
-                    )
-        else:
-            t = type(intersections)
-            raise ValueError("Unhandled intersection type")
-
-        for spg in new_soilpolygons:
-            ds.add_layer(spg.points, self.soilcode, label="fill")
+        # the fill is the part of the polygon outside the current geometry
+        parts = shapely.get_parts(
+            shapely.difference(fill_polygon, Polygon(ds.boundary))
+        )
+        parts = parts[
+            (shapely.get_type_id(parts) == shapely.GeometryType.POLYGON)
+            & (shapely.area(parts) > MIN_FILL_AREA)
+        ]
+
+        if len(parts) > 0:
+            ds.add_layers(
+                [
+                    GeometryStore.to_list(shapely.get_coordinates(part.exterior)[:-1])
+                    for part in parts
+                ],
+                [self.soilcode] * len(parts),
+                labels=["fill"] * len(parts),
+            )
 
         return ds
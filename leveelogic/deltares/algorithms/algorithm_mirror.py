@@ -0,0 +1,31 @@
+from typing import Optional
+
+from ..dstability import DStability
+from ..transform import AffineTransform
+from .algorithm import Algorithm
+
+
+class AlgorithmMirror(Algorithm):
+    """This algorithm will mirror the model around a vertical line, see DStability.transform
+
+    Useful to turn a model with the river on the right side into a model with the
+    river on the left side. Lines like the headlines, reference lines and slip planes
+    will still go from left to right and the left sides of the search grids and
+    search areas are recalculated.
+
+    Args:
+        x (float): the x coordinate of the vertical line, defaults to None (the middle of the geometry)
+    """
+
+    x: Optional[float] = None
+
+    def _check_input(self):
+        pass
+
+    def _execute(self) -> DStability:
+        ds = self._clone()
+        x = self.x
+        if x is None:
+            x = (ds.left + ds.right) / 2.0
+        ds.transform(AffineTransform.mirror(x))
+        return ds
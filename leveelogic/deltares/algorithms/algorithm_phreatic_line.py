@@ -1,5 +1,5 @@
-from copy import deepcopy
 from typing import List, Tuple
+import numpy as np
 
 from ...geolib.geometry import Point
 from ...deltares.algorithms.algorithm import Algorithm
@@ -7,6 +7,80 @@ from ...helpers import polyline_polyline_intersections
 from ...deltares.dstability import DStability
 
 
+def phreatic_lines(
+    ds: DStability,
+    x_ref: float,
+    waterlevels: List[float],
+    waterlevels_polder: List[float],
+    waterlevel_offset: float = 0.1,
+    slope: float = 10,
+    offset_points: List[Tuple[float, float]] = [],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Create the phreatic lines for a number of water levels at once, see
+    AlgorithmPhreaticLine for the rules
+
+    All lines have the same x coordinates so the lines are returned as one array with
+    a row of z coordinates per water level.
+
+    Args:
+        ds (DStability): The model
+        x_ref (float): The x coordinate of the reference point
+        waterlevels (List[float]): The water levels
+        waterlevels_polder (List[float]): The polder level for each water level
+        waterlevel_offset (float, optional): The minimum distance below the surface. Defaults to 0.1.
+        slope (float, optional): The slope (1:slope) after the reference point or the last offset point. Defaults to 10.
+        offset_points (List[Tuple[float, float]], optional): Points relative to the reference point and the water level. Defaults to [].
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The x coordinates (m,) and the z coordinates (n, m) of the lines
+    """
+    waterlevels = np.asarray(waterlevels, dtype=float)
+    waterlevels_polder = np.broadcast_to(
+        np.asarray(waterlevels_polder, dtype=float), waterlevels.shape
+    )
+
+    # leftmost point, reference point and offset points
+    xs = [ds.left, x_ref] + [x_ref + p[0] for p in offset_points]
+    dzs = [0.0, 0.0] + [p[1] for p in offset_points]
+    zs = waterlevels[:, np.newaxis] + np.array(dzs)[np.newaxis, :]
+
+    # follow the surface line and polder_level
+    x0 = xs[-1]
+    z0 = zs[:, -1:]
+    surface = np.array([p for p in ds.surface if p[0] > x0]).reshape(-1, 2)
+    right = np.nonzero(surface[:, 0] == ds.right)[0]
+    if len(right) > 0:
+        surface = surface[: right[0] + 1]
+    sx, sz = surface[:, 0], surface[:, 1]
+
+    z_follow = np.maximum(
+        z0 - (sx - x0)[np.newaxis, :] / slope, waterlevels_polder[:, np.newaxis]
+    )
+
+    # be sure to stay below the surface but if we have a ditch use the polder level
+    # between the start and end of the ditch
+    ditch_points = ds.ditch_points
+    if len(ditch_points) > 0:
+        in_ditch = (sx >= ditch_points[0][0]) & (sx <= ditch_points[-1][0])
+    else:
+        in_ditch = np.zeros(sx.shape, dtype=bool)
+    z_follow = np.where(
+        in_ditch[np.newaxis, :],
+        waterlevels_polder[:, np.newaxis],
+        np.minimum(z_follow, (sz - waterlevel_offset)[np.newaxis, :]),
+    )
+
+    # python's round is used because np.round can round ties to the other side
+    z_follow = np.array(
+        [round(z, 2) for z in z_follow.ravel().tolist()], dtype=float
+    ).reshape(z_follow.shape)
+
+    return (
+        np.concatenate([np.array(xs), sx]),
+        np.concatenate([zs, z_follow], axis=1),
+    )
+
+
 class AlgorithmPhreaticLine(Algorithm):
     x_ref: float
     waterlevel: float
@@ -19,47 +93,17 @@ class AlgorithmPhreaticLine(Algorithm):
         return True
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
-
-        # check if we have a ditch
-        # if so we want to ignore the code to stay below the surface
-        # between the start and end of the ditch
-        ignore_from_x = -9999
-        ignore_until_x = -9999
-        if len(ds.ditch_points) > 0:
-            ignore_from_x = ds.ditch_points[0][0]
-            ignore_until_x = ds.ditch_points[-1][0]
-
-        # add leftmost point
-        plline = [(ds.left, self.waterlevel)]
-        # straight until reference point
-        plline.append((self.x_ref, self.waterlevel))
-
-        # if we have offset points then add them now
-        for p in self.offset_points:
-            x = self.x_ref + p[0]
-            z = self.waterlevel + p[1]
-            plline.append((x, z))
-
-        # follow the surface line and polder_level
-        x0 = plline[-1][0]
-        z0 = plline[-1][1]
-
-        for point in [p for p in ds.surface if p[0] > x0]:
-            dx = point[0] - x0
-            z1 = max(z0 - dx / self.slope, self.waterlevel_polder)
-
-            # be sure to stay below the surface
-            if point[0] < ignore_from_x or point[0] > ignore_until_x:
-                if z1 > point[1] - self.waterlevel_offset:
-                    z1 = point[1] - self.waterlevel_offset
-            else:
-                z1 = self.waterlevel_polder
-
-            plline.append((point[0], round(z1, 2)))
-            if point[0] == ds.right:
-                break
-
-        ds.set_phreatic_line(plline)
+        ds = self._clone()
+
+        xs, zs = phreatic_lines(
+            ds,
+            x_ref=self.x_ref,
+            waterlevels=[self.waterlevel],
+            waterlevels_polder=[self.waterlevel_polder],
+            waterlevel_offset=self.waterlevel_offset,
+            slope=self.slope,
+            offset_points=self.offset_points,
+        )
+        ds.set_phreatic_line(list(zip(xs.tolist(), zs[0].tolist())))
 
         return ds
@@ -0,0 +1,71 @@
+from typing import Iterator, List, Tuple, Union
+import numpy as np
+
+from .algorithm import Algorithm
+from .algorithm_phreatic_line import phreatic_lines
+from ..dstability import DStability
+
+
+class AlgorithmPhreaticLines(Algorithm):
+    """This algorithm will create a model for each water level with the phreatic line
+    created using the rules of AlgorithmPhreaticLine
+
+    All phreatic lines are calculated at once and each line is set on a fork of the
+    input model.
+
+    Args:
+        x_ref (float): the x coordinate of the reference point
+        waterlevels (List[float]): the water levels
+        waterlevels_polder (Union[float, List[float]]): the polder level, one for all water levels or one per water level
+        waterlevel_offset (float): the minimum distance below the surface, defaults to 0.1
+        slope (float): the slope (1:slope) after the reference point or the last offset point, defaults to 10
+        offset_points (List[Tuple[float, float]]): points relative to the reference point and the water level
+
+    Returns:
+        List[DStability]: a list of DStability objects, one for each water level
+    """
+
+    x_ref: float
+    waterlevels: List[float]
+    waterlevels_polder: Union[float, List[float]]
+    waterlevel_offset: float = 0.1
+    slope: float = 10
+    offset_points: List[Tuple[float, float]] = []
+
+    def _check_input(self):
+        if len(self.waterlevels) == 0:
+            raise ValueError("No water levels given")
+        if isinstance(self.waterlevels_polder, list) and len(
+            self.waterlevels_polder
+        ) != len(self.waterlevels):
+            raise ValueError(
+                f"Got {len(self.waterlevels)} water levels but {len(self.waterlevels_polder)} polder levels"
+            )
+
+    def lines(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the phreatic lines without creating the models
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The x coordinates (m,) and the z coordinates (n, m) of the lines
+        """
+        return phreatic_lines(
+            self.ds,
+            x_ref=self.x_ref,
+            waterlevels=self.waterlevels,
+            waterlevels_polder=self.waterlevels_polder,
+            waterlevel_offset=self.waterlevel_offset,
+            slope=self.slope,
+            offset_points=self.offset_points,
+        )
+
+    def _execute_multiple_results(self) -> List[DStability]:
+        return list(self._iter_results())
+
+    def _iter_results(self) -> Iterator[DStability]:
+        xs, zs = self.lines()
+        xs = xs.tolist()
+        for row in zs.tolist():
+            ds = self.ds.fork()
+            ds.set_phreatic_line(list(zip(xs, row)))
+            ds._post_process()
+            yield ds
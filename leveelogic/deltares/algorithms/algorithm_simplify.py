@@ -0,0 +1,36 @@
+from ..dstability import DStability
+from ...geometry.topology import SimplificationReport
+from .algorithm import Algorithm
+
+
+class AlgorithmSimplify(Algorithm):
+    """This algorithm will remove the points of the layers that are (almost) on a line
+    with their neighbours, see DStability.simplify
+
+    Geometries from CPT interpretations and from algorithms like the berm and fill
+    algorithms can have a lot of points that hardly change the shape of the layers.
+    Layers that share an edge keep sharing the same points and the surface level at
+    the characteristic points does not change.
+
+    Args:
+        tolerance (float): the maximum distance between a removed point and the simplified edge
+    """
+
+    tolerance: float
+
+    def _check_input(self):
+        if self.tolerance <= 0.0:
+            raise ValueError(f"The tolerance should be positive, got {self.tolerance}")
+
+    def report(self) -> SimplificationReport:
+        """Get the points that will be removed without keeping the simplified model
+
+        Returns:
+            SimplificationReport: The removed points per layer
+        """
+        return self.ds.fork().simplify(self.tolerance)
+
+    def _execute(self) -> DStability:
+        ds = self._clone()
+        ds.simplify(self.tolerance)
+        return ds
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from ...geolib.models.dstability.loads import TreeLoad, LineLoad
 from ...geolib.geometry.one import Point
 from .algorithm import Algorithm
@@ -36,7 +34,12 @@ class AlgorithmTree(Algorithm):
             )
 
     def _execute(self) -> DStability:
-        ds = deepcopy(self.ds)
+        ds = self._clone()
+        # add the loads to the current stage of the model
+        scenario_index, stage_index = ds._get_stage_key()
+        ds.make_writable(
+            "loads", scenario_index=scenario_index, stage_index=stage_index
+        )
         z = round(ds.z_at(self.x)[0], 2)
         ds.model.add_load(
             TreeLoad(
@@ -44,7 +47,9 @@ class AlgorithmTree(Algorithm):
                 wind_force=self.wind_force,
                 width_of_root_zone=self.width_of_root_zone,
                 angle_of_distribution=self.angle_of_distribution,
-            )
+            ),
+            scenario_index=scenario_index,
+            stage_index=stage_index,
         )
 
         if self.load > 0.0:
@@ -54,7 +59,9 @@ class AlgorithmTree(Algorithm):
                     magnitude=self.load,
                     angle=self.load_angle,
                     angle_of_distribution=self.angle_of_distribution,
-                )
+                ),
+                scenario_index=scenario_index,
+                stage_index=stage_index,
             )
 
         return ds
@@ -0,0 +1,188 @@
+from pydantic import BaseModel
+from typing import Callable, Dict, List, Optional, Type
+from math import isnan, nan
+import numpy as np
+
+from .algorithm import Algorithm
+from ..dstability import DStability
+from ..dseries_calculator import DSeriesCalculator, DStabilityCalculationResult
+
+# positions closer than this are seen as the same position
+LOCATION_TOLERANCE = 1e-6
+
+
+def _calculate_models(
+    models: List[DStability], names: List[str]
+) -> List[DStabilityCalculationResult]:
+    dsc = DSeriesCalculator()
+    dsc.add_models(models, names)
+    dsc.calculate()
+    return [cm.result for cm in dsc.calculation_models]
+
+
+class LocationSweepPoint(BaseModel):
+    """The result for one position of a location sweep
+
+    Args:
+        x (float): the position
+        safety_factor (float): the calculated safety factor, nan if the position is invalid or the calculation failed
+        error (str): the error message of the input check or the calculation
+    """
+
+    x: float
+    safety_factor: float = nan
+    error: str = ""
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error == "" and not isnan(self.safety_factor)
+
+
+class LocationSweepResult(BaseModel):
+    """The safety factor as a function of the position of the algorithm
+
+    Args:
+        points (List[LocationSweepPoint]): the results for all positions sorted on x
+        critical_x (float): the position with the lowest safety factor, nan if no position could be calculated
+        critical_safety_factor (float): the lowest safety factor
+    """
+
+    points: List[LocationSweepPoint] = []
+    critical_x: float = nan
+    critical_safety_factor: float = nan
+
+    @property
+    def xs(self) -> List[float]:
+        return [p.x for p in self.points if p.is_valid]
+
+    @property
+    def safety_factors(self) -> List[float]:
+        return [p.safety_factor for p in self.points if p.is_valid]
+
+
+class LocationSweep(BaseModel):
+    """Find the critical position of an algorithm with an x parameter (like
+    AlgorithmTree or AlgorithmExcavation)
+
+    The algorithm is placed at num_positions positions between x_start and x_end and
+    the models are calculated in parallel. Then the interval around the position
+    with the lowest safety factor is divided into num_refine_positions new positions
+    and this is repeated refine_iterations times. Positions that do not pass the input
+    check of the algorithm are skipped without calculating them.
+
+    Example:
+        sweep = LocationSweep(algorithm=AlgorithmTree, parameters={"tree_height": 10.0}, x_start=10.0, x_end=40.0)
+        result = sweep.execute(ds)
+        print(result.critical_x, result.critical_safety_factor)
+
+    Args:
+        algorithm (Type[Algorithm]): the algorithm class, it needs to have an x parameter
+        parameters (Dict): the other parameters of the algorithm
+        x_start (float): the first position
+        x_end (float): the last position
+        num_positions (int): the number of positions of the first (coarse) sweep
+        num_refine_positions (int): the number of new positions for every refinement
+        refine_iterations (int): the number of refinements
+    """
+
+    algorithm: Type[Algorithm]
+    parameters: Dict = {}
+    x_start: float
+    x_end: float
+    num_positions: int = 10
+    num_refine_positions: int = 4
+    refine_iterations: int = 1
+
+    def _evaluate(
+        self,
+        ds: DStability,
+        xs: List[float],
+        calculate: Callable,
+        points: List[LocationSweepPoint],
+    ):
+        models, names = [], []
+        new_points = []
+        for x in xs:
+            point = LocationSweepPoint(x=x)
+            points.append(point)
+            try:
+                alg = self.algorithm(ds=ds, x=x, **self.parameters)
+                alg._check_input()
+            except Exception as e:
+                point.error = f"Invalid position, got error '{e}'"
+                continue
+
+            try:
+                model = alg._execute()
+                model._post_process()
+            except Exception as e:
+                point.error = f"Could not execute algorithm, got error '{e}'"
+                continue
+
+            models.append(model)
+            names.append(f"{ds.name}_x={x:.3f}")
+            new_points.append(point)
+
+        if len(models) == 0:
+            return
+
+        for point, result in zip(new_points, calculate(models, names)):
+            if result is None:
+                point.error = "Got no calculation result"
+            elif result.error != "":
+                point.error = result.error
+            elif result.safety_factor is None:
+                point.error = "Got no safety factor"
+            else:
+                point.safety_factor = result.safety_factor
+
+    def execute(
+        self, ds: DStability, calculate: Optional[Callable] = None
+    ) -> LocationSweepResult:
+        """Calculate the safety factor for all positions
+
+        Args:
+            ds (DStability): The model
+            calculate (Optional[Callable], optional): A function that gets the models and names and returns a DStabilityCalculationResult for each model. Defaults to None (use the DSeriesCalculator).
+
+        Returns:
+            LocationSweepResult: The safety factors and the critical position
+        """
+        if calculate is None:
+            calculate = _calculate_models
+
+        points = []
+        self._evaluate(
+            ds,
+            np.linspace(self.x_start, self.x_end, self.num_positions).tolist(),
+            calculate,
+            points,
+        )
+
+        for _ in range(self.refine_iterations):
+            valid_points = sorted([p for p in points if p.is_valid], key=lambda p: p.x)
+            if len(valid_points) == 0:
+                break
+
+            # refine between the neighbours of the position with the lowest safety factor
+            i = int(np.argmin([p.safety_factor for p in valid_points]))
+            left = valid_points[max(i - 1, 0)].x
+            right = valid_points[min(i + 1, len(valid_points) - 1)].x
+            xs = [
+                x
+                for x in np.linspace(left, right, self.num_refine_positions + 2)[
+                    1:-1
+                ].tolist()
+                if min([abs(x - p.x) for p in points]) > LOCATION_TOLERANCE
+            ]
+            if len(xs) == 0:
+                break
+            self._evaluate(ds, xs, calculate, points)
+
+        result = LocationSweepResult(points=sorted(points, key=lambda p: p.x))
+        valid_points = [p for p in result.points if p.is_valid]
+        if len(valid_points) > 0:
+            critical = min(valid_points, key=lambda p: p.safety_factor)
+            result.critical_x = critical.x
+            result.critical_safety_factor = critical.safety_factor
+        return result
@@ -0,0 +1,95 @@
+from pydantic import BaseModel, validator
+from typing import Dict, List, Type
+
+from .algorithm import Algorithm, AlgorithmInputCheckError
+from ..dstability import DStability
+
+
+class PipelineStep(BaseModel):
+    """One step of a pipeline
+
+    Args:
+        algorithm (Type[Algorithm]): the algorithm class
+        parameters (Dict): the parameters of the algorithm (all fields except ds)
+    """
+
+    algorithm: Type[Algorithm]
+    parameters: Dict = {}
+
+
+class Pipeline(BaseModel):
+    """Apply a list of algorithms to a model
+
+    The result is the same as executing the algorithms one by one on the result of
+    the previous algorithm but the model is only copied once and all algorithms change
+    that copy. The derived properties (surface, soillayers etc.) are only recalculated
+    when a step needs them and the model is post processed once after the last step.
+
+    Only algorithms that result in one model can be used in a pipeline.
+
+    Example:
+        pipeline = Pipeline(
+            [
+                (AlgorithmFill, {"points": [(15, -5), (25, -5)], "soilcode": "Embankment dry"}),
+                (AlgorithmTree, {"x": 20.0, "tree_height": 10.0}),
+            ]
+        )
+        ds = pipeline.execute(ds)
+
+    Args:
+        steps (List[PipelineStep]): the steps, a step can also be given as a tuple with the algorithm class and the parameters
+    """
+
+    steps: List[PipelineStep] = []
+
+    def __init__(self, steps: List = [], **data):
+        super().__init__(steps=steps, **data)
+
+    @validator("steps", pre=True, each_item=True)
+    def _create_step(cls, value):
+        if isinstance(value, (tuple, list)):
+            algorithm, parameters = value
+            return PipelineStep(algorithm=algorithm, parameters=parameters)
+        return value
+
+    def add(self, algorithm: Type[Algorithm], **parameters) -> "Pipeline":
+        """Add a step to the pipeline
+
+        Args:
+            algorithm (Type[Algorithm]): The algorithm class
+            **parameters: The parameters of the algorithm (all fields except ds)
+
+        Returns:
+            Pipeline: The pipeline so calls can be chained
+        """
+        self.steps.append(PipelineStep(algorithm=algorithm, parameters=parameters))
+        return self
+
+    def execute(self, ds: DStability) -> DStability:
+        """Apply all steps to the model, the given model is not changed
+
+        Args:
+            ds (DStability): The model
+
+        Raises:
+            AlgorithmInputCheckError: If the input check of one of the steps fails
+
+        Returns:
+            DStability: The resulting model
+        """
+        ds = ds.fork()
+        for i, step in enumerate(self.steps):
+            alg = step.algorithm(ds=ds, **step.parameters)
+            alg._in_place = True
+            try:
+                alg._check_input()
+            except Exception as e:
+                raise AlgorithmInputCheckError(
+                    f"Could not execute step {i + 1} ({step.algorithm.__name__}) of the pipeline, got error '{e}'"
+                )
+            # the algorithm works on a (shallow) copy of the model so continue with
+            # the model it returns
+            ds = alg._execute()
+
+        ds._post_process()
+        return ds
@@ -0,0 +1,165 @@
+from pydantic import BaseModel
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
+from itertools import product
+import numpy as np
+
+from .algorithm import Algorithm
+from ..dstability import DStability
+
+
+def parameter_grid(**values: List) -> Iterator[Dict]:
+    """Get all combinations of the given parameter values, the combinations are
+    created when they are requested so large grids do not use memory
+
+    Example:
+        parameter_grid(width=[4.0, 6.0], height=[1.0, 2.0]) gives
+        {"width": 4.0, "height": 1.0}, {"width": 4.0, "height": 2.0}, {"width": 6.0, "height": 1.0} and {"width": 6.0, "height": 2.0}
+
+    Args:
+        **values (List): The values for each parameter
+
+    Yields:
+        Iterator[Dict]: The parameter sets
+    """
+    names = list(values.keys())
+    for combination in product(*[values[name] for name in names]):
+        yield dict(zip(names, combination))
+
+
+def latin_hypercube(
+    num_samples: int, seed: Optional[int] = None, **bounds: Tuple[float, float]
+) -> Iterator[Dict]:
+    """Get a Latin hypercube sample of the given parameter ranges, each range is
+    divided into num_samples intervals and every interval is used exactly once
+
+    Args:
+        num_samples (int): The number of parameter sets
+        seed (Optional[int], optional): The seed for the random generator. Defaults to None (different samples on every call).
+        **bounds (Tuple[float, float]): The minimum and maximum value for each parameter
+
+    Yields:
+        Iterator[Dict]: The parameter sets
+    """
+    rng = np.random.default_rng(seed)
+    names = list(bounds.keys())
+    samples = {}
+    for name in names:
+        vmin, vmax = bounds[name]
+        # one random point in each interval, shuffled per parameter
+        u = (rng.permutation(num_samples) + rng.random(num_samples)) / num_samples
+        samples[name] = vmin + u * (vmax - vmin)
+
+    for i in range(num_samples):
+        yield {name: float(samples[name][i]) for name in names}
+
+
+class SweepVariant(BaseModel):
+    """A unique result of a sweep
+
+    Args:
+        id (int): the id of the variant, the order in which the variants were found
+        fingerprint (str): the hash of the input of the model, see DStability.input_hash
+        parameters (Dict): the first parameter set that resulted in this variant
+        model (DStability): the resulting model
+    """
+
+    id: int
+    fingerprint: str
+    parameters: Dict
+    model: DStability
+
+
+class SweepEntry(BaseModel):
+    """The result of one parameter set of a sweep
+
+    Args:
+        parameters (Dict): the parameter set
+        variant_id (Optional[int]): the id of the resulting variant, None if the algorithm failed
+        error (str): the error message if the algorithm failed
+    """
+
+    parameters: Dict
+    variant_id: Optional[int] = None
+    error: str = ""
+
+
+class Sweep(BaseModel):
+    """Apply an algorithm to a model for a lot of parameter sets and only keep the
+    unique results
+
+    Different parameter sets often lead to the same model, for example because the
+    intersections with the surface are rounded or because a limit is reached. The
+    resulting models are compared using DStability.input_hash with all numbers rounded
+    to the given number of decimals and only the first model with a new hash is
+    yielded as a variant. The entries map every parameter set to its variant.
+
+    Example:
+        sweep = Sweep(algorithm=AlgorithmBermWSBD, parameters={"soilcode": "K1"})
+        for variant in sweep.execute(ds, parameter_grid(width=[4.0, 6.0], height=[1.0, 2.0])):
+            variant.model.serialize(f"berm_{variant.id}.stix")
+
+    Args:
+        algorithm (Type[Algorithm]): the algorithm class
+        parameters (Dict): the parameters that are the same for all parameter sets
+        decimals (int): the number of decimals used to compare the models
+        entries (List[SweepEntry]): the result for each parameter set that has been handled
+        variant_ids (Dict[str, int]): the variant id for each fingerprint
+    """
+
+    algorithm: Type[Algorithm]
+    parameters: Dict = {}
+    decimals: int = 3
+    entries: List[SweepEntry] = []
+    variant_ids: Dict[str, int] = {}
+
+    @property
+    def num_variants(self) -> int:
+        return len(self.variant_ids)
+
+    def entries_for_variant(self, variant_id: int) -> List[SweepEntry]:
+        """Get all parameter sets that resulted in the given variant
+
+        Args:
+            variant_id (int): The variant id
+
+        Returns:
+            List[SweepEntry]: The entries of the parameter sets
+        """
+        return [e for e in self.entries if e.variant_id == variant_id]
+
+    def execute(
+        self, ds: DStability, parameter_sets: Iterable[Dict]
+    ) -> Iterator[SweepVariant]:
+        """Apply the algorithm for every parameter set and yield the unique results
+
+        Args:
+            ds (DStability): The model
+            parameter_sets (Iterable[Dict]): The parameter sets, see parameter_grid and latin_hypercube
+
+        Yields:
+            Iterator[SweepVariant]: The unique results
+        """
+        for parameter_set in parameter_sets:
+            entry = SweepEntry(parameters=parameter_set)
+            self.entries.append(entry)
+            try:
+                model = self.algorithm(
+                    ds=ds, **{**self.parameters, **parameter_set}
+                ).execute()
+            except Exception as e:
+                entry.error = str(e)
+                continue
+
+            fingerprint = model.input_hash(decimals=self.decimals)
+            if fingerprint in self.variant_ids:
+                entry.variant_id = self.variant_ids[fingerprint]
+                continue
+
+            entry.variant_id = len(self.variant_ids)
+            self.variant_ids[fingerprint] = entry.variant_id
+            yield SweepVariant(
+                id=entry.variant_id,
+                fingerprint=fingerprint,
+                parameters=parameter_set,
+                model=model,
+            )
@@ -0,0 +1,390 @@
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+from functools import partial
+from itertools import count
+from types import CodeType, MethodType
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from hashlib import sha256
+from pydantic import BaseModel
+import numpy as np
+
+from .dstability import DStability
+from .dseries_calculator import DSeriesCalculator
+from .algorithms.algorithm import Algorithm
+
+
+class CalculationGraphError(Exception):
+    pass
+
+
+def _return_model(model: DStability) -> DStability:
+    return model
+
+
+def _apply_algorithm(
+    ds: DStability, algorithm: Type[Algorithm], **parameters
+) -> DStability:
+    return algorithm(ds=ds, **parameters).execute()
+
+
+def _calculate_model(ds: DStability, name: str) -> DStability:
+    dsc = DSeriesCalculator(keep_calculated_models=True)
+    dsc.add_model(ds, name)
+    dsc.calculate()
+
+    result = dsc.calculation_models[0].result
+    if result is None:
+        raise CalculationGraphError(f"Got no calculation result for '{name}'")
+    if result.error != "":
+        raise CalculationGraphError(result.error)
+    return result.calculated_model
+
+
+# unique values for the objects that cannot be fingerprinted so their nodes are
+# always recalculated
+_unhashable_counter = count()
+
+
+def _hash_value(value: Any, seen: Optional[Set[int]] = None) -> str:
+    if seen is None:
+        seen = set()
+    if isinstance(value, DStability):
+        return value.content_hash()
+    elif isinstance(value, BaseModel):
+        return value.json()
+    elif isinstance(value, np.ndarray):
+        # repr abbreviates large arrays so hash the data itself
+        data = sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return f"ndarray({value.dtype.str},{value.shape},{data})"
+    elif isinstance(value, dict):
+        return (
+            "{"
+            + ",".join(
+                f"{k}:{_hash_value(value[k], seen)}" for k in sorted(value.keys())
+            )
+            + "}"
+        )
+    elif isinstance(value, (list, tuple)):
+        return "[" + ",".join(_hash_value(v, seen) for v in value) + "]"
+    elif isinstance(value, CodeType):
+        return (
+            f"code({value.co_code.hex()},{value.co_names},"
+            f"{_hash_value(value.co_consts, seen)})"
+        )
+    elif isinstance(value, partial):
+        return (
+            f"partial({_hash_value(value.func, seen)},"
+            f"{_hash_value(value.args, seen)},{_hash_value(value.keywords, seen)})"
+        )
+    elif callable(value):
+        name = f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+        code = getattr(value, "__code__", None)
+        # classes and builtins are identified by their name
+        if code is None or id(value) in seen:
+            return name
+        seen.add(id(value))
+        # functions with the same name (like lambdas) differ in their code, defaults
+        # and the values they use from the enclosing scope, lists, dicts and sets from
+        # the enclosing scope are often changed by the function itself (like a list
+        # of calls) so these are identified by the object instead of the content
+        closure = []
+        for cell in getattr(value, "__closure__", None) or []:
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                contents = None
+            if isinstance(contents, (list, dict, set)):
+                contents = f"{type(contents).__name__}({id(contents)})"
+            closure.append(contents)
+        parts = [
+            _hash_value(code, seen),
+            _hash_value(getattr(value, "__defaults__", None), seen),
+            _hash_value(getattr(value, "__kwdefaults__", None), seen),
+            _hash_value(closure, seen),
+        ]
+        if isinstance(value, MethodType):
+            parts.append(_hash_value(value.__self__, seen))
+        return f"{name}({','.join(parts)})"
+    elif type(value).__repr__ is object.__repr__:
+        return f"unhashable({next(_unhashable_counter)})"
+    return repr(value)
+
+
+class CalculationNode(BaseModel):
+    """A node in the calculation graph
+
+    The function of the node will be called with the results of the dependencies (in
+    the given order) as positional arguments and the parameters as keyword arguments.
+
+    Args:
+        name (str): unique name of the node
+        function (Callable): the function to call
+        dependencies (List[str]): names of the nodes whose results are the input of this node
+        parameters (Dict): keyword arguments for the function
+    """
+
+    name: str
+    function: Callable
+    dependencies: List[str] = []
+    parameters: Dict = {}
+
+    fingerprint: str = ""
+    result: Any = None
+    error: str = ""
+
+    def input_fingerprint(self, dependency_fingerprints: List[str]) -> str:
+        """Get the fingerprint of the current input of this node
+
+        Args:
+            dependency_fingerprints (List[str]): The fingerprints of the dependencies
+
+        Returns:
+            str: The fingerprint
+        """
+        s = "|".join(
+            [_hash_value(self.function), _hash_value(self.parameters)]
+            + dependency_fingerprints
+        )
+        return sha256(s.encode("utf-8")).hexdigest()
+
+
+class CalculationGraph(BaseModel):
+    """A dependency aware scheduler for chained calculations
+
+    Nodes are model sources, algorithm applications, console calculations or plain
+    functions and the edges carry the results from one node to the next. Independent
+    branches are executed concurrently and on a rerun only the nodes with changed
+    input (parameters or upstream results) are recalculated.
+
+    Example:
+        graph = CalculationGraph()
+        graph.add_model("base", ds)
+        graph.add_algorithm("berm", "base", AlgorithmBermWSBD, soilcode="K1", width=6.0, height=2.0)
+        graph.add_calculation("berm_calculated", "berm")
+        results = graph.run()
+    """
+
+    nodes: Dict[str, CalculationNode] = {}
+    log: List[str] = []
+
+    def add_node(
+        self,
+        name: str,
+        function: Callable,
+        dependencies: List[str] = [],
+        parameters: Dict = {},
+    ) -> CalculationNode:
+        """Add a node to the graph
+
+        Args:
+            name (str): The unique name of the node
+            function (Callable): The function to call with the dependency results as positional arguments
+            dependencies (List[str], optional): The names of the input nodes. Defaults to [].
+            parameters (Dict, optional): The keyword arguments for the function. Defaults to {}.
+
+        Raises:
+            CalculationGraphError: If the name is already in use
+
+        Returns:
+            CalculationNode: The added node
+        """
+        if name in self.nodes.keys():
+            raise CalculationGraphError(f"There is already a node named '{name}'")
+
+        node = CalculationNode(
+            name=name,
+            function=function,
+            dependencies=list(dependencies),
+            parameters=dict(parameters),
+        )
+        self.nodes[name] = node
+        return node
+
+    def add_model(self, name: str, model: DStability) -> CalculationNode:
+        """Add a model as a source node
+
+        Args:
+            name (str): The unique name of the node
+            model (DStability): The model
+
+        Returns:
+            CalculationNode: The added node
+        """
+        return self.add_node(name, _return_model, parameters={"model": model})
+
+    def add_algorithm(
+        self, name: str, dependency: str, algorithm: Type[Algorithm], **parameters
+    ) -> CalculationNode:
+        """Add a node that applies the algorithm to the model of the dependency
+
+        Args:
+            name (str): The unique name of the node
+            dependency (str): The name of the node that results in the input model
+            algorithm (Type[Algorithm]): The algorithm class
+            **parameters: The parameters of the algorithm (except ds)
+
+        Returns:
+            CalculationNode: The added node
+        """
+        return self.add_node(
+            name,
+            _apply_algorithm,
+            dependencies=[dependency],
+            parameters={"algorithm": algorithm, **parameters},
+        )
+
+    def add_calculation(self, name: str, dependency: str) -> CalculationNode:
+        """Add a node that calculates the model of the dependency using the console,
+        the result of the node is the calculated model
+
+        Args:
+            name (str): The unique name of the node
+            dependency (str): The name of the node that results in the input model
+
+        Returns:
+            CalculationNode: The added node
+        """
+        return self.add_node(
+            name,
+            _calculate_model,
+            dependencies=[dependency],
+            parameters={"name": name},
+        )
+
+    def update_node(self, name: str, **parameters):
+        """Change the parameters of a node, the node and the nodes that depend on it
+        will be recalculated on the next run
+
+        Args:
+            name (str): The name of the node
+            **parameters: The parameters to change
+        """
+        self._get_node(name).parameters.update(parameters)
+
+    def result(self, name: str) -> Any:
+        """Get the result of the last run of the given node
+
+        Args:
+            name (str): The name of the node
+
+        Returns:
+            Any: The result of the node
+        """
+        return self._get_node(name).result
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """Get the errors of the last run
+
+        Returns:
+            Dict[str, str]: The error per node name for all nodes with an error
+        """
+        return {n.name: n.error for n in self.nodes.values() if n.error != ""}
+
+    def _get_node(self, name: str) -> CalculationNode:
+        if not name in self.nodes.keys():
+            raise CalculationGraphError(f"There is no node named '{name}'")
+        return self.nodes[name]
+
+    def topological_order(self) -> List[str]:
+        """Get the node names in the order of execution
+
+        Raises:
+            CalculationGraphError: If a dependency is unknown or the graph contains a cycle
+
+        Returns:
+            List[str]: The node names
+        """
+        for node in self.nodes.values():
+            for dependency in node.dependencies:
+                if not dependency in self.nodes.keys():
+                    raise CalculationGraphError(
+                        f"Node '{node.name}' depends on unknown node '{dependency}'"
+                    )
+
+        num_dependencies = {
+            n.name: len(set(n.dependencies)) for n in self.nodes.values()
+        }
+        result = [name for name, num in num_dependencies.items() if num == 0]
+
+        i = 0
+        while i < len(result):
+            for node in self.nodes.values():
+                if result[i] in node.dependencies:
+                    num_dependencies[node.name] -= 1
+                    if num_dependencies[node.name] == 0:
+                        result.append(node.name)
+            i += 1
+
+        if len(result) != len(self.nodes):
+            raise CalculationGraphError(
+                f"The graph contains a cycle between the nodes {[n for n in self.nodes.keys() if not n in result]}"
+            )
+        return result
+
+    def run(self, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Run all nodes with changed input, independent nodes will be run concurrently
+
+        If a node fails the error will be stored in the node and the nodes that depend
+        on it will not be executed.
+
+        Args:
+            max_workers (Optional[int], optional): The maximum number of concurrent nodes. Defaults to None (python default).
+
+        Returns:
+            Dict[str, Any]: The result of each node
+        """
+        order = self.topological_order()
+
+        fingerprints = {}
+        for name in order:
+            node = self.nodes[name]
+            fingerprints[name] = node.input_fingerprint(
+                [fingerprints[d] for d in node.dependencies]
+            )
+
+        todo = [
+            name
+            for name in order
+            if fingerprints[name] != self.nodes[name].fingerprint
+            or self.nodes[name].error != ""
+        ]
+        for name in todo:
+            self.nodes[name].fingerprint = ""
+            self.nodes[name].result = None
+            self.nodes[name].error = ""
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            while len(todo) > 0 or len(running) > 0:
+                for name in [n for n in todo]:
+                    node = self.nodes[name]
+                    dependencies = [self.nodes[d] for d in node.dependencies]
+
+                    if any([d.error != "" for d in dependencies]):
+                        node.error = "Skipped because a dependency failed"
+                        todo.remove(name)
+                    elif all([d.fingerprint != "" for d in dependencies]):
+                        running[
+                            executor.submit(
+                                node.function,
+                                *[d.result for d in dependencies],
+                                **node.parameters,
+                            )
+                        ] = name
+                        todo.remove(name)
+
+                if len(running) == 0:
+                    continue
+
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = self.nodes[running.pop(future)]
+                    try:
+                        node.result = future.result()
+                        node.fingerprint = fingerprints[node.name]
+                        self.log.append(f"Executed node '{node.name}'")
+                    except Exception as e:
+                        node.error = f"Got error '{e}'"
+                        self.log.append(f"Node '{node.name}' failed, {node.error}")
+
+        return {name: node.result for name, node in self.nodes.items()}
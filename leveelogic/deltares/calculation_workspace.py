@@ -0,0 +1,103 @@
+from typing import List, Union
+from pydantic import BaseModel, Field
+from pathlib import Path
+from uuid import uuid4
+import os
+import shutil
+import socket
+
+RAM_DISK_FOLDER = Path("/dev/shm")
+
+
+def _default_worker_name() -> str:
+    return f"{socket.gethostname()}_{os.getpid()}"
+
+
+class CalculationWorkspace(BaseModel):
+    """A managed scratch folder for calculation files
+
+    Every worker (process) gets its own subfolder and the files are spread over a
+    number of shard folders so no folder will contain too many files. After the
+    results are extracted the input file and all the files the console created next
+    to it (like .err and log files) are removed.
+
+    Args:
+        root (Union[Path, str]): the folder to create the workspace in
+        worker (str): the name of the worker subfolder, defaults to hostname_pid
+        num_shards (int): the number of shard folders per worker, defaults to 256
+        cleanup (bool): remove the files after the results are extracted, defaults to True
+        keep_on_failure (bool): keep the files of failed calculations, defaults to False
+    """
+
+    root: Union[Path, str]
+    worker: str = Field(default_factory=_default_worker_name)
+    num_shards: int = 256
+    cleanup: bool = True
+    keep_on_failure: bool = False
+
+    @classmethod
+    def in_memory(cls, **kwargs) -> "CalculationWorkspace":
+        """Create a workspace on a RAM disk (tmpfs), only available on systems
+        that provide /dev/shm
+
+        Raises:
+            ValueError: If there is no RAM disk available
+
+        Returns:
+            CalculationWorkspace: The workspace
+        """
+        if not RAM_DISK_FOLDER.is_dir():
+            raise ValueError(
+                f"No RAM disk available, could not find folder '{RAM_DISK_FOLDER}'"
+            )
+        return cls(root=RAM_DISK_FOLDER / "leveelogic", **kwargs)
+
+    @property
+    def worker_folder(self) -> Path:
+        return Path(self.root) / self.worker
+
+    def new_file(self, suffix: str = ".stix") -> Path:
+        """Get a new unique filename in this workspace, the shard folder will be
+        created if it does not exist
+
+        Args:
+            suffix (str, optional): The suffix of the file. Defaults to ".stix".
+
+        Returns:
+            Path: The filename
+        """
+        name = uuid4().hex
+        folder = self.worker_folder / f"{int(name, 16) % self.num_shards:04d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        return folder / f"{name}{suffix}"
+
+    def related_files(self, filename: Union[Path, str]) -> List[Path]:
+        """Get the given file and all files that the console created next to it
+
+        Args:
+            filename (Union[Path, str]): The input file of the calculation
+
+        Returns:
+            List[Path]: The existing files
+        """
+        filename = Path(filename)
+        if not filename.parent.is_dir():
+            return []
+        return [f for f in filename.parent.glob(f"{filename.stem}*") if f.is_file()]
+
+    def release(self, filename: Union[Path, str], failed: bool = False):
+        """Remove the files of a calculation of which the results are extracted
+
+        Args:
+            filename (Union[Path, str]): The input file of the calculation
+            failed (bool, optional): True if the calculation failed. Defaults to False.
+        """
+        if not self.cleanup or (failed and self.keep_on_failure):
+            return
+
+        for f in self.related_files(filename):
+            f.unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove the folder of this worker including all files"""
+        shutil.rmtree(self.worker_folder, ignore_errors=True)
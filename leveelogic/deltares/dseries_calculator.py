@@ -1,4 +1,4 @@
-from typing import List, Union, Dict
+from typing import List, Union, Dict, Optional
 from pydantic import BaseModel
 from enum import IntEnum
 import threading
@@ -7,10 +7,17 @@ from dotenv import load_dotenv
 import os
 from pathlib import Path
 from uuid import uuid1
+from time import perf_counter, time
+import numpy as np
+import simplejson as json
 import logging
 
 from .dstability import DStability
 from .dgeoflow import DGeoFlow
+from .results_store import ResultsStore
+from .calculation_workspace import CalculationWorkspace
+
+logger = logging.getLogger(__name__)
 
 
 class CalculationResult(BaseModel):
@@ -19,6 +26,7 @@ class CalculationResult(BaseModel):
 
 class DStabilityCalculationResult(CalculationResult):
     safety_factor: float = None
+    calculated_model: Optional[DStability] = None
 
 
 class DGeoFlowCalculationResult(CalculationResult):
@@ -31,11 +39,49 @@ class CalculationModelType(IntEnum):
     DGEOFLOW = 2
 
 
+class CalculationTiming(BaseModel):
+    """Timing information of one calculation, all times are in seconds
+
+    Args:
+        queued_at (float): unix time at which the calculation was queued
+        started_at (float): unix time at which the console was started
+        finished_at (float): unix time at which the result was parsed
+        serialize_time (float): time spent writing the stix file
+        queue_time (float): time between writing the stix file and starting the console
+        console_time (float): time spent in the console
+        parse_time (float): time spent reading the result
+        exit_code (int): the exit code of the console
+        stix_size (int): size of the input file in bytes
+        result_size (int): size of the calculated file in bytes
+    """
+
+    name: str
+    filename: str = ""
+    queued_at: float = None
+    started_at: float = None
+    finished_at: float = None
+    serialize_time: float = None
+    queue_time: float = None
+    console_time: float = None
+    parse_time: float = None
+    exit_code: int = None
+    stix_size: int = None
+    result_size: int = None
+    error: str = ""
+
+    @property
+    def total_time(self) -> Optional[float]:
+        if self.queued_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.queued_at
+
+
 class CalculationModel(BaseModel):
     model: Union[DStability, DGeoFlow]
     name: str
     filename: str = ""
     result: Union[DStabilityCalculationResult, DGeoFlowCalculationResult] = None
+    timing: Optional[CalculationTiming] = None
 
     @property
     def type(self):
@@ -52,24 +98,54 @@ class CalculationModelType(IntEnum):
     DGEOFLOW = 2
 
 
-def calculate(exe: str, model: CalculationModel):
+def calculate(
+    exe: str,
+    model: CalculationModel,
+    keep_calculated_model: bool = False,
+    results_store: Optional[ResultsStore] = None,
+    workspace: Optional[CalculationWorkspace] = None,
+):
+    timing = model.timing
+    timing.started_at = time()
+    timing.queue_time = timing.started_at - timing.queued_at - timing.serialize_time
+
+    t0 = perf_counter()
     try:
-        subprocess.call([exe, model.filename])
+        timing.exit_code = subprocess.call([exe, model.filename])
     except Exception as e:
-        model.result.error = f"Got a calculation error; '{e}'"
+        model.result = DStabilityCalculationResult(
+            error=f"Got a calculation error; '{e}'"
+        )
+        timing.console_time = perf_counter() - t0
+        timing.finished_at = time()
+        timing.error = model.result.error
+        if workspace is not None:
+            workspace.release(model.filename, failed=True)
         return
+    timing.console_time = perf_counter() - t0
 
     if model.type == CalculationModelType.DSTABILITY:
+        t0 = perf_counter()
         try:
+            timing.result_size = Path(model.filename).stat().st_size
             ds = DStability.from_stix(model.filename)
+            if results_store is not None:
+                results_store.add_model(ds, name=model.name)
             model.result = DStabilityCalculationResult(
-                safety_factor=ds.model.output[0].FactorOfSafety
+                safety_factor=ds.model.output[0].FactorOfSafety,
+                calculated_model=ds if keep_calculated_model else None,
             )
-            return
         except Exception as e:
             model.result = DStabilityCalculationResult(
                 error=f"Got calculation result error '{e}'"
             )
+        timing.parse_time = perf_counter() - t0
+        timing.finished_at = time()
+        timing.error = model.result.error
+
+        # the results are extracted so we can remove the files
+        if workspace is not None:
+            workspace.release(model.filename, failed=model.result.error != "")
     elif model.type == CalculationModelType.DGEOFLOW:
         raise NotImplementedError()
 
@@ -78,6 +154,10 @@ class DSeriesCalculator(BaseModel):
     calculation_model_type: CalculationModelType = CalculationModelType.NONE
     calculation_models: List[CalculationModel] = []
     logfile: Union[Path, str] = None
+    telemetry_file: Union[Path, str] = None
+    keep_calculated_models: bool = False
+    results_store: Optional[ResultsStore] = None
+    workspace: Optional[CalculationWorkspace] = None
 
     def add_models(self, models: List[Union[DStability, DGeoFlow]], names: List[str]):
         if len(models) != len(names):
@@ -113,63 +193,157 @@ class DSeriesCalculator(BaseModel):
                     f"Adding an incompatible model '{type(model)}' to this calculator"
                 )
 
+    @property
+    def timings(self) -> List[CalculationTiming]:
+        """Get the timing records of the calculated models
+
+        Returns:
+            List[CalculationTiming]: The timing of each calculated model
+        """
+        return [cm.timing for cm in self.calculation_models if cm.timing is not None]
+
+    def timing_summary(self) -> Dict:
+        """Get a summary of the timings of the last calculation run with the mean and
+        the 50th, 90th and 99th percentiles of each phase and the throughput
+
+        Returns:
+            Dict: The summary
+        """
+        timings = [t for t in self.timings if t.finished_at is not None]
+        if len(timings) == 0:
+            return {"count": 0}
+
+        wall_time = max([t.finished_at for t in timings]) - min(
+            [t.queued_at for t in timings]
+        )
+        result = {
+            "count": len(timings),
+            "failed": len([t for t in timings if t.error != ""]),
+            "wall_time": wall_time,
+            "throughput_per_hour": (
+                len(timings) / wall_time * 3600.0 if wall_time > 0 else None
+            ),
+        }
+        for phase in [
+            "serialize_time",
+            "queue_time",
+            "console_time",
+            "parse_time",
+            "total_time",
+        ]:
+            values = [getattr(t, phase) for t in timings]
+            values = np.array([v for v in values if v is not None])
+            if len(values) == 0:
+                continue
+            result[phase] = {
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p90": float(np.percentile(values, 90)),
+                "p99": float(np.percentile(values, 99)),
+                "sum": float(values.sum()),
+            }
+        return result
+
+    def write_timings(self, filename: Union[Path, str]):
+        """Append the timing records to a JSONL file (one json object per line)
+
+        Args:
+            filename (Union[Path, str]): The JSONL file
+        """
+        with open(filename, "a") as f:
+            for timing in self.timings:
+                d = timing.dict()
+                d["total_time"] = timing.total_time
+                f.write(json.dumps(d) + "\n")
+
     def calculate(self):
+        handler = None
         if self.logfile is not None:
-            logging.basicConfig(
-                filename=str(self.logfile),
-                filemode="w",
-                format="%(asctime)s %(levelname)s %(message)s",
-                datefmt="%H:%M:%S",
-                level=logging.INFO,
+            handler = logging.FileHandler(str(self.logfile), mode="w")
+            handler.setFormatter(
+                logging.Formatter(
+                    "%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+                )
             )
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
 
+        # the handler is removed even if the calculations fail
         try:
-            load_dotenv("leveelogic.env")
+            try:
+                load_dotenv("leveelogic.env")
 
-            DSTABILITY_CONSOLE_EXE = os.getenv("DSTABILITY_CONSOLE_EXE")
-            DGEOFLOW_CONSOLE_EXE = os.getenv("DGEOFLOW_CONSOLE_EXE")
-            CALCULATIONS_FOLDER = os.getenv("CALCULATIONS_FOLDER")
+                DSTABILITY_CONSOLE_EXE = os.getenv("DSTABILITY_CONSOLE_EXE")
+                DGEOFLOW_CONSOLE_EXE = os.getenv("DGEOFLOW_CONSOLE_EXE")
+                CALCULATIONS_FOLDER = os.getenv("CALCULATIONS_FOLDER")
 
-            assert Path(DSTABILITY_CONSOLE_EXE).exists()
-            assert Path(DGEOFLOW_CONSOLE_EXE).exists()
-            assert Path(CALCULATIONS_FOLDER).exists()
-        except Exception as e:
-            raise ValueError(f"Error setting up calculation environment, '{e}'")
+                assert Path(DSTABILITY_CONSOLE_EXE).exists()
+                assert Path(DGEOFLOW_CONSOLE_EXE).exists()
+                if self.workspace is None:
+                    assert Path(CALCULATIONS_FOLDER).exists()
+            except Exception as e:
+                raise ValueError(f"Error setting up calculation environment, '{e}'")
 
-        threads = []
-        for calculation_model in self.calculation_models:
-            calculation_model.filename = str(
-                Path(CALCULATIONS_FOLDER) / f"{str(uuid1())}.stix"
-            )
-            calculation_model.model.serialize(calculation_model.filename)
-            if calculation_model.type == CalculationModelType.DSTABILITY:
-                threads.append(
-                    threading.Thread(
-                        target=calculate,
-                        args=[DSTABILITY_CONSOLE_EXE, calculation_model],
-                    )
+            threads = []
+            for calculation_model in self.calculation_models:
+                calculation_model.result = None
+                calculation_model.timing = CalculationTiming(
+                    name=calculation_model.name, queued_at=time()
                 )
-            elif calculation_model.type == CalculationModelType.DGEOFLOW:
-                raise NotImplementedError()
-                threads.append(
-                    threading.Thread(
-                        target=calculate, args=[DGEOFLOW_CONSOLE_EXE, calculation_model]
+                if self.workspace is not None:
+                    calculation_model.filename = str(self.workspace.new_file(".stix"))
+                else:
+                    calculation_model.filename = str(
+                        Path(CALCULATIONS_FOLDER) / f"{str(uuid1())}.stix"
                     )
+                t0 = perf_counter()
+                calculation_model.model.serialize(calculation_model.filename)
+                calculation_model.timing.serialize_time = perf_counter() - t0
+                calculation_model.timing.filename = calculation_model.filename
+                calculation_model.timing.stix_size = (
+                    Path(calculation_model.filename).stat().st_size
                 )
-            else:
-                raise NotImplementedError(
-                    f"Encountered unsupported model '{type(calculation_model)}'"
-                )
+                if calculation_model.type == CalculationModelType.DSTABILITY:
+                    threads.append(
+                        threading.Thread(
+                            target=calculate,
+                            args=[
+                                DSTABILITY_CONSOLE_EXE,
+                                calculation_model,
+                                self.keep_calculated_models,
+                                self.results_store,
+                                self.workspace,
+                            ],
+                        )
+                    )
+                elif calculation_model.type == CalculationModelType.DGEOFLOW:
+                    raise NotImplementedError()
+                    threads.append(
+                        threading.Thread(
+                            target=calculate,
+                            args=[DGEOFLOW_CONSOLE_EXE, calculation_model],
+                        )
+                    )
+                else:
+                    raise NotImplementedError(
+                        f"Encountered unsupported model '{type(calculation_model)}'"
+                    )
 
-            if self.logfile is not None:
-                logging.info(
+                logger.info(
                     f"Added model '{calculation_model.name}' to the calculations as file '{calculation_model.filename}'"
                 )
 
-        logging.info(f"Starting {len(threads)} calculation(s)")
-        for t in threads:
-            t.start()
+            logger.info(f"Starting {len(threads)} calculation(s)")
+            for t in threads:
+                t.start()
+
+            for t in threads:
+                t.join()
+            logger.info(f"Finished {len(threads)} calculation(s)")
 
-        for t in threads:
-            t.join()
-        logging.info(f"Finished {len(threads)} calculation(s)")
+            if self.telemetry_file is not None:
+                self.write_timings(self.telemetry_file)
+        finally:
+            if handler is not None:
+                logger.removeHandler(handler)
+                handler.close()
@@ -1,14 +1,13 @@
-from pydantic import BaseModel, DirectoryPath, FilePath
+from pydantic import BaseModel, DirectoryPath, Field, FilePath, PrivateAttr
 from enum import IntEnum
 from pathlib import Path
-from shapely.geometry import Polygon
-from shapely.geometry.polygon import orient
-from shapely.ops import unary_union
-from typing import Dict, List, Tuple, Union, BinaryIO, Optional
-from dotenv import load_dotenv
-import os
+from typing import Dict, List, Set, Tuple, Union, BinaryIO, Optional
+from hashlib import sha256
+from copy import deepcopy
 import subprocess
-from math import nan
+import json
+import numpy as np
+from shapely.geometry import Point as ShapelyPoint, Polygon
 
 from ..geolib.soils.soil import (
     SoilWeightParameters,
@@ -19,11 +18,15 @@ from ..geolib.geometry.one import Point
 from ..geolib.models.dstability import DStabilityModel
 from ..geolib.models.dstability.internal import (
     PersistableHeadLine,
+    PersistableLayer,
     PersistablePoint,
     ShearStrengthModelTypePhreaticLevelInternal,
     UpliftVanParticleSwarmResult,
+    UpliftVanResult,
     BishopBruteForceResult,
+    BishopResult,
     SpencerGeneticAlgorithmResult,
+    SpencerResult,
     AnalysisTypeEnum,
     Soil,
     SoilVisualisation,
@@ -31,18 +34,52 @@ from ..geolib.models.dstability.internal import (
 )
 from ..geometry.characteristic_point import (
     CharacteristicPoint,
+    CharacteristicPointTable,
     CharacteristicPointType,
 )
 from ..soil.soilcollection import SoilCollection
 from ..geometry.soilprofileN import SoilProfileN
 from ..geometry.soilprofile1 import SoilProfile1
-from ..helpers import polyline_polyline_intersections
 from ..geometry.soilpolygon import SoilPolygon
 from ..geometry.soillayer import SoilLayer
+from ..geometry.geometry_store import GeometryStore
+from ..geometry.topology import SimplificationReport, simplify_layers
+from ..geometry.edge_index import EdgeIndex
+from ..geometry.layer_raster import LayerRaster
+from ..geometry.surface_index import SurfaceIndex
 from ..soil.soil import Soil as LLSoil
+from .transform import AffineTransform, TRANSFORM_SUBSTRUCTURES
+from .stix_migration import (
+    DSTABILITY_MIGRATION_CONSOLE_PATH,
+    DSTABILITY_MIGRATION_CACHE_FOLDER,
+    StixMigrator,
+    is_old_stix,
+)
 
-load_dotenv()
-DSTABILITY_MIGRATION_CONSOLE_PATH = os.getenv("DSTABILITY_MIGRATION_CONSOLE_PATH")
+# the substructures of the datastructure that belong to a stage and the name of the id
+# of the substructure on the stage
+STAGE_SUBSTRUCTURES = {
+    "decorations": "DecorationsId",
+    "geometries": "GeometryId",
+    "loads": "LoadsId",
+    "reinforcements": "ReinforcementsId",
+    "soillayers": "SoilLayersId",
+    "statecorrelations": "StateCorrelationsId",
+    "states": "StateId",
+    "waternetcreatorsettings": "WaternetCreatorSettingsId",
+    "waternets": "WaternetId",
+}
+
+
+def _round_floats(value, decimals: int):
+    if isinstance(value, float):
+        # adding 0.0 turns -0.0 into 0.0
+        return round(value, decimals) + 0.0
+    elif isinstance(value, dict):
+        return {k: _round_floats(v, decimals) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_round_floats(v, decimals) for v in value]
+    return value
 
 
 class MaterialLayoutType(IntEnum):
@@ -55,18 +92,19 @@ class MaterialLayoutType(IntEnum):
 class DStability(BaseModel):
     name: str = ""
     characteristic_points: List[CharacteristicPoint] = []
-    model: DStabilityModel = DStabilityModel()
+    model: DStabilityModel = Field(default_factory=DStabilityModel)
     current_scenario_index: int = 0
     current_stage_index: int = 0
-    soillayers: List[Dict] = []
-    soils: Dict = {}
-    headlines: List[Dict] = []
     result: Dict = {}
-    points: List[Tuple[float, float]] = []
-    boundary: List[Tuple[float, float]] = []
-    surface: List[Tuple[float, float]] = []
     waternet_settings: Dict = {}
 
+    # the derived properties are calculated on first access and cached per
+    # (scenario_index, stage_index), see invalidate
+    _stage_caches: Dict[Tuple[int, int], Dict] = PrivateAttr(default_factory=dict)
+    _soils_cache: Optional[Dict[str, Dict]] = PrivateAttr(default=None)
+    # the ids of the substructures that are shared with a fork, see fork
+    _shared_ids: Set[int] = PrivateAttr(default_factory=set)
+
     @classmethod
     def from_soilprofile1(
         self,
@@ -127,12 +165,11 @@ class DStability(BaseModel):
             )
             soil_ids[soil.code] = soil_id
 
-        for spg in soilpolygons:
-            ds.model.add_layer(
-                label=spg.soilcode,
-                points=[Point(x=p[0], z=p[1]) for p in spg.points],
-                soil_code=spg.soilcode,
-            )
+        ds.model.add_layers(
+            [[Point(x=p[0], z=p[1]) for p in spg.points] for spg in soilpolygons],
+            soil_codes=[spg.soilcode for spg in soilpolygons],
+            labels=[spg.soilcode for spg in soilpolygons],
+        )
 
         if old_ds is not None:
             ws = old_ds.model.datastructure.waternetcreatorsettings[0]
@@ -143,33 +180,42 @@ class DStability(BaseModel):
         return ds
 
     @classmethod
-    def from_stix(cls, stix_file: str, auto_upgrade=True) -> "DStability":
+    def from_stix(
+        cls,
+        stix_file: str,
+        auto_upgrade=True,
+        migration_cache: Optional[str] = DSTABILITY_MIGRATION_CACHE_FOLDER,
+    ) -> "DStability":
         """Generate a DStability object from a stix file
 
+        Old stix files will be migrated if auto_upgrade is True. If a migration cache
+        folder is given (or set as DSTABILITY_MIGRATION_CACHE_FOLDER in the environment)
+        the migrated file is stored in (or taken from) the cache and the original file
+        is left untouched, otherwise the original file is overwritten.
+
         Args:
             stix_file (str): The stix file path
+            auto_upgrade (bool, optional): Migrate old stix files. Defaults to True.
+            migration_cache (Optional[str], optional): The folder for migrated files. Defaults to DSTABILITY_MIGRATION_CACHE_FOLDER.
 
         Returns:
             DStability: A DStability object
         """
         result = DStability()
         result.name = Path(stix_file).stem
-        try:
-            result.model.parse(Path(stix_file))
-        except ValueError as e:
-            if str(e) == "Can't listdir a file" and auto_upgrade:
-                try:
-                    subprocess.run(
-                        [DSTABILITY_MIGRATION_CONSOLE_PATH, stix_file, stix_file]
-                    )
-                    result.model.parse(Path(stix_file))
-                except Exception as e:
-                    raise e
+
+        if auto_upgrade and is_old_stix(stix_file):
+            if migration_cache is not None:
+                stix_file = str(
+                    StixMigrator(cache_folder=migration_cache).migrate(stix_file)
+                )
             else:
-                raise e
+                subprocess.run(
+                    [DSTABILITY_MIGRATION_CONSOLE_PATH, stix_file, stix_file]
+                )
 
+        result.model.parse(Path(stix_file))
         result.set_scenario_and_stage(0, 0)
-        result._post_process()
         return result
 
     @property
@@ -179,7 +225,7 @@ class DStability(BaseModel):
         Returns:
             float: The left x coordinate of the current geometry
         """
-        return min([p[0] for p in self.points])
+        return self.geometry.left
 
     @property
     def right(self) -> float:
@@ -188,7 +234,7 @@ class DStability(BaseModel):
         Returns:
             float: The right x coordinate of the current geometry
         """
-        return max([p[0] for p in self.points])
+        return self.geometry.right
 
     @property
     def top(self) -> float:
@@ -197,7 +243,7 @@ class DStability(BaseModel):
         Returns:
             float: The top z coordinate of the current geometry
         """
-        return max([p[1] for p in self.points])
+        return self.geometry.top
 
     @property
     def bottom(self) -> float:
@@ -206,7 +252,7 @@ class DStability(BaseModel):
         Returns:
             float: The bottom z coordinate of the current geometry
         """
-        return min([p[1] for p in self.points])
+        return self.geometry.bottom
 
     @property
     def phreatic_line(self) -> Optional[PersistableHeadLine]:
@@ -278,24 +324,19 @@ class DStability(BaseModel):
             List[Tuple[float, float]]: List of points or empty list if no ditch is found
         """
 
-        p1 = self.get_characteristic_point(
-            CharacteristicPointType.DITCH_EMBANKEMENT_SIDE
-        )
-        p2 = self.get_characteristic_point(
-            CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE
-        )
-        p3 = self.get_characteristic_point(
-            CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE
-        )
-        p4 = self.get_characteristic_point(CharacteristicPointType.DITCH_LAND_SIDE)
-
-        if p1.is_valid and p2.is_valid and p3.is_valid and p4.is_valid:
-            return [
-                (p1.x, self.z_at(p1.x)),
-                (p2.x, self.z_at(p1.x)),
-                (p3.x, self.z_at(p1.x)),
-                (p4.x, self.z_at(p1.x)),
+        table = self.characteristic_point_table()
+        points = [
+            table.get(point_type)
+            for point_type in [
+                CharacteristicPointType.DITCH_EMBANKEMENT_SIDE,
+                CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE,
+                CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE,
+                CharacteristicPointType.DITCH_LAND_SIDE,
             ]
+        ]
+
+        if all([p.is_valid for p in points]):
+            return [(p.x, p.z) for p in points]
         else:
             return []
 
@@ -317,15 +358,7 @@ class DStability(BaseModel):
         Returns:
             Tuple[float, float]: The x and z coordinate of the closest point
         """
-        result, dlmin = None, 1e9
-
-        for p in self.surface:
-            dl = abs(p[0] - x)
-            if dl < dlmin:
-                result = p
-                dlmin = dl
-
-        return result
+        return self.surface_index().nearest(x)
 
     def add_layer(
         self,
@@ -336,128 +369,296 @@ class DStability(BaseModel):
         scenario_index: Optional[int] = None,
         stage_index: Optional[int] = None,
     ) -> int:
-        self.model.add_layer(
-            [Point(x=p[0], z=p[1]) for p in points],
-            soil_code,
-            label,
+        return self.add_layers(
+            [points],
+            [soil_code],
+            labels=[label],
+            notes=[notes],
+            scenario_index=scenario_index,
+            stage_index=stage_index,
+        )[0]
+
+    def add_layers(
+        self,
+        layers: List[List[Tuple[float, float]]],
+        soil_codes: List[str],
+        labels: Optional[List[str]] = None,
+        notes: Optional[List[str]] = None,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> List[int]:
+        """Add a batch of layers, the layers are connected to the existing layers and
+        to each other in one pass
+
+        Args:
+            layers (List[List[Tuple[float, float]]]): The points of each layer
+            soil_codes (List[str]): The soil code of each layer
+            labels (Optional[List[str]], optional): The label of each layer. Defaults to None.
+            notes (Optional[List[str]], optional): The notes of each layer. Defaults to None.
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None.
+            stage_index (Optional[int], optional): The stage index. Defaults to None.
+
+        Returns:
+            List[int]: The ids of the new layers
+        """
+        self.make_writable(
+            "geometries",
+            "soillayers",
+            scenario_index=self.model.get_scenario_index(scenario_index),
+            stage_index=self.model.get_stage_index(stage_index),
+        )
+        layer_ids = self.model.add_layers(
+            [[Point(x=p[0], z=p[1]) for p in points] for points in layers],
+            soil_codes,
+            labels,
             notes,
             scenario_index,
             stage_index,
         )
-        self._post_process()
+        self.invalidate(
+            soils=False,
+            waternet=False,
+            waternet_creator_settings=False,
+            scenario_index=self.model.get_scenario_index(scenario_index),
+            stage_index=self.model.get_stage_index(stage_index),
+        )
+        return layer_ids
+
+    def replace_layers(
+        self,
+        layers: Dict[str, List[List[Tuple[float, float]]]],
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ):
+        """Replace the points of the given layers, the other layers, the loads, the
+        waternet etc. are left as they are
+
+        Every layer gets a list of polygons. The first polygon replaces the points of
+        the layer, the other polygons are added as new layers with the same soil, label,
+        layer loads and consolidation degrees. A layer without polygons is removed
+        together with the layer loads, consolidations and state points that refer to it.
+        State points end up in the layer that contains their point.
+
+        The caller needs to make sure that the layers still share their points, see
+        geometry.topology.insert_nodes.
+
+        Args:
+            layers (Dict[str, List[List[Tuple[float, float]]]]): The polygons for each layer id
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+        """
+        scenario_index, stage_index = self._get_stage_key(scenario_index, stage_index)
+        self.make_writable(
+            "geometries",
+            "soillayers",
+            "loads",
+            "states",
+            "statecorrelations",
+            scenario_index=scenario_index,
+            stage_index=stage_index,
+        )
+        geometry = self.model._get_geometry(scenario_index, stage_index)
+        soil_layers = self.model._get_soil_layers(scenario_index, stage_index)
+        loads = self.model._get_loads(scenario_index, stage_index)
+        state = self.model._get_state(scenario_index, stage_index)
+        soil_ids = {sl.LayerId: sl.SoilId for sl in soil_layers.SoilLayers}
+
+        # the new layer id for every polygon of the changed layers
+        polygon_ids = {}
+        new_layers = []
+        for layer in geometry.Layers:
+            if layer.Id not in layers:
+                new_layers.append(layer)
+                continue
+            polygon_ids[layer.Id] = []
+            for i, points in enumerate(layers[layer.Id]):
+                persistable_points = [PersistablePoint(X=p[0], Z=p[1]) for p in points]
+                if i == 0:
+                    new_layer = layer.copy(update={"Points": persistable_points})
+                else:
+                    new_layer = PersistableLayer(
+                        Id=str(self.model._get_next_id()),
+                        Label=layer.Label,
+                        Notes=layer.Notes,
+                        Points=persistable_points,
+                    )
+                    soil_layers.add_soillayer(
+                        layer_id=new_layer.Id, soil_id=soil_ids[layer.Id]
+                    )
+                new_layers.append(new_layer)
+                polygon_ids[layer.Id].append(new_layer.Id)
+        geometry.Layers = new_layers
+
+        removed = set([k for k, v in polygon_ids.items() if len(v) == 0])
+        soil_layers.SoilLayers = [
+            sl for sl in soil_layers.SoilLayers if sl.LayerId not in removed
+        ]
+        layer_loads = []
+        for ll in loads.LayerLoads:
+            if ll.LayerId in removed:
+                continue
+            layer_loads.append(ll)
+            layer_loads += [
+                ll.copy(update={"LayerId": layer_id})
+                for layer_id in polygon_ids.get(ll.LayerId, [])[1:]
+            ]
+        loads.LayerLoads = layer_loads
+        for load in (
+            [loads.Earthquake] + loads.LayerLoads + loads.LineLoads + loads.UniformLoads
+        ):
+            consolidations = []
+            for c in load.Consolidations:
+                if c.LayerId in removed:
+                    continue
+                consolidations.append(c)
+                consolidations += [
+                    c.copy(update={"LayerId": layer_id})
+                    for layer_id in polygon_ids.get(c.LayerId, [])[1:]
+                ]
+            load.Consolidations = consolidations
+
+        # move the state points to the polygon that contains them
+        removed_state_point_ids = set()
+        state_points = []
+        for sp in state.StatePoints:
+            layer_ids = polygon_ids.get(sp.LayerId)
+            if layer_ids is not None:
+                x, z = float(sp.Point.X), float(sp.Point.Z)
+                polygons = [Polygon(points) for points in layers[sp.LayerId]]
+                inside = [
+                    layer_id
+                    for layer_id, polygon in zip(layer_ids, polygons)
+                    if polygon.buffer(1e-6).contains(ShapelyPoint(x, z))
+                ]
+                if len(inside) == 0:
+                    removed_state_point_ids.add(sp.Id)
+                    continue
+                sp = sp.copy(update={"LayerId": inside[0]})
+            state_points.append(sp)
+        state.StatePoints = state_points
+
+        if len(removed_state_point_ids) > 0:
+            stage = self.model.datastructure.scenarios[scenario_index].Stages[
+                stage_index
+            ]
+            for state_correlations in self.model.datastructure.statecorrelations:
+                if state_correlations.Id != stage.StateCorrelationsId:
+                    continue
+                for sc in state_correlations.StateCorrelations:
+                    sc.CorrelatedStateIds = [
+                        i
+                        for i in sc.CorrelatedStateIds
+                        if i not in removed_state_point_ids
+                    ]
+
+        self.invalidate(
+            soils=False,
+            waternet=False,
+            waternet_creator_settings=False,
+            scenario_index=scenario_index,
+            stage_index=stage_index,
+        )
+
+    def simplify(
+        self,
+        tolerance: float,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> SimplificationReport:
+        """Remove the points of the layers that are (almost) on a line with their
+        neighbours, see geometry.topology.simplify_layers
+
+        Layers that share an edge keep sharing the same points and the surface points at
+        (or around) the x coordinates of the characteristic points are kept so the
+        surface level at these points does not change.
+
+        Args:
+            tolerance (float): The maximum distance between a removed point and the simplified edge
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            SimplificationReport: The removed points per layer
+        """
+        geometry = self._get_derived("geometry", scenario_index, stage_index)
+        surface = np.array(self._get_derived("surface", scenario_index, stage_index))
+        xs = self.characteristic_point_table(scenario_index, stage_index).xs
+        xs = xs[np.isfinite(xs)]
+        fixed_points = np.zeros((0, 2))
+        if len(surface) > 0 and len(xs) > 0:
+            # the surface point at the x coordinate or the points on both sides
+            right = np.clip(
+                np.searchsorted(surface[:, 0], xs - 1e-3), 0, len(surface) - 1
+            )
+            left = np.where(
+                np.abs(surface[right, 0] - xs) <= 1e-3, right, np.maximum(right - 1, 0)
+            )
+            fixed_points = surface[np.union1d(left, right)]
+
+        masks = simplify_layers(
+            [geometry.layer(i) for i in range(geometry.num_layers)],
+            tolerance,
+            fixed_points=fixed_points,
+        )
+        report = SimplificationReport(
+            tolerance=tolerance,
+            num_points_before=len(geometry.points),
+            num_points_after=len(geometry.points)
+            - sum(int((~mask).sum()) for mask in masks.values()),
+            removed_points={
+                geometry.layer_ids[i]: GeometryStore.to_list(geometry.layer(i)[~mask])
+                for i, mask in masks.items()
+            },
+        )
+        if len(masks) > 0:
+            self.replace_layers(
+                {
+                    geometry.layer_ids[i]: [
+                        GeometryStore.to_list(geometry.layer(i)[mask])
+                    ]
+                    for i, mask in masks.items()
+                },
+                scenario_index=scenario_index,
+                stage_index=stage_index,
+            )
+        return report
 
     def get_characteristic_point(
-        self, point_type: CharacteristicPointType
+        self,
+        point_type: CharacteristicPointType,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
     ) -> CharacteristicPoint:
-        # karakteristieke punten
-        wns = self.model.datastructure.waternetcreatorsettings[0]
-
-        if point_type == CharacteristicPointType.EMBANKEMENT_TOE_WATER_SIDE:
-            if wns.EmbankmentCharacteristics.EmbankmentToeWaterSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.EmbankmentCharacteristics.EmbankmentToeWaterSide),
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOE_WATER_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOE_WATER_SIDE,
-                )
-        elif point_type == CharacteristicPointType.EMBANKEMENT_TOP_WATER_SIDE:
-            if wns.EmbankmentCharacteristics.EmbankmentTopWaterSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.EmbankmentCharacteristics.EmbankmentTopWaterSide),
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOP_WATER_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOP_WATER_SIDE,
-                )
-        elif point_type == CharacteristicPointType.EMBANKEMENT_TOP_LAND_SIDE:
-            if wns.EmbankmentCharacteristics.EmbankmentTopLandSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.EmbankmentCharacteristics.EmbankmentTopLandSide),
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOP_LAND_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOP_LAND_SIDE,
-                )
+        """Get the characteristic point from the waternet creator settings
 
-        elif point_type == CharacteristicPointType.SHOULDER_BASE_LAND_SIDE:
-            if wns.EmbankmentCharacteristics.ShoulderBaseLandSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.EmbankmentCharacteristics.ShoulderBaseLandSide),
-                    point_type=CharacteristicPointType.SHOULDER_BASE_LAND_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.SHOULDER_BASE_LAND_SIDE,
-                )
-        elif point_type == CharacteristicPointType.EMBANKEMENT_TOE_LAND_SIDE:
-            if wns.EmbankmentCharacteristics.EmbankmentToeLandSide is not "NaN":
+        Args:
+            point_type (CharacteristicPointType): The point type
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
 
-                return CharacteristicPoint(
-                    x=float(wns.EmbankmentCharacteristics.EmbankmentToeLandSide),
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOE_LAND_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.EMBANKEMENT_TOE_LAND_SIDE,
-                )
-        elif point_type == CharacteristicPointType.DITCH_EMBANKEMENT_SIDE:
-            if wns.DitchCharacteristics.DitchEmbankmentSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.DitchCharacteristics.DitchEmbankmentSide),
-                    point_type=CharacteristicPointType.DITCH_EMBANKEMENT_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.DITCH_EMBANKEMENT_SIDE,
-                )
-        elif point_type == CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE:
-            if wns.DitchCharacteristics.DitchBottomEmbankmentSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.DitchCharacteristics.DitchBottomEmbankmentSide),
-                    point_type=CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE,
-                )
-        elif point_type == CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE:
-            if wns.DitchCharacteristics.DitchBottomLandSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.DitchCharacteristics.DitchBottomLandSide),
-                    point_type=CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE,
-                )
-        elif point_type == CharacteristicPointType.DITCH_LAND_SIDE:
-            if wns.DitchCharacteristics.DitchLandSide is not "NaN":
-                return CharacteristicPoint(
-                    x=float(wns.DitchCharacteristics.DitchLandSide),
-                    point_type=CharacteristicPointType.DITCH_LAND_SIDE,
-                )
-            else:
-                return CharacteristicPoint(
-                    x=nan,
-                    point_type=CharacteristicPointType.DITCH_LAND_SIDE,
-                )
+        Raises:
+            ValueError: If the point type is not a valid characteristic point type
 
-        else:
-            raise ValueError(
-                f"Invalid characteristic point type ({point_type}) requested"
-            )
+        Returns:
+            CharacteristicPoint: The point with the surface level, the x coordinate is nan if the point is not set
+        """
+        return self.characteristic_point_table(scenario_index, stage_index).get(
+            point_type
+        )
+
+    def characteristic_point_table(
+        self, scenario_index: Optional[int] = None, stage_index: Optional[int] = None
+    ) -> CharacteristicPointTable:
+        """Get the table with all characteristic points of the given stage
+
+        Args:
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            CharacteristicPointTable: The characteristic points
+        """
+        return self._get_derived("characteristic_points", scenario_index, stage_index)
 
     def get_headline_by_label(self, label: str = "") -> PersistableHeadLine:
         for hl in self.model.waternets[0].HeadLines:
@@ -487,6 +688,7 @@ class DStability(BaseModel):
             label (str): Label of the headline
             coords (List[Tuple[float, float]]): New coordinates
         """
+        self.make_writable("waternets", all_stages=True)
         for hl in self.model.waternets[0].HeadLines:
             if hl.Label == label:
                 if len(coords) > len(hl.Points):
@@ -495,7 +697,12 @@ class DStability(BaseModel):
                     )
                 for i in range(len(coords)):
                     hl.Points[i] = PersistablePoint(X=coords[i][0], Z=coords[i][1])
-                self._post_process()
+                self.invalidate(
+                    geometry=False,
+                    soils=False,
+                    waternet_creator_settings=False,
+                    all_stages=True,
+                )
                 return
 
         raise ValueError(f"Invalid headline label '{label}' (not found)")
@@ -543,11 +750,20 @@ class DStability(BaseModel):
         # 1. check if we already have a phreatic line
         if self.has_phreatic_line:
             points = [PersistablePoint(X=p[0], Z=p[1]) for p in points]
-            for i, hl in enumerate(self.model.datastructure.waternets[0].HeadLines):
-                if hl.Id == self.model.datastructure.waternets[0].PhreaticLineId:
-                    self.model.datastructure.waternets[0].HeadLines[i].Points = points
+            waternet = self.model.datastructure.waternets[0]
+            if id(waternet) in self._shared_ids:
+                # only the phreatic line is replaced so the other headlines and the
+                # reference lines can stay shared, the copy is marked as shared so
+                # make_writable copies it completely if it is changed later on
+                waternet = waternet.copy(update={"HeadLines": list(waternet.HeadLines)})
+                self.model.datastructure.waternets[0] = waternet
+                self._shared_ids.add(id(waternet))
+            for i, hl in enumerate(waternet.HeadLines):
+                if hl.Id == waternet.PhreaticLineId:
+                    waternet.HeadLines[i] = hl.copy(update={"Points": points})
                     break
         else:
+            self.make_writable("waternets", all_stages=True)
             self.model.add_head_line(
                 [Point(x=p[0], z=p[1]) for p in points],
                 "Phreatic line",
@@ -555,23 +771,322 @@ class DStability(BaseModel):
                 scenario_index=self.current_scenario_index,
                 stage_index=self.current_stage_index,
             )
-        self._post_process()
+        self.invalidate(
+            geometry=False,
+            soils=False,
+            waternet_creator_settings=False,
+            all_stages=True,
+        )
+
+    def transform(self, transform: AffineTransform):
+        """Apply an affine transformation (translation, mirror and / or scale) to all
+        coordinates of the model (all stages) including the calculation settings,
+        waternet creator settings and characteristic points, see AffineTransform
+
+        The results of the model are not transformed.
+
+        Args:
+            transform (AffineTransform): The transformation
+        """
+        self.make_writable(*TRANSFORM_SUBSTRUCTURES, all_stages=True)
+        transform.apply(
+            [
+                getattr(self.model.datastructure, name)
+                for name in TRANSFORM_SUBSTRUCTURES
+            ]
+        )
+
+        if len(self.characteristic_points) > 0:
+            xs = transform.apply_x(np.array([p.x for p in self.characteristic_points]))
+            zs = transform.apply_z(np.array([p.z for p in self.characteristic_points]))
+            for p, x, z in zip(self.characteristic_points, xs.tolist(), zs.tolist()):
+                p.x, p.z = x, z
+
+        self.invalidate(all_stages=True)
+
+    def invalidate(
+        self,
+        geometry: bool = True,
+        soils: bool = True,
+        waternet: bool = True,
+        waternet_creator_settings: bool = True,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+        all_stages: bool = False,
+    ):
+        """Mark the derived properties (points, soillayers, soils, boundary, surface,
+        headlines and characteristic points) as outdated, they will be recalculated on
+        the next access. Call this after you changed the model directly, the methods of
+        this class already do this.
+
+        Args:
+            geometry (bool, optional): The geometry has changed. Defaults to True.
+            soils (bool, optional): The soils have changed. Defaults to True.
+            waternet (bool, optional): The waternet has changed. Defaults to True.
+            waternet_creator_settings (bool, optional): The waternet creator settings (with the characteristic points) have changed. Defaults to True.
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+            all_stages (bool, optional): Invalidate all scenarios and stages. Defaults to False.
+        """
+        if soils:
+            # the soils are shared by all stages and the soillayers refer to them
+            self._soils_cache = None
+            for stage_cache in self._stage_caches.values():
+                stage_cache.pop("soillayers", None)
+
+        if all_stages:
+            stage_caches = self._stage_caches.values()
+        else:
+            stage_caches = [self._get_stage_cache(scenario_index, stage_index)]
+
+        for stage_cache in stage_caches:
+            if geometry:
+                # everything but the headlines depends on the geometry
+                for key in [k for k in stage_cache.keys() if k != "headlines"]:
+                    stage_cache.pop(key)
+            if waternet:
+                stage_cache.pop("headlines", None)
+            if waternet_creator_settings:
+                stage_cache.pop("characteristic_points", None)
+
+    def __getstate__(self):
+        # the caches are recalculated when needed and the ids of the shared
+        # substructures are only valid in this process so these are not pickled
+        state = super().__getstate__()
+        state["__private_attribute_values__"] = {}
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._init_private_attributes()
+
+    def fork(self) -> "DStability":
+        """Create a copy of this model that shares all substructures (geometries, soils,
+        waternets, results etc.) with this model. A substructure is only copied once it
+        is changed by one of the methods of this class or after calling make_writable so
+        creating a fork is cheap even for models with a lot of results.
+
+        If you change ds.model of a fork (or of a model that has been forked) directly
+        call make_writable for the substructures you change first.
+
+        Returns:
+            DStability: The fork
+        """
+        datastructure = self.model.datastructure
+        lists, shared_ids = {}, set()
+        for name in datastructure.__fields__.keys():
+            value = getattr(datastructure, name)
+            if isinstance(value, list):
+                # the fork gets its own lists so adding items does not affect this model
+                lists[name] = list(value)
+                shared_ids.update([id(item) for item in value])
+            elif value is not None:
+                shared_ids.add(id(value))
+
+        model = self.model.copy(
+            update={"datastructure": datastructure.copy(update=lists)}
+        )
+        ds = self.copy(
+            update={
+                "model": model,
+                "characteristic_points": deepcopy(self.characteristic_points),
+                "result": deepcopy(self.result),
+                "waternet_settings": deepcopy(self.waternet_settings),
+            }
+        )
+
+        # the cached values are replaced (never changed) on invalidation so the fork
+        # can use them as long as it has its own caches
+        ds._stage_caches = {k: dict(v) for k, v in self._stage_caches.items()}
+        ds._soils_cache = self._soils_cache
+
+        # both models need to copy the shared substructures before changing them
+        self._shared_ids.update(shared_ids)
+        ds._shared_ids = set(self._shared_ids)
+        return ds
+
+    def make_writable(
+        self,
+        *names: str,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+        all_stages: bool = False,
+    ):
+        """Make sure that the given substructures of the datastructure are not shared
+        with a fork of (or the original of) this model, see fork
+
+        Args:
+            names (str): The names of the substructures in ds.model.datastructure like 'geometries' or 'soils'
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+            all_stages (bool, optional): Make the substructures of all stages writable. Defaults to False.
+        """
+        if len(self._shared_ids) == 0:
+            return
+
+        datastructure = self.model.datastructure
+        for name in names:
+            value = getattr(datastructure, name)
+            if not isinstance(value, list):
+                if id(value) in self._shared_ids:
+                    self._shared_ids.discard(id(value))
+                    setattr(datastructure, name, deepcopy(value))
+                continue
+
+            if name in STAGE_SUBSTRUCTURES and not all_stages:
+                scenario_index, stage_index = self._get_stage_key(
+                    scenario_index, stage_index
+                )
+                stage = datastructure.scenarios[scenario_index].Stages[stage_index]
+                item_id = getattr(stage, STAGE_SUBSTRUCTURES[name])
+                indices = [i for i, item in enumerate(value) if item.Id == item_id]
+            else:
+                indices = range(len(value))
+
+            for i in indices:
+                if id(value[i]) in self._shared_ids:
+                    self._shared_ids.discard(id(value[i]))
+                    value[i] = deepcopy(value[i])
 
     def _post_process(self):
-        """Do some post processing stuff to set properties and save time"""
-        # get the points
-        layers = self.model._get_geometry(
-            self.current_scenario_index, self.current_stage_index
-        ).Layers
-        polygons = []
-        self.points = []
-
-        self.soillayers = []
-        self.soils = {}
-        self.points = []
-        self.boundary = []
-        self.surface = []
+        """Invalidate the derived properties of the current stage"""
+        self.invalidate()
+
+    def _get_stage_key(
+        self, scenario_index: Optional[int] = None, stage_index: Optional[int] = None
+    ) -> Tuple[int, int]:
+        if scenario_index is None:
+            scenario_index = self.current_scenario_index
+        if stage_index is None:
+            stage_index = self.current_stage_index
+        # the geolib model uses -1 for the last scenario / stage
+        if scenario_index < 0:
+            scenario_index += self.num_scenarios
+        if stage_index < 0:
+            stage_index += self.num_stages(scenario_index)
+        return scenario_index, stage_index
+
+    def _get_stage_cache(
+        self, scenario_index: Optional[int] = None, stage_index: Optional[int] = None
+    ) -> Dict:
+        return self._stage_caches.setdefault(
+            self._get_stage_key(scenario_index, stage_index), {}
+        )
+
+    def _get_derived(
+        self,
+        key: str,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ):
+        scenario_index, stage_index = self._get_stage_key(scenario_index, stage_index)
+        stage_cache = self._get_stage_cache(scenario_index, stage_index)
+        if key not in stage_cache:
+            if key == "geometry":
+                stage_cache[key] = self._calculate_geometry(scenario_index, stage_index)
+            elif key == "edge_index":
+                stage_cache[key] = EdgeIndex.from_geometry(
+                    self._get_derived("geometry", scenario_index, stage_index)
+                )
+            elif key == "surface_index":
+                stage_cache[key] = SurfaceIndex.from_surface(
+                    self._get_derived("geometry", scenario_index, stage_index).surface
+                )
+            elif key in ["points", "boundary", "surface"]:
+                stage_cache[key] = GeometryStore.to_list(
+                    getattr(
+                        self._get_derived("geometry", scenario_index, stage_index), key
+                    )
+                )
+            elif key == "soillayers":
+                stage_cache[key] = self._calculate_soillayers(
+                    scenario_index, stage_index
+                )
+            elif key == "headlines":
+                stage_cache[key] = self._calculate_headlines(
+                    scenario_index, stage_index
+                )
+            elif key == "characteristic_points":
+                stage_cache[key] = (
+                    CharacteristicPointTable.from_waternet_creator_settings(
+                        self.model._get_waternet_creator_settings(
+                            scenario_index, stage_index
+                        ),
+                        self._get_derived("surface_index", scenario_index, stage_index),
+                    )
+                )
+        return stage_cache[key]
+
+    @property
+    def geometry(self) -> GeometryStore:
+        """Get the array based geometry store of the current stage
 
+        Returns:
+            GeometryStore: The geometry store
+        """
+        return self._get_derived("geometry")
+
+    @property
+    def points(self) -> List[Tuple[float, float]]:
+        """Get all points of all layers of the current stage
+
+        Returns:
+            List[Tuple[float, float]]: The points (x,z)
+        """
+        return self._get_derived("points")
+
+    @property
+    def boundary(self) -> List[Tuple[float, float]]:
+        """Get the boundary of the geometry of the current stage (clockwise)
+
+        Returns:
+            List[Tuple[float, float]]: The points of the boundary (x,z)
+        """
+        return self._get_derived("boundary")
+
+    @property
+    def surface(self) -> List[Tuple[float, float]]:
+        """Get the surface of the geometry of the current stage from left to right
+
+        Returns:
+            List[Tuple[float, float]]: The points of the surface (x,z)
+        """
+        return self._get_derived("surface")
+
+    @property
+    def soillayers(self) -> List[Dict]:
+        """Get the layers of the current stage with the points, soil and layer id
+
+        Returns:
+            List[Dict]: The soillayers
+        """
+        return self._get_derived("soillayers")
+
+    @property
+    def headlines(self) -> List[Dict]:
+        """Get the headlines of the current stage with the label, points and phreatic flag
+
+        Returns:
+            List[Dict]: The headlines
+        """
+        return self._get_derived("headlines")
+
+    @property
+    def soils(self) -> List[Dict]:
+        """Get the soils of the model with the code, name, color and parameters
+
+        Returns:
+            List[Dict]: The soils
+        """
+        return list(self._get_soils_by_id().values())
+
+    def _get_soils_by_id(self) -> Dict[str, Dict]:
+        if self._soils_cache is None:
+            self._soils_cache = self._calculate_soils()
+        return self._soils_cache
+
+    def _calculate_soils(self) -> Dict[str, Dict]:
+        soils = {}
         soilcolors = {
             sv.SoilId: sv.Color[:1] + sv.Color[3:]  # remove the alpha part
             for sv in self.model.datastructure.soilvisualizations.SoilVisualizations
@@ -582,7 +1097,7 @@ class DStability(BaseModel):
                 color = "#54575c"
             else:
                 color = soilcolors[soil.Id]
-            self.soils[soil.Id] = {
+            soils[soil.Id] = {
                 "code": soil.Code,
                 "name": soil.Name,
                 "color": color,
@@ -597,10 +1112,10 @@ class DStability(BaseModel):
                 and soil.ShearStrengthModelTypeAbovePhreaticLevel
                 == soil.ShearStrengthModelTypeAbovePhreaticLevel
             ):
-                self.soils[soil.Id][
+                soils[soil.Id][
                     "cohesion"
                 ] = soil.MohrCoulombClassicShearStrengthModel.Cohesion
-                self.soils[soil.Id][
+                soils[soil.Id][
                     "friction_angle"
                 ] = soil.MohrCoulombClassicShearStrengthModel.FrictionAngle
             if (
@@ -609,70 +1124,57 @@ class DStability(BaseModel):
                 and soil.ShearStrengthModelTypeAbovePhreaticLevel
                 == soil.ShearStrengthModelTypeAbovePhreaticLevel
             ):
-                self.soils[soil.Id][
+                soils[soil.Id][
                     "cohesion"
                 ] = soil.MohrCoulombAdvancedShearStrengthModel.Cohesion
-                self.soils[soil.Id][
+                soils[soil.Id][
                     "friction_angle"
                 ] = soil.MohrCoulombAdvancedShearStrengthModel.FrictionAngle
 
-        soillayers = {}
-        for sl in self.model.datastructure.soillayers[0].SoilLayers:
-            soillayers[sl.LayerId] = sl.SoilId
-
-        for layer in layers:
-            self.points += [(float(p.X), float(p.Z)) for p in layer.Points]
-            polygons.append(Polygon([(float(p.X), float(p.Z)) for p in layer.Points]))
-            self.soillayers.append(
-                {
-                    "points": [(float(p.X), float(p.Z)) for p in layer.Points],
-                    "soil": self.soils[soillayers[layer.Id]],
-                    "layer_id": layer.Id,
-                }
-            )
-
-        # now remove the ids of the soils
-        self.soils = [d for d in self.soils.values()]
-
-        # get the surface
-        # merge all polygons and return the boundary of that polygon
-        boundary = orient(unary_union(polygons), sign=-1)
+        return soils
+
+    def _calculate_soillayers(
+        self, scenario_index: int, stage_index: int
+    ) -> List[Dict]:
+        soils = self._get_soils_by_id()
+        layer_soil_ids = {
+            sl.LayerId: sl.SoilId
+            for sl in self.model._get_soil_layers(
+                scenario_index, stage_index
+            ).SoilLayers
+        }
+        geometry = self._get_derived("geometry", scenario_index, stage_index)
 
-        # get the points
-        self.boundary = [
-            (round(p[0], 3), round(p[1], 3))
-            for p in list(zip(*boundary.exterior.coords.xy))[:-1]
+        return [
+            {
+                "points": GeometryStore.to_list(geometry.layer(i)),
+                "soil": soils[layer_soil_ids[layer_id]],
+                "layer_id": layer_id,
+            }
+            for i, layer_id in enumerate(geometry.layer_ids)
         ]
 
-        # get the leftmost point
-        left = min([p[0] for p in self.boundary])
-        topleft_point = sorted(
-            [p for p in self.boundary if p[0] == left], key=lambda x: x[1]
-        )[-1]
-
-        # get the rightmost points
-        right = max([p[0] for p in self.boundary])
-        rightmost_point = sorted(
-            [p for p in self.boundary if p[0] == right], key=lambda x: x[1]
-        )[-1]
-
-        # get the index of leftmost point
-        idx_left = self.boundary.index(topleft_point)
-        self.surface = self.boundary[idx_left:] + self.boundary[:idx_left]
-
-        # get the index of the rightmost point
-        idx_right = self.surface.index(rightmost_point)
-        self.surface = self.surface[: idx_right + 1]
+    def _calculate_geometry(
+        self, scenario_index: int, stage_index: int
+    ) -> GeometryStore:
+        layers = self.model._get_geometry(scenario_index, stage_index).Layers
+        return GeometryStore.from_layers(
+            [
+                (layer.Id, [(float(p.X), float(p.Z)) for p in layer.Points])
+                for layer in layers
+            ]
+        )
 
-        # headlines
-        for hl in self.model.waternets[0].HeadLines:
-            self.headlines.append(
-                {
-                    "label": hl.Label,
-                    "points": [(p.X, p.Z) for p in hl.Points],
-                    "is_phreatic": hl.Id == self.model.waternets[0].PhreaticLineId,
-                }
-            )
+    def _calculate_headlines(self, scenario_index: int, stage_index: int) -> List[Dict]:
+        waternet = self.model._get_waternet(scenario_index, stage_index)
+        return [
+            {
+                "label": hl.Label,
+                "points": [(p.X, p.Z) for p in hl.Points],
+                "is_phreatic": hl.Id == waternet.PhreaticLineId,
+            }
+            for hl in waternet.HeadLines
+        ]
 
     def get_soil_from_layer_id(self, layer_id: str):
         for sl in self.soillayers:
@@ -680,10 +1182,57 @@ class DStability(BaseModel):
                 return sl["soil"]
         return None
 
+    def surface_index(
+        self, scenario_index: Optional[int] = None, stage_index: Optional[int] = None
+    ) -> SurfaceIndex:
+        """Get the surface index of the given stage
+
+        Args:
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            SurfaceIndex: The surface index
+        """
+        return self._get_derived("surface_index", scenario_index, stage_index)
+
     def surface_intersections(
         self, polyline: List[Tuple[float, float]]
     ) -> List[Tuple[float, float]]:
-        return polyline_polyline_intersections(polyline, self.surface)
+        """Get the intersections of the polyline with the surface, the points of the
+        polyline are not included unless they are also surface points
+
+        Args:
+            polyline (List[Tuple[float, float]]): The polyline
+
+        Returns:
+            List[Tuple[float, float]]: The intersections sorted on x
+        """
+        return self.surface_index().intersections(polyline)
+
+    def surface_intersections_many(
+        self, polylines: List[List[Tuple[float, float]]]
+    ) -> List[List[Tuple[float, float]]]:
+        """Get the intersections of many polylines with the surface in one call
+
+        Args:
+            polylines (List[List[Tuple[float, float]]]): The polylines
+
+        Returns:
+            List[List[Tuple[float, float]]]: The intersections per polyline sorted on x
+        """
+        return self.surface_index().intersections_many(polylines)
+
+    def surface_z_at(self, xs: List[float]) -> np.ndarray:
+        """Get the surface level at the given x coordinates
+
+        Args:
+            xs (List[float]): The x coordinates
+
+        Returns:
+            np.ndarray: The z coordinates, nan if x is outside the geometry
+        """
+        return self.surface_index().z_at(xs)
 
     def surface_points_between(
         self, left: float, right: float
@@ -697,7 +1246,7 @@ class DStability(BaseModel):
         Returns:
             List[Tuple[float, float]]: List of surface points between left and right
         """
-        return [p for p in self.surface if p[0] > left and p[0] < right]
+        return self.surface_index().points_between(left, right)
 
     def set_scenario_and_stage(self, scenario_index: int, stage_index: int):
         """Set the current scenario and stage
@@ -721,86 +1270,209 @@ class DStability(BaseModel):
                 f"Trying to set an invalid stage index for scenario {self.current_scenario_index}"
             )
 
-    def soilprofile1_at(
-        self, x: float, scenario_index: int = 0, stage_index: int = 0
-    ) -> SoilProfile1:
-        """Generate a SoilProfile1 at the given x coordinate
+    def edge_index(
+        self, scenario_index: Optional[int] = None, stage_index: Optional[int] = None
+    ) -> EdgeIndex:
+        """Get the edge index of the given stage
 
         Args:
-            x (float): the location to create the SoilProfile1
-            scenario_index (int, optional): _description_. Defaults to 0.
-            stage_index (int, optional): _description_. Defaults to 0.
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
 
         Returns:
-            SoilProfile1: The soilprofile1, the bottom layer will always end at -999.0
+            EdgeIndex: The edge index
         """
-        result = SoilProfile1()
+        return self._get_derived("edge_index", scenario_index, stage_index)
 
-        layers = self.model._get_geometry(scenario_index, stage_index).Layers
+    def layers_at_many(
+        self,
+        xs: List[float],
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the layers at all given x coordinates in one call
 
-        soillayers = []
+        Args:
+            xs (List[float]): The x coordinates
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
 
-        for layer in layers:
-            points = [(float(p.X), float(p.Z)) for p in layer.Points]
-            points.append(points[0])
-            for i in range(1, len(points)):
-                p1 = points[i - 1]
-                if i == len(points):
-                    p2 = points[0]
-                else:
-                    p2 = points[i]
-
-                if min(p1[0], p2[0]) <= x and x <= max(p1[0], p2[0]):
-                    soil = self.get_soil_from_layer_id(layer.Id)
-                    if p1[0] == p2[0]:
-                        z = round(p1[1], 3)
-                    else:
-                        z = round(
-                            p1[1] + (x - p1[0]) / (p2[0] - p1[0]) * (p2[1] - p1[1]), 3
-                        )
-                    soillayers.append((z, soil))
-
-        soillayers = sorted(soillayers, key=lambda x: x[0], reverse=True)
-        if soillayers[0] == soillayers[1]:
-            soillayers = soillayers[1:]
-        result = SoilProfile1(
-            soillayers=[
-                SoilLayer(
-                    top=soillayers[0][0], bottom=0.0, soilcode=soillayers[0][1]["code"]
-                )
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Three (len(xs), n) arrays with the tops, the
+            bottoms and the soilcodes of the layers sorted from high to low, unused positions are
+            filled with nan (tops and bottoms) and an empty string (soilcodes)
+        """
+        tops, bottoms, layers = self.edge_index(scenario_index, stage_index).layers_at(
+            xs
+        )
+        soilcodes = np.array(
+            [
+                sl["soil"]["code"]
+                for sl in self._get_derived("soillayers", scenario_index, stage_index)
             ]
+            + [""],
+            dtype=object,
         )
+        return np.round(tops, 3), np.round(bottoms, 3), soilcodes[layers]
 
-        for i in range(1, int(len(soillayers) / 2)):
-            option1 = soillayers[i * 2 - 1]
-            option2 = soillayers[i * 2]
+    def z_at_many(
+        self,
+        xs: List[float],
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> np.ndarray:
+        """Get the tops of the layers at all given x coordinates in one call
 
-            if option1[1]["code"] == result.soillayers[-1].soilcode:
-                result.soillayers[-1].bottom = option1[0]
-                add_layer = option2
-            else:
-                result.soillayers[-1].bottom = option2[0]
-                add_layer = option1
+        Args:
+            xs (List[float]): The x coordinates
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
 
-            result.soillayers.append(
-                SoilLayer(top=add_layer[0], bottom=0.0, soilcode=add_layer[1]["code"])
+        Returns:
+            np.ndarray: A (len(xs), n) array with the tops sorted from high to low, filled with nan
+        """
+        return self.layers_at_many(xs, scenario_index, stage_index)[0]
+
+    def layer_raster(
+        self,
+        cell_size: float,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> LayerRaster:
+        """Get the layer raster with the given cell size for the given stage, the raster
+        is cached so use the same cell size for all lookups
+
+        Args:
+            cell_size (float): The width and height of the cells
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            LayerRaster: The layer raster
+        """
+        stage_cache = self._get_stage_cache(scenario_index, stage_index)
+        key = f"layer_raster_{cell_size}"
+        if key not in stage_cache:
+            geometry = self._get_derived("geometry", scenario_index, stage_index)
+            stage_cache[key] = LayerRaster.from_edge_index(
+                self.edge_index(scenario_index, stage_index),
+                bottom=geometry.bottom,
+                top=geometry.top,
+                cell_size=cell_size,
+            )
+        return stage_cache[key]
+
+    def soil_at(
+        self,
+        xs: List[float],
+        zs: List[float],
+        cell_size: Optional[float] = None,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> List[Optional[Dict]]:
+        """Get the soil at each of the given points in one call
+
+        A point on the edge between two layers gets the soil of the upper layer and a
+        point on a vertical edge gets the soil of the layer on the right side. If a cell
+        size is given a cached raster is used for the points that are not near an edge
+        which is faster if you need to look up a lot of points.
+
+        Args:
+            xs (List[float]): The x coordinates
+            zs (List[float]): The z coordinates
+            cell_size (Optional[float], optional): The cell size of the raster. Defaults to None (no raster).
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            List[Optional[Dict]]: The soil (see soils) for each point or None if the point is outside the geometry
+        """
+        if cell_size is None:
+            layers = self.edge_index(scenario_index, stage_index).layer_at(xs, zs)
+        else:
+            layers = self.layer_raster(cell_size, scenario_index, stage_index).layer_at(
+                xs, zs
             )
-        result.soillayers[-1].bottom = -999.0
+
+        soillayers = self._get_derived("soillayers", scenario_index, stage_index)
+        return [soillayers[i]["soil"] if i >= 0 else None for i in layers]
+
+    def soilprofiles_at(
+        self,
+        xs: List[float],
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> List[SoilProfile1]:
+        """Generate a SoilProfile1 at each of the given x coordinates
+
+        Args:
+            xs (List[float]): The x coordinates
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Raises:
+            ValueError: If one of the x coordinates is outside the geometry
+
+        Returns:
+            List[SoilProfile1]: The soilprofiles, the bottom layer will always end at -999.0
+        """
+        tops, bottoms, soilcodes = self.layers_at_many(xs, scenario_index, stage_index)
+
+        result = []
+        for x, row_tops, row_bottoms, row_soilcodes in zip(
+            xs, tops, bottoms, soilcodes
+        ):
+            n = np.count_nonzero(row_soilcodes != "")
+            if n == 0:
+                raise ValueError(f"No soillayers found at x={x}")
+            soillayers = [
+                SoilLayer(
+                    top=float(row_tops[i]),
+                    bottom=float(row_bottoms[i]),
+                    soilcode=row_soilcodes[i],
+                )
+                for i in range(n)
+            ]
+            soillayers[-1].bottom = -999.0
+            result.append(SoilProfile1(soillayers=soillayers))
         return result
 
-    def z_at(self, x, scenario_index: int = 0, stage_index: int = 0) -> List[float]:
+    def soilprofile1_at(
+        self,
+        x: float,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> SoilProfile1:
+        """Generate a SoilProfile1 at the given x coordinate
+
+        Args:
+            x (float): the location to create the SoilProfile1
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
+
+        Returns:
+            SoilProfile1: The soilprofile1, the bottom layer will always end at -999.0
+        """
+        return self.soilprofiles_at([x], scenario_index, stage_index)[0]
+
+    def z_at(
+        self,
+        x,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> List[float]:
         """Get a list of z coordinates from intersections with the soillayers on coordinate x
 
         Args:
             x (_type_): The x coordinate
-            scenario_index (int, optional): The scenario index. Defaults to 0.
-            stage_index (int, optional): The stage index. Defaults to 0.
+            scenario_index (Optional[int], optional): The scenario index. Defaults to None (the current scenario).
+            stage_index (Optional[int], optional): The stage index. Defaults to None (the current stage).
 
         Returns:
             List[float]: A list of intersections sorted from high to low
         """
-        sp1 = self.soilprofile1_at(x, scenario_index, stage_index)
-        return [sl.top for sl in sp1.soillayers]
+        tops = self.z_at_many([x], scenario_index, stage_index)[0]
+        return [float(z) for z in tops[~np.isnan(tops)]]
 
     def has_soilcode(self, soilcode: str) -> bool:
         """Check if the current model has the given soilcode
@@ -823,6 +1495,39 @@ class DStability(BaseModel):
 
     def execute(self):
         self.model = self.model.execute()
+        self.invalidate(all_stages=True)
+
+    def content_hash(self) -> str:
+        """Get a hash of the content of the model, two models with the same input and
+        output will have the same hash regardless of their name or the current
+        scenario and stage
+
+        Returns:
+            str: The sha256 hash of the model content
+        """
+        return sha256(self.model.datastructure.json().encode("utf-8")).hexdigest()
+
+    def input_hash(self, decimals: Optional[int] = None) -> str:
+        """Get a hash of the input of the model, this excludes the results and the
+        project info so a model will have the same hash before and after the calculation
+
+        Args:
+            decimals (Optional[int], optional): Round all numbers to this number of decimals first so models that only differ by rounding errors get the same hash. Defaults to None (no rounding).
+
+        Returns:
+            str: The sha256 hash of the model input
+        """
+        exclude = {
+            field: True
+            for field in self.model.datastructure.__fields__.keys()
+            if field.endswith("_results")
+        }
+        exclude["projectinfo"] = True
+        exclude["scenarios"] = {"__all__": {"Calculations": {"__all__": {"ResultId"}}}}
+        s = self.model.datastructure.json(exclude=exclude)
+        if decimals is not None:
+            s = json.dumps(_round_floats(json.loads(s), decimals))
+        return sha256(s.encode("utf-8")).hexdigest()
 
     def extract_soilparameters(self) -> List[str]:
         result = [
@@ -911,6 +1616,30 @@ class DStability(BaseModel):
                 },
                 "tangent": sf.TangentLine,
             }
+        elif type(sf) == UpliftVanResult:
+            return {
+                "model": "upliftvan",
+                "fos": sf.FactorOfSafety,
+                "left_circle": {
+                    "x": sf.LeftCenter.X,
+                    "z": sf.LeftCenter.Z,
+                },
+                "right_circle": {
+                    "x": sf.RightCenter.X,
+                    "z": sf.RightCenter.Z,
+                },
+                "tangent": sf.TangentLine,
+            }
+        elif type(sf) == BishopResult:
+            return {
+                "model": "bishop",
+                "fos": sf.FactorOfSafety,
+                "circle": {
+                    "x": sf.Circle.Center.X,
+                    "z": sf.Circle.Center.Z,
+                    "r": sf.Circle.Radius,
+                },
+            }
         elif type(sf) == BishopBruteForceResult:
             return {
                 "model": "bishop_brute_force",
@@ -927,7 +1656,13 @@ class DStability(BaseModel):
                 "fos": sf.FactorOfSafety,
                 "slip_plane": [{"x": p.X, "z": p.Z} for p in sf.SlipPlane],
             }
+        elif type(sf) == SpencerResult:
+            return {
+                "model": "spencer",
+                "fos": sf.FactorOfSafety,
+                "slip_plane": [{"x": p.X, "z": p.Z} for p in sf.SlipPlane],
+            }
         else:
             raise ValueError(
-                f"Cannot convert the result of type '{type(sf) }' yet, for now limited to spencer genetic, bishop brute force, uplift particlr swarm"
+                f"Cannot convert the result of type '{type(sf) }' yet, for now limited to the non probabilistic results"
             )
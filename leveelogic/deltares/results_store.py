@@ -0,0 +1,278 @@
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel
+from pathlib import Path
+from contextlib import closing
+from datetime import datetime
+import simplejson as json
+import sqlite3
+
+from .dstability import DStability
+
+CREATE_TABLE = """CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project TEXT NOT NULL,
+    name TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    scenario_index INTEGER NOT NULL,
+    calculation_index INTEGER NOT NULL,
+    analysis_type TEXT NOT NULL,
+    safety_factor REAL,
+    slip_plane TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    created TEXT NOT NULL
+)"""
+
+CREATE_INDICES = [
+    "CREATE INDEX IF NOT EXISTS idx_results_project ON results (project)",
+    "CREATE INDEX IF NOT EXISTS idx_results_name ON results (name)",
+    "CREATE INDEX IF NOT EXISTS idx_results_input_hash ON results (input_hash)",
+    "CREATE INDEX IF NOT EXISTS idx_results_safety_factor ON results (safety_factor)",
+]
+
+RESULT_COLUMNS = [
+    "id",
+    "project",
+    "name",
+    "input_hash",
+    "scenario_index",
+    "calculation_index",
+    "analysis_type",
+    "safety_factor",
+    "slip_plane",
+    "parameters",
+    "created",
+]
+
+
+class StoredResult(BaseModel):
+    """The result of one calculation in the results store
+
+    Args:
+        slip_plane (Dict): the critical circle or slip plane, see DStability.safety_factor_to_dict
+        parameters (Dict): the variant parameters that were stored with the result
+    """
+
+    id: int
+    project: str
+    name: str
+    input_hash: str
+    scenario_index: int
+    calculation_index: int
+    analysis_type: str
+    safety_factor: Optional[float] = None
+    slip_plane: Dict = {}
+    parameters: Dict = {}
+    created: str
+
+
+class ResultsStore(BaseModel):
+    """A compact store for calculation results
+
+    Instead of keeping the calculated stix files (which contain the full input and all
+    the slices of all results) this store only keeps the safety factor, the critical slip
+    plane or circle, the analysis type, the variant parameters and a hash of the input
+    in a local SQLite database.
+
+    Args:
+        filename (Union[Path, str]): the database file, will be created if it does not exist
+        project (str): the default project name for added results
+    """
+
+    filename: Union[Path, str]
+    project: str = ""
+
+    def __init__(self, **data) -> None:
+        super().__init__(**data)
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(CREATE_TABLE)
+                for sql in CREATE_INDICES:
+                    conn.execute(sql)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.filename), timeout=30.0)
+
+    def add_model(
+        self,
+        ds: DStability,
+        name: Optional[str] = None,
+        project: Optional[str] = None,
+        parameters: Dict = {},
+    ) -> List[int]:
+        """Add all the results of the calculations in the given model
+
+        Args:
+            ds (DStability): The calculated model
+            name (Optional[str], optional): The name of the model. Defaults to None (the name of the model).
+            project (Optional[str], optional): The project name. Defaults to None (the default project of the store).
+            parameters (Dict, optional): The variant parameters like berm height and width. Defaults to {}.
+
+        Returns:
+            List[int]: The ids of the added results
+        """
+        if name is None:
+            name = ds.name
+        if project is None:
+            project = self.project
+
+        input_hash = ds.input_hash()
+        created = datetime.now().isoformat(timespec="seconds")
+
+        rows = []
+        for scenario_index, scenario in enumerate(ds.model.scenarios):
+            for calculation_index, _ in enumerate(scenario.Calculations):
+                if not ds.model.has_result(scenario_index, calculation_index):
+                    continue
+
+                result = ds.model.get_result(scenario_index, calculation_index)
+                try:
+                    slip_plane = ds.safety_factor_to_dict(
+                        scenario_index, calculation_index
+                    )
+                except ValueError:
+                    slip_plane = {}
+
+                rows.append(
+                    (
+                        project,
+                        name,
+                        input_hash,
+                        scenario_index,
+                        calculation_index,
+                        ds.get_analysis_type(scenario_index, calculation_index).value,
+                        getattr(result, "FactorOfSafety", None),
+                        json.dumps(slip_plane),
+                        json.dumps(parameters, sort_keys=True),
+                        created,
+                    )
+                )
+
+        ids = []
+        with closing(self._connect()) as conn:
+            with conn:
+                for row in rows:
+                    cursor = conn.execute(
+                        f"INSERT INTO results ({','.join(RESULT_COLUMNS[1:])}) VALUES ({','.join(['?'] * len(row))})",
+                        row,
+                    )
+                    ids.append(cursor.lastrowid)
+        return ids
+
+    def add_stix(
+        self,
+        stix_file: Union[Path, str],
+        project: Optional[str] = None,
+        parameters: Dict = {},
+        delete_stix: bool = False,
+    ) -> List[int]:
+        """Add all the results of the given calculated stix file
+
+        Args:
+            stix_file (Union[Path, str]): The path to the calculated stix file
+            project (Optional[str], optional): The project name. Defaults to None (the default project of the store).
+            parameters (Dict, optional): The variant parameters like berm height and width. Defaults to {}.
+            delete_stix (bool, optional): Delete the stix file after the results are stored. Defaults to False.
+
+        Returns:
+            List[int]: The ids of the added results
+        """
+        ds = DStability.from_stix(str(stix_file), auto_upgrade=False)
+        ids = self.add_model(ds, project=project, parameters=parameters)
+        if delete_stix:
+            Path(stix_file).unlink()
+        return ids
+
+    def has_input(self, input_hash: str) -> bool:
+        """Check if the store has results for the given input hash, this can be used to
+        skip calculations that have already been done
+
+        Args:
+            input_hash (str): The input hash, see DStability.input_hash
+
+        Returns:
+            bool: True if there are results for the input hash
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM results WHERE input_hash = ? LIMIT 1", (input_hash,)
+            ).fetchone()
+        return row is not None
+
+    def query(
+        self,
+        project: Optional[str] = None,
+        name: Optional[str] = None,
+        input_hash: Optional[str] = None,
+        analysis_type: Optional[str] = None,
+        min_safety_factor: Optional[float] = None,
+        max_safety_factor: Optional[float] = None,
+        parameters: Dict = {},
+        limit: Optional[int] = None,
+    ) -> List[StoredResult]:
+        """Get the stored results that match all given filters sorted on the safety factor
+        (lowest first), leave all filters empty to get all the results of all projects
+
+        Args:
+            project (Optional[str], optional): The project name. Defaults to None.
+            name (Optional[str], optional): The model name. Defaults to None.
+            input_hash (Optional[str], optional): The input hash. Defaults to None.
+            analysis_type (Optional[str], optional): The analysis type like 'BishopBruteForce'. Defaults to None.
+            min_safety_factor (Optional[float], optional): The minimum safety factor. Defaults to None.
+            max_safety_factor (Optional[float], optional): The maximum safety factor. Defaults to None.
+            parameters (Dict, optional): Variant parameters that should have the given values. Defaults to {}.
+            limit (Optional[int], optional): The maximum number of results. Defaults to None.
+
+        Returns:
+            List[StoredResult]: The matching results
+        """
+        conditions, args = [], []
+        for column, value in [
+            ("project", project),
+            ("name", name),
+            ("input_hash", input_hash),
+            ("analysis_type", analysis_type),
+        ]:
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                args.append(value)
+        if min_safety_factor is not None:
+            conditions.append("safety_factor >= ?")
+            args.append(min_safety_factor)
+        if max_safety_factor is not None:
+            conditions.append("safety_factor <= ?")
+            args.append(max_safety_factor)
+        for key, value in parameters.items():
+            conditions.append("json_extract(parameters, ?) = ?")
+            args += [f'$."{key}"', value]
+
+        sql = f"SELECT {','.join(RESULT_COLUMNS)} FROM results"
+        if len(conditions) > 0:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY safety_factor"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, args).fetchall()
+
+        result = []
+        for row in rows:
+            d = dict(zip(RESULT_COLUMNS, row))
+            d["slip_plane"] = json.loads(d["slip_plane"])
+            d["parameters"] = json.loads(d["parameters"])
+            result.append(StoredResult(**d))
+        return result
+
+    def remove_project(self, project: str) -> int:
+        """Remove all results of the given project
+
+        Args:
+            project (str): The project name
+
+        Returns:
+            int: The number of removed results
+        """
+        with closing(self._connect()) as conn:
+            with conn:
+                cursor = conn.execute("DELETE FROM results WHERE project = ?", (project,))
+        return cursor.rowcount
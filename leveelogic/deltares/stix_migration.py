@@ -0,0 +1,164 @@
+from typing import List, Optional, Union
+from pydantic import BaseModel
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from uuid import uuid4
+from zipfile import ZipFile, is_zipfile, BadZipFile
+from dotenv import load_dotenv
+import os
+import subprocess
+
+load_dotenv()
+DSTABILITY_MIGRATION_CONSOLE_PATH = os.getenv("DSTABILITY_MIGRATION_CONSOLE_PATH")
+DSTABILITY_MIGRATION_CACHE_FOLDER = os.getenv("DSTABILITY_MIGRATION_CACHE_FOLDER")
+
+
+def is_old_stix(stix_file: Union[Path, str]) -> bool:
+    """Check if the given stix file is in the old (pre scenario) format by looking
+    at the zip member list, the file itself will not be parsed
+
+    Args:
+        stix_file (Union[Path, str]): The stix file
+
+    Returns:
+        bool: True if the file needs to be migrated
+    """
+    if not is_zipfile(stix_file):
+        return False
+
+    try:
+        with ZipFile(stix_file) as z:
+            return not any([n.startswith("scenarios/") for n in z.namelist()])
+    except BadZipFile:
+        return False
+
+
+def stix_hash(stix_file: Union[Path, str]) -> str:
+    """Get the sha256 hash of the content of the given file
+
+    Args:
+        stix_file (Union[Path, str]): The stix file
+
+    Returns:
+        str: The hash
+    """
+    h = sha256()
+    with open(stix_file, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StixMigrationResult(BaseModel):
+    """The result of the migration of one stix file
+
+    Args:
+        source (str): the original file
+        filename (str): the file to use, the cached migrated file or the original file if no migration was needed
+        migrated (bool): True if the file was an old stix file
+        error (str): the error message if the migration failed
+    """
+
+    source: str
+    filename: str = ""
+    migrated: bool = False
+    error: str = ""
+
+
+class StixMigrator(BaseModel):
+    """Migrates old stix files to the current format
+
+    The migrated files are stored in the cache folder using the hash of the original
+    file as the name so the original file is never overwritten and every file only
+    needs to be migrated once.
+
+    Args:
+        cache_folder (Union[Path, str]): the folder to store the migrated files
+        console_path (str): path to the migration console, defaults to DSTABILITY_MIGRATION_CONSOLE_PATH
+    """
+
+    cache_folder: Union[Path, str]
+    console_path: Optional[str] = DSTABILITY_MIGRATION_CONSOLE_PATH
+
+    def cached_file(self, stix_file: Union[Path, str]) -> Path:
+        """Get the location of the migrated file in the cache, the file does not
+        have to exist
+
+        Args:
+            stix_file (Union[Path, str]): The original stix file
+
+        Returns:
+            Path: The location of the migrated file
+        """
+        return Path(self.cache_folder) / f"{stix_hash(stix_file)}.stix"
+
+    def migrate(self, stix_file: Union[Path, str]) -> Path:
+        """Migrate the given old stix file or get the migrated file from the cache
+
+        Args:
+            stix_file (Union[Path, str]): The original stix file
+
+        Raises:
+            ValueError: If the migration failed
+
+        Returns:
+            Path: The migrated file
+        """
+        cached_file = self.cached_file(stix_file)
+        if cached_file.exists():
+            return cached_file
+
+        if self.console_path is None:
+            raise ValueError(
+                "No migration console set, add DSTABILITY_MIGRATION_CONSOLE_PATH to your environment"
+            )
+
+        # migrate to a temporary file first so parallel migrations of the same file
+        # will never leave a half written file in the cache
+        cached_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cached_file.parent / f"{cached_file.stem}_{uuid4().hex}.stix"
+        try:
+            process = subprocess.run(
+                [self.console_path, str(stix_file), str(tmp_file)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            if not tmp_file.exists() or is_old_stix(tmp_file):
+                raise ValueError(
+                    f"Could not migrate '{stix_file}', the console exited with code {process.returncode}"
+                )
+            os.replace(tmp_file, cached_file)
+        finally:
+            tmp_file.unlink(missing_ok=True)
+
+        return cached_file
+
+    def migrate_files(
+        self, stix_files: List[Union[Path, str]], max_workers: Optional[int] = None
+    ) -> List[StixMigrationResult]:
+        """Migrate all old stix files in the list in parallel, files in the current
+        format are skipped
+
+        Args:
+            stix_files (List[Union[Path, str]]): The stix files
+            max_workers (Optional[int], optional): The maximum number of parallel migrations. Defaults to None (python default).
+
+        Returns:
+            List[StixMigrationResult]: The result for each file (same order as the input)
+        """
+
+        def _migrate(stix_file) -> StixMigrationResult:
+            result = StixMigrationResult(source=str(stix_file))
+            try:
+                if is_old_stix(stix_file):
+                    result.filename = str(self.migrate(stix_file))
+                    result.migrated = True
+                else:
+                    result.filename = str(stix_file)
+            except Exception as e:
+                result.error = f"Got migration error '{e}'"
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_migrate, stix_files))
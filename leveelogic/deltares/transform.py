@@ -0,0 +1,332 @@
+from pydantic import BaseModel, validator
+from typing import Callable, Dict, List, Tuple
+from math import atan2, cos, degrees, hypot, isfinite, radians, sin
+import numpy as np
+
+from ..geometry.characteristic_point import _to_float
+from ..geolib.models.dstability.internal import (
+    NullablePersistablePoint,
+    PersistableCircle,
+    PersistableDitchCharacteristics,
+    PersistableEmbankmentCharacteristics,
+    PersistableHeadLine,
+    PersistableLineLoad,
+    PersistableNail,
+    PersistablePoint,
+    PersistableReferenceLine,
+    PersistableSearchArea,
+    PersistableSearchGrid,
+    PersistableSlipPlaneConstraints,
+    PersistableSpencerGeneticSettings,
+    PersistableSpencerSettings,
+    PersistableStateLine,
+    PersistableStateLinePoint,
+    PersistableTangentArea,
+    PersistableTangentLines,
+    PersistableTree,
+    PersistableTwoCirclesOnTangentLine,
+    PersistableUniformLoad,
+    WaternetCreatorSettings,
+)
+
+# the roles of the fields that change with a transformation
+X = "x"  # horizontal coordinate
+Z = "z"  # vertical coordinate
+DX = "dx"  # horizontal length
+DZ = "dz"  # vertical length
+FORCE_X = "force_x"  # horizontal force, positive towards the right
+ANGLE_VERTICAL = "angle_vertical"  # angle with the vertical
+ANGLE_HORIZONTAL = "angle_horizontal"  # angle with the positive x axis
+
+# the substructures of the datastructure with coordinates, the results are not
+# transformed, they are invalid after the transformation anyway
+TRANSFORM_SUBSTRUCTURES = [
+    "calculationsettings",
+    "decorations",
+    "geometries",
+    "loads",
+    "reinforcements",
+    "states",
+    "waternetcreatorsettings",
+    "waternets",
+]
+
+# the fields with coordinates for every class of the datastructure, the points in
+# lists and sub objects are found by walking the datastructure, the lengths along the
+# direction of an object (like nails) are in DIRECTED_LENGTHS
+COORDINATE_FIELDS: Dict[type, Dict[str, str]] = {
+    PersistablePoint: {"X": X, "Z": Z},
+    NullablePersistablePoint: {"X": X, "Z": Z},
+    PersistableStateLinePoint: {"X": X},
+    PersistableUniformLoad: {"Start": X, "End": X},
+    PersistableLineLoad: {"Angle": ANGLE_VERTICAL},
+    PersistableTree: {"Force": FORCE_X, "RootZoneWidth": DX},
+    PersistableNail: {"Direction": ANGLE_HORIZONTAL},
+    PersistableCircle: {"Radius": DX},
+    PersistableTwoCirclesOnTangentLine: {"FirstCircleRadius": DX},
+    PersistableSearchGrid: {"Space": DX},
+    PersistableSearchArea: {"Width": DX, "Height": DZ},
+    PersistableTangentArea: {"TopZ": Z, "Height": DZ},
+    PersistableTangentLines: {"BottomTangentLineZ": Z, "Space": DZ},
+    PersistableSlipPlaneConstraints: {
+        "XLeftZoneA": X,
+        "XLeftZoneB": X,
+        "WidthZoneA": DX,
+        "WidthZoneB": DX,
+        "MinimumSlipPlaneLength": DX,
+        "MinimumSlipPlaneDepth": DZ,
+    },
+    PersistableEmbankmentCharacteristics: {
+        "EmbankmentToeLandSide": X,
+        "EmbankmentToeWaterSide": X,
+        "EmbankmentTopLandSide": X,
+        "EmbankmentTopWaterSide": X,
+        "ShoulderBaseLandSide": X,
+    },
+    PersistableDitchCharacteristics: {
+        "DitchBottomEmbankmentSide": X,
+        "DitchBottomLandSide": X,
+        "DitchEmbankmentSide": X,
+        "DitchLandSide": X,
+    },
+    WaternetCreatorSettings: {
+        "AquiferLayerInsideAquitardLeakageLengthInwards": DX,
+        "AquiferLayerInsideAquitardLeakageLengthOutwards": DX,
+        "AquitardHeadLandSide": Z,
+        "AquitardHeadWaterSide": Z,
+        "InitialLevelEmbankmentTopLandSide": Z,
+        "InitialLevelEmbankmentTopWaterSide": Z,
+        "IntrusionLength": DZ,
+        "MeanWaterLevel": Z,
+        "NormativeWaterLevel": Z,
+        "OffsetEmbankmentToeLandSide": DZ,
+        "OffsetEmbankmentTopLandSide": DZ,
+        "OffsetEmbankmentTopWaterSide": DZ,
+        "OffsetShoulderBaseLandSide": DZ,
+        "PleistoceneLeakageLengthInwards": DX,
+        "PleistoceneLeakageLengthOutwards": DX,
+        "WaterLevelHinterland": Z,
+    },
+}
+
+# the lengths along the direction of an object, these scale with the scale in that
+# direction, by class the field with the angle with the positive x axis (in degrees),
+# the length fields and the lists of sub objects with a distance along the object
+DIRECTED_LENGTHS: Dict[type, Tuple[str, List[str], List[str]]] = {
+    PersistableNail: ("Direction", ["Length"], ["LateralStresses", "ShearStresses"]),
+}
+
+# the fields that store the left side of an area with the width of the area, if the
+# model is mirrored the right side becomes the left side
+LEFT_ANCHORS: Dict[type, List[Tuple[str, Callable]]] = {
+    PersistableSearchGrid: [
+        ("BottomLeft", lambda o: (o.NumberOfPointsInX - 1) * o.Space)
+    ],
+    PersistableSearchArea: [("TopLeft", lambda o: o.Width)],
+    PersistableSlipPlaneConstraints: [
+        ("XLeftZoneA", lambda o: o.WidthZoneA),
+        ("XLeftZoneB", lambda o: o.WidthZoneB),
+    ],
+}
+
+# the fields with (start, end) values that need to be swapped if the model is mirrored
+INTERVALS: Dict[type, List[Tuple[str, str]]] = {
+    PersistableUniformLoad: [("Start", "End")],
+}
+
+# the lists of points that need to go from left to right
+POLYLINES: Dict[type, List[str]] = {
+    PersistableHeadLine: ["Points"],
+    PersistableReferenceLine: ["Points"],
+    PersistableStateLine: ["Points", "Values"],
+    PersistableSpencerSettings: ["SlipPlane"],
+    PersistableSpencerGeneticSettings: ["SlipPlaneA", "SlipPlaneB"],
+}
+
+
+def _set_field(obj: BaseModel, name: str, value):
+    # the values are already valid so the (slow) validation on assignment is skipped
+    obj.__dict__[name] = value
+    obj.__fields_set__.add(name)
+
+
+class AffineTransform(BaseModel):
+    """An affine transformation of the coordinates of a model
+
+    x' = x_factor * x + x_offset and z' = z_factor * z + z_offset
+
+    A negative x_factor mirrors the model, the vertical direction can not be mirrored
+    because the top and bottom of the model have a meaning in the calculation.
+
+    Args:
+        x_factor (float): the horizontal scale, negative to mirror, defaults to 1.0
+        x_offset (float): the horizontal translation, defaults to 0.0
+        z_factor (float): the vertical scale, defaults to 1.0
+        z_offset (float): the vertical translation, defaults to 0.0
+    """
+
+    x_factor: float = 1.0
+    x_offset: float = 0.0
+    z_factor: float = 1.0
+    z_offset: float = 0.0
+
+    @validator("x_factor")
+    def x_factor_not_zero(cls, v):
+        if v == 0.0:
+            raise ValueError("The x_factor can not be zero")
+        return v
+
+    @validator("z_factor")
+    def z_factor_positive(cls, v):
+        if v <= 0.0:
+            raise ValueError("The z_factor needs to be larger than zero")
+        return v
+
+    @classmethod
+    def translation(cls, dx: float = 0.0, dz: float = 0.0) -> "AffineTransform":
+        return cls(x_offset=dx, z_offset=dz)
+
+    @classmethod
+    def mirror(cls, x: float = 0.0) -> "AffineTransform":
+        """Mirror around the vertical line at x"""
+        return cls(x_factor=-1.0, x_offset=2.0 * x)
+
+    @classmethod
+    def scale(
+        cls, sx: float, sz: float = 1.0, x: float = 0.0, z: float = 0.0
+    ) -> "AffineTransform":
+        """Scale with (x, z) as the fixed point"""
+        return cls(x_factor=sx, x_offset=x - sx * x, z_factor=sz, z_offset=z - sz * z)
+
+    @property
+    def is_mirror(self) -> bool:
+        return self.x_factor < 0.0
+
+    @property
+    def keeps_lengths(self) -> bool:
+        """True if the transformation only translates and / or mirrors"""
+        return abs(self.x_factor) == 1.0 and self.z_factor == 1.0
+
+    @property
+    def keeps_angles(self) -> bool:
+        """True if the transformation keeps the angles (apart from mirroring)"""
+        return abs(self.x_factor) == self.z_factor
+
+    def then(self, other: "AffineTransform") -> "AffineTransform":
+        """Get the transformation that applies this transformation and then the other one"""
+        return AffineTransform(
+            x_factor=other.x_factor * self.x_factor,
+            x_offset=other.x_factor * self.x_offset + other.x_offset,
+            z_factor=other.z_factor * self.z_factor,
+            z_offset=other.z_factor * self.z_offset + other.z_offset,
+        )
+
+    def apply_x(self, xs: np.ndarray) -> np.ndarray:
+        return self.x_factor * xs + self.x_offset
+
+    def apply_z(self, zs: np.ndarray) -> np.ndarray:
+        return self.z_factor * zs + self.z_offset
+
+    def apply(self, objects: List[BaseModel]):
+        """Transform all coordinates in the given objects (and their sub objects) in place
+
+        All coordinates are collected by walking the objects using COORDINATE_FIELDS,
+        transformed at once and written back. NaN values are left as they are.
+
+        Args:
+            objects (List[BaseModel]): The objects, like the substructures of the datastructure
+        """
+        refs = {role: [] for role in [X, Z, DX, DZ, FORCE_X]}
+        values = {role: [] for role in refs.keys()}
+        angles, intervals, polylines, directed = [], [], [], []
+        # the widths to add to the left side of an area when mirroring, by id of the
+        # point or (id of the object, field name)
+        anchors = {}
+
+        stack = list(reversed(objects))
+        while len(stack) > 0:
+            obj = stack.pop()
+            if isinstance(obj, list):
+                stack += [o for o in reversed(obj) if o is not None]
+                continue
+            if not isinstance(obj, BaseModel):
+                continue
+
+            cls = type(obj)
+            if self.is_mirror:
+                for name, width in LEFT_ANCHORS.get(cls, []):
+                    value = getattr(obj, name)
+                    if isinstance(value, BaseModel):
+                        anchors[id(value)] = _to_float(width(obj))
+                    else:
+                        anchors[(id(obj), name)] = _to_float(width(obj))
+                intervals += [(obj, s, e) for s, e in INTERVALS.get(cls, [])]
+                polylines += [(obj, name) for name in POLYLINES.get(cls, [])]
+
+            if cls in DIRECTED_LENGTHS and not self.keeps_lengths:
+                directed.append((obj, DIRECTED_LENGTHS[cls]))
+
+            for name, role in COORDINATE_FIELDS.get(cls, {}).items():
+                value = _to_float(getattr(obj, name))
+                if not isfinite(value):
+                    continue
+                if role in [ANGLE_VERTICAL, ANGLE_HORIZONTAL]:
+                    angles.append((obj, name, role, value))
+                    continue
+                if role == X:
+                    value += anchors.get(id(obj), 0.0) if name == "X" else 0.0
+                    value += anchors.get((id(obj), name), 0.0)
+                refs[role].append((obj, name))
+                values[role].append(value)
+
+            for value in obj.__dict__.values():
+                if isinstance(value, (BaseModel, list)):
+                    stack.append(value)
+
+        new_values = {
+            X: self.apply_x(np.array(values[X], dtype=float)),
+            Z: self.apply_z(np.array(values[Z], dtype=float)),
+            DX: abs(self.x_factor) * np.array(values[DX], dtype=float),
+            DZ: self.z_factor * np.array(values[DZ], dtype=float),
+            FORCE_X: np.sign(self.x_factor) * np.array(values[FORCE_X], dtype=float),
+        }
+        for role, role_refs in refs.items():
+            for (obj, name), value in zip(role_refs, new_values[role].tolist()):
+                _set_field(obj, name, value)
+
+        # the lengths change with the scale in the original direction of the object
+        for obj, (angle_name, length_names, list_names) in directed:
+            angle = radians(_to_float(getattr(obj, angle_name)))
+            if not isfinite(angle):
+                continue
+            factor = hypot(self.x_factor * cos(angle), self.z_factor * sin(angle))
+            items = [(obj, name) for name in length_names]
+            for list_name in list_names:
+                items += [(o, "Distance") for o in getattr(obj, list_name) or [] if o]
+            for item, name in items:
+                value = _to_float(getattr(item, name))
+                if isfinite(value):
+                    _set_field(item, name, factor * value)
+
+        for obj, name, role, value in angles:
+            if role == ANGLE_HORIZONTAL and not self.keeps_angles:
+                # the direction of the scaled vector (cos, sin)
+                value = radians(value)
+                value = degrees(
+                    atan2(self.z_factor * sin(value), self.x_factor * cos(value))
+                )
+                _set_field(obj, name, value % 360.0 + 0.0)
+            elif self.is_mirror and role == ANGLE_VERTICAL:
+                _set_field(obj, name, -value + 0.0)
+            elif self.is_mirror:
+                _set_field(obj, name, (180.0 - value) % 360.0)
+
+        if self.is_mirror:
+            for obj, start, end in intervals:
+                start_value, end_value = getattr(obj, start), getattr(obj, end)
+                _set_field(obj, start, end_value)
+                _set_field(obj, end, start_value)
+            for obj, name in polylines:
+                points = getattr(obj, name)
+                if points is not None:
+                    points.reverse()
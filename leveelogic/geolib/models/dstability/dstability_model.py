@@ -4,7 +4,9 @@ from pathlib import Path
 from typing import BinaryIO, List, Optional, Set, Type, Union
 
 import matplotlib.pyplot as plt
-from pydantic import DirectoryPath, FilePath
+import numpy as np
+import shapely
+from pydantic import DirectoryPath, Field, FilePath
 from shapely.geometry import LineString, Point, Polygon
 from shapely.ops import polygonize
 from shapely.validation import make_valid
@@ -72,7 +74,7 @@ class DStabilityModel(BaseModel):
     current_scenario: int = -1
     current_stage: int = -1
     current_calculation: int = -1
-    datastructure: DStabilityStructure = DStabilityStructure()
+    datastructure: DStabilityStructure = Field(default_factory=DStabilityStructure)
     current_id: int = -1
 
     def __init__(self, *args, **data) -> None:
@@ -305,6 +307,21 @@ class DStabilityModel(BaseModel):
             f"No waternet found for stage {stage_index} in scenario {scenario_index}."
         )
 
+    def _get_waternet_creator_settings(self, scenario_index: int, stage_index: int):
+        waternet_creator_settings_id = (
+            self.datastructure.scenarios[scenario_index]
+            .Stages[stage_index]
+            .WaternetCreatorSettingsId
+        )
+
+        for waternet_creator_settings in self.datastructure.waternetcreatorsettings:
+            if waternet_creator_settings.Id == waternet_creator_settings_id:
+                return waternet_creator_settings
+
+        raise ValueError(
+            f"No waternet creator settings found for stage {stage_index} in scenario {scenario_index}."
+        )
+
     def _get_state(self, scenario_index: int, stage_index: int):
         state_id = (
             self.datastructure.scenarios[scenario_index].Stages[stage_index].StateId
@@ -502,36 +519,82 @@ class DStabilityModel(BaseModel):
         Returns:
             int: id of the added layer
         """
+        return self.add_layers(
+            [points],
+            [soil_code],
+            labels=[label],
+            notes=[notes],
+            scenario_index=scenario_index,
+            stage_index=stage_index,
+        )[0]
+
+    def add_layers(
+        self,
+        layers: List[List[Point]],
+        soil_codes: List[str],
+        labels: Optional[List[str]] = None,
+        notes: Optional[List[str]] = None,
+        scenario_index: Optional[int] = None,
+        stage_index: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Add a batch of soil layers to the model
+
+        The new layers are connected to the existing layers and to each other in one
+        pass which is a lot faster than adding the layers one by one.
+
+        Args:
+            layers (List[List[Point]]): list with the points of each layer, in clockwise order (non closed simple polygons)
+            soil_codes (List[str]): code of the soil for each layer
+            labels (Optional[List[str]]): label for each layer, defaults to empty strings
+            notes (Optional[List[str]]): notes for each layer, defaults to empty strings
+            scenario_index (Optional[int]): scenario to add to, defaults to the current scenario
+            stage_index (Optional[int]): stage to add to, defaults to the current stage
+
+        Returns:
+            List[int]: ids of the added layers
+        """
+        if labels is None:
+            labels = [""] * len(layers)
+        if notes is None:
+            notes = [""] * len(layers)
+        if not len(layers) == len(soil_codes) == len(labels) == len(notes):
+            raise ValueError(
+                "The number of layers, soil codes, labels and notes should be the same."
+            )
+
         scenario_index = self.get_scenario_index(scenario_index)
         stage_index = self.get_stage_index(stage_index)
 
         geometry = self._get_geometry(scenario_index, stage_index)
         soil_layers = self._get_soil_layers(scenario_index, stage_index)
 
-        # Check if we have the soil code
-        if not self.soils.has_soil_code(soil_code):
-            raise ValueError(
-                f"The soil with code {soil_code} is not defined in the soil collection."
-            )
-
-        # Make sure the points are valid
-        persistable_points = self.make_points_valid(points)
+        # Check if we have the soil codes before anything is changed
+        for soil_code in soil_codes:
+            if not self.soils.has_soil_code(soil_code):
+                raise ValueError(
+                    f"The soil with code {soil_code} is not defined in the soil collection."
+                )
 
-        # Create the new layer
-        new_layer = PersistableLayer(
-            Id=str(self._get_next_id()),
-            Label=label,
-            Points=persistable_points,
-            Notes=notes,
-        )
+        # Create the new layers with valid points
+        new_layers = [
+            PersistableLayer(
+                Id=str(self._get_next_id()),
+                Label=label,
+                Points=self.make_points_valid(points),
+                Notes=layer_notes,
+            )
+            for points, label, layer_notes in zip(layers, labels, notes)
+        ]
 
-        # Add the layer to the geometry
-        self.add_layer_and_connect_points(geometry.Layers, new_layer)
+        # Add the layers to the geometry
+        self.add_layers_and_connect_points(geometry.Layers, new_layers)
 
-        # Add the connection between the layer and the soil to soillayers
-        soil = self.soils.get_soil(soil_code)
-        soil_layers.add_soillayer(layer_id=new_layer.Id, soil_id=soil.Id)
-        return int(new_layer.Id)
+        # Add the connection between the layers and the soils to soillayers
+        for new_layer, soil_code in zip(new_layers, soil_codes):
+            soil = self.soils.get_soil(soil_code)
+            soil_layers.add_soillayer(layer_id=new_layer.Id, soil_id=soil.Id)
+        return [int(new_layer.Id) for new_layer in new_layers]
 
     def make_points_valid(self, points: List[Point]) -> List[PersistablePoint]:
         valid_points = make_valid(self.geolib_points_to_shapely_polygon(points))
@@ -556,26 +619,67 @@ class DStabilityModel(BaseModel):
         self, current_layers: List[PersistableLayer], new_layer: PersistableLayer
     ):
         """Adds a new layer to the list of layers and connects the points of the new layer to the existing layers."""
+        self.add_layers_and_connect_points(current_layers, [new_layer])
 
-        current_layers.append(new_layer)
-
-        # Check if the new layer intersects with any of the existing layers
-        for layer in current_layers:
-            if layer != new_layer and self.dstability_points_to_shapely_polygon(
-                layer.Points
-            ).exterior.intersects(
-                self.dstability_points_to_shapely_polygon(new_layer.Points).exterior
-            ):
-                # If it does, connect the layers
-                linestring1, linestring2 = self.connect_layers(layer, new_layer)
+    def add_layers_and_connect_points(
+        self, current_layers: List[PersistableLayer], new_layers: List[PersistableLayer]
+    ):
+        """Adds the new layers to the list of layers and connects the points of the new layers to the existing layers and to each other.
+
+        The layers that touch a new layer are found with a spatial index on the layer
+        exteriors. The exteriors of these layers are combined in one planar overlay and
+        each layer gets the points of the face of the overlay that it covers. Layers that
+        do not match exactly one face (like overlapping layers) keep their points."""
+        num_existing = len(current_layers)
+        current_layers += new_layers
+        if len(new_layers) == 0:
+            return
+
+        exteriors = shapely.linearrings(
+            [(p.X, p.Z) for layer in current_layers for p in layer.Points],
+            indices=[i for i, layer in enumerate(current_layers) for _ in layer.Points],
+        )
 
-                # Update the points of the layers
-                current_layers[current_layers.index(layer)].Points = (
-                    self.to_dstability_points(linestring1)
-                )
-                current_layers[current_layers.index(new_layer)].Points = (
-                    self.to_dstability_points(linestring2)
-                )
+        # Find the layers that touch a new layer
+        new_index, other_index = shapely.STRtree(exteriors).query(
+            exteriors[num_existing:], predicate="intersects"
+        )
+        new_index += num_existing
+        touching = new_index != other_index
+        connected = np.unique(
+            np.concatenate([new_index[touching], other_index[touching]])
+        )
+        if len(connected) == 0:
+            return
+
+        # Create the planar overlay of the connected layers, this adds the points of
+        # the layers on the edges of the touching layers
+        overlay = shapely.union_all(exteriors[connected], grid_size=1e-3)
+        faces = shapely.get_parts(shapely.polygonize(shapely.get_parts(overlay)))
+        if len(faces) == 0:
+            return
+
+        # Find the face(s) inside each layer
+        polygons = shapely.polygons(exteriors[connected])
+        face_index, layer_index = shapely.STRtree(polygons).query(
+            shapely.point_on_surface(faces), predicate="within"
+        )
+        num_faces = np.bincount(layer_index, minlength=len(connected))
+        for j, i in zip(face_index.tolist(), layer_index.tolist()):
+            if num_faces[i] != 1:
+                continue
+            polygon, face = polygons[i], faces[j]
+            # with the grid size the area can only change a little
+            if abs(face.area - polygon.area) > 1e-3 * polygon.length:
+                continue
+            ring = face.exterior
+            # keep the orientation of the layer
+            if ring.is_ccw != polygon.exterior.is_ccw:
+                ring = shapely.reverse(ring)
+            layer = current_layers[connected[i]]
+            current_layers[connected[i]] = layer.copy(
+                update={"Points": self.to_dstability_points(ring)}
+            )
 
     def to_shapely_linestring(self, points: List[PersistablePoint]) -> LineString:
         converted_points = [(p.X, p.Z) for p in points]
@@ -604,13 +708,14 @@ class DStabilityModel(BaseModel):
                 )
             )
 
-        persistable_points = [PersistablePoint(X=p[0], Z=p[1]) for p in list(coords)]
+        coords = [(p[0], p[1]) for p in coords]
 
-        # Remove duplicate points
+        # Remove duplicate points, the last occurrence of a point is kept
+        last_occurrence = {p: n for n, p in enumerate(coords)}
         persistable_points = [
-            i
-            for n, i in enumerate(persistable_points)
-            if i not in persistable_points[n + 1 :]
+            PersistablePoint(X=p[0], Z=p[1])
+            for n, p in enumerate(coords)
+            if last_occurrence[p] == n
         ]
 
         # Remove last point if it is the same as the first
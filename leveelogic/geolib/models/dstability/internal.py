@@ -9,7 +9,7 @@ from itertools import chain
 from math import isfinite
 from typing import Dict, List, Optional, Set, Tuple, Union
 
-from pydantic import ValidationError, conlist, root_validator, validator
+from pydantic import Field, ValidationError, conlist, root_validator, validator
 
 from ....geolib import __version__ as version
 from ...geometry import Point
@@ -1981,26 +1981,8 @@ DStabilityResult = Union[
 ###########################
 
 
-class DStabilityStructure(BaseModelStructure):
-    """Highest level DStability class that should be parsed to and serialized from.
-
-    The List[] items (one for each stage in the model) will be stored in a subfolder
-    to multiple json files. Where the first (0) instance
-    has no suffix, but the second one has (1 => _1) etc.
-
-    also parses the outputs which are part of the json files
-    """
-
-    # input part
-    waternets: List[Waternet] = [Waternet(Id="14")]  # waternets/waternet_x.json
-    waternetcreatorsettings: List[WaternetCreatorSettings] = [
-        WaternetCreatorSettings(Id="15")
-    ]  # waternetcreatorsettings/waternetcreatorsettings_x.json
-    states: List[State] = [State(Id="16")]  # states/states_x.json
-    statecorrelations: List[StateCorrelation] = [
-        StateCorrelation(Id="17")
-    ]  # statecorrelations/statecorrelations_x.json
-    scenarios: List[Scenario] = [
+def _default_scenarios() -> List[Scenario]:
+    return [
         Scenario(
             Id="0",
             Label="Scenario 1",
@@ -2031,17 +2013,51 @@ class DStabilityStructure(BaseModelStructure):
             ],
         )
     ]
-    soillayers: List[SoilLayerCollection] = [SoilLayerCollection(Id="13")]
-    soilcorrelation: SoilCorrelation = SoilCorrelation()
-    soils: SoilCollection = SoilCollection()
-    soilvisualizations: SoilVisualisation = SoilVisualisation()
-    reinforcements: List[Reinforcements] = [Reinforcements(Id="19")]
-    projectinfo: ProjectInfo = ProjectInfo()
-    nailproperties: NailProperties = NailProperties()
-    loads: List[Loads] = [Loads(Id="18")]
-    decorations: List[Decorations] = [Decorations(Id="12")]
-    calculationsettings: List[CalculationSettings] = [CalculationSettings(Id="20")]
-    geometries: List[Geometry] = [Geometry(Id="11")]
+
+
+class DStabilityStructure(BaseModelStructure):
+    """Highest level DStability class that should be parsed to and serialized from.
+
+    The List[] items (one for each stage in the model) will be stored in a subfolder
+    to multiple json files. Where the first (0) instance
+    has no suffix, but the second one has (1 => _1) etc.
+
+    also parses the outputs which are part of the json files
+    """
+
+    # input part
+    waternets: List[Waternet] = Field(
+        default_factory=lambda: [Waternet(Id="14")]
+    )  # waternets/waternet_x.json
+    waternetcreatorsettings: List[WaternetCreatorSettings] = Field(
+        default_factory=lambda: [WaternetCreatorSettings(Id="15")]
+    )  # waternetcreatorsettings/waternetcreatorsettings_x.json
+    states: List[State] = Field(
+        default_factory=lambda: [State(Id="16")]
+    )  # states/states_x.json
+    statecorrelations: List[StateCorrelation] = Field(
+        default_factory=lambda: [StateCorrelation(Id="17")]
+    )  # statecorrelations/statecorrelations_x.json
+    scenarios: List[Scenario] = Field(default_factory=_default_scenarios)
+    soillayers: List[SoilLayerCollection] = Field(
+        default_factory=lambda: [SoilLayerCollection(Id="13")]
+    )
+    soilcorrelation: SoilCorrelation = Field(default_factory=SoilCorrelation)
+    soils: SoilCollection = Field(default_factory=SoilCollection)
+    soilvisualizations: SoilVisualisation = Field(default_factory=SoilVisualisation)
+    reinforcements: List[Reinforcements] = Field(
+        default_factory=lambda: [Reinforcements(Id="19")]
+    )
+    projectinfo: ProjectInfo = Field(default_factory=ProjectInfo)
+    nailproperties: NailProperties = Field(default_factory=NailProperties)
+    loads: List[Loads] = Field(default_factory=lambda: [Loads(Id="18")])
+    decorations: List[Decorations] = Field(
+        default_factory=lambda: [Decorations(Id="12")]
+    )
+    calculationsettings: List[CalculationSettings] = Field(
+        default_factory=lambda: [CalculationSettings(Id="20")]
+    )
+    geometries: List[Geometry] = Field(default_factory=lambda: [Geometry(Id="11")])
 
     # Output parts
     uplift_van_results: List[UpliftVanResult] = []
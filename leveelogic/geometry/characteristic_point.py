@@ -1,7 +1,11 @@
 from enum import IntEnum
-from math import isnan
+from math import isnan, nan
+from pydantic import BaseModel
+from typing import Dict, List
+import numpy as np
 
 from ..models.datamodel import DataModel
+from .surface_index import SurfaceIndex
 
 
 class CharacteristicPointType(IntEnum):
@@ -27,17 +31,155 @@ CharacteristicPointNames = {
     CharacteristicPointType.EMBANKEMENT_TOE_LAND_SIDE: "embankement toe land side",
     CharacteristicPointType.DITCH_EMBANKEMENT_SIDE: "ditch embankement side",
     CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE: "ditch bottom embankement side",
-    CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE: "ditch land side",
+    CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE: "ditch bottom land side",
     CharacteristicPointType.DITCH_LAND_SIDE: "ditch land side",
 }
 
 
+# the group and name of the attribute of the waternet creator settings that holds the
+# x coordinate of each characteristic point
+CharacteristicPointSettings = {
+    CharacteristicPointType.EMBANKEMENT_TOE_WATER_SIDE: (
+        "EmbankmentCharacteristics",
+        "EmbankmentToeWaterSide",
+    ),
+    CharacteristicPointType.EMBANKEMENT_TOP_WATER_SIDE: (
+        "EmbankmentCharacteristics",
+        "EmbankmentTopWaterSide",
+    ),
+    CharacteristicPointType.EMBANKEMENT_TOP_LAND_SIDE: (
+        "EmbankmentCharacteristics",
+        "EmbankmentTopLandSide",
+    ),
+    CharacteristicPointType.SHOULDER_BASE_LAND_SIDE: (
+        "EmbankmentCharacteristics",
+        "ShoulderBaseLandSide",
+    ),
+    CharacteristicPointType.EMBANKEMENT_TOE_LAND_SIDE: (
+        "EmbankmentCharacteristics",
+        "EmbankmentToeLandSide",
+    ),
+    CharacteristicPointType.DITCH_EMBANKEMENT_SIDE: (
+        "DitchCharacteristics",
+        "DitchEmbankmentSide",
+    ),
+    CharacteristicPointType.DITCH_BOTTOM_EMBANKEMENT_SIDE: (
+        "DitchCharacteristics",
+        "DitchBottomEmbankmentSide",
+    ),
+    CharacteristicPointType.DITCH_BOTTOM_LAND_SIDE: (
+        "DitchCharacteristics",
+        "DitchBottomLandSide",
+    ),
+    CharacteristicPointType.DITCH_LAND_SIDE: (
+        "DitchCharacteristics",
+        "DitchLandSide",
+    ),
+}
+
+
 class CharacteristicPoint(DataModel):
     """Class to store characteristic point information"""
 
     x: float
     point_type: CharacteristicPointType
+    z: float = nan
 
     @property
     def is_valid(self) -> bool:
         return not isnan(self.x)
+
+
+class CharacteristicPointTable(BaseModel):
+    """Table with all characteristic points of a stage and the surface level at
+    these points
+
+    Args:
+        point_types (List[CharacteristicPointType]): the point types in the order of the arrays
+        xs (np.ndarray): the x coordinates, nan if the point is not set
+        zs (np.ndarray): the surface level at the points, nan if the point is not set or outside the geometry
+    """
+
+    point_types: List[CharacteristicPointType] = []
+    xs: np.ndarray = np.zeros(0)
+    zs: np.ndarray = np.zeros(0)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_waternet_creator_settings(
+        cls, settings, surface_index: SurfaceIndex
+    ) -> "CharacteristicPointTable":
+        """Create the table from the waternet creator settings of a stage
+
+        Args:
+            settings (WaternetCreatorSettings): The waternet creator settings
+            surface_index (SurfaceIndex): The surface index of the stage
+
+        Returns:
+            CharacteristicPointTable: The table
+        """
+        point_types = list(CharacteristicPointSettings.keys())
+        xs = np.array(
+            [
+                _to_float(getattr(getattr(settings, group, None), name, None))
+                for group, name in CharacteristicPointSettings.values()
+            ]
+        )
+        return cls(point_types=point_types, xs=xs, zs=surface_index.z_at(xs))
+
+    @property
+    def is_valid(self) -> np.ndarray:
+        return ~np.isnan(self.xs)
+
+    def get(self, point_type: CharacteristicPointType) -> CharacteristicPoint:
+        """Get the characteristic point of the given type
+
+        Args:
+            point_type (CharacteristicPointType): The point type
+
+        Raises:
+            ValueError: If the point type is not a valid characteristic point type
+
+        Returns:
+            CharacteristicPoint: The point, the x coordinate is nan if the point is not set
+        """
+        if not point_type in self.point_types:
+            raise ValueError(
+                f"Invalid characteristic point type ({point_type}) requested"
+            )
+        i = self.point_types.index(point_type)
+        return CharacteristicPoint(
+            x=float(self.xs[i]), z=float(self.zs[i]), point_type=point_type
+        )
+
+    def to_records(self) -> List[Dict]:
+        """Get all points as a list of dictionaries, for example to export them
+
+        Returns:
+            List[Dict]: The point type, name, x, z and validity of each point
+        """
+        return [
+            {
+                "point_type": int(point_type),
+                "name": CharacteristicPointNames[point_type],
+                "x": x,
+                "z": z,
+                "is_valid": is_valid,
+            }
+            for point_type, x, z, is_valid in zip(
+                self.point_types,
+                self.xs.tolist(),
+                self.zs.tolist(),
+                self.is_valid.tolist(),
+            )
+        ]
+
+
+def _to_float(value) -> float:
+    # the settings use the string 'NaN' (or None) for points that are not set
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return nan
@@ -0,0 +1,204 @@
+from pydantic import BaseModel
+from typing import List, Tuple
+import numpy as np
+
+from .geometry_store import GeometryStore
+
+
+class EdgeIndex(BaseModel):
+    """An index on the (non vertical) edges of all layers of a geometry
+
+    The x range of the geometry is divided into slabs using the x coordinates of all
+    points. Within a slab the same edges are crossed by every vertical line and since
+    layers do not overlap the order of these edges does not change. For every slab the
+    index stores the intervals (top edge, bottom edge and layer) from top to bottom so
+    the layers at many x coordinates can be found without looping over the edges.
+
+    Args:
+        x1, z1, x2, z2 (np.ndarray): the edges from left to right
+        vertical_x, vertical_z1, vertical_z2 (np.ndarray): the vertical edges
+        breaks (np.ndarray): the sorted x coordinates of the slab limits
+        slab_intervals (List[np.ndarray]): per slab a (k,3) array with the top edge, bottom edge and layer index
+    """
+
+    x1: np.ndarray = np.zeros(0)
+    z1: np.ndarray = np.zeros(0)
+    x2: np.ndarray = np.zeros(0)
+    z2: np.ndarray = np.zeros(0)
+    vertical_x: np.ndarray = np.zeros(0)
+    vertical_z1: np.ndarray = np.zeros(0)
+    vertical_z2: np.ndarray = np.zeros(0)
+    breaks: np.ndarray = np.zeros(0)
+    slab_intervals: List[np.ndarray] = []
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_geometry(cls, geometry: GeometryStore) -> "EdgeIndex":
+        """Create the edge index for the given geometry
+
+        Args:
+            geometry (GeometryStore): The geometry
+
+        Returns:
+            EdgeIndex: The edge index
+        """
+        if geometry.num_layers == 0:
+            return cls()
+
+        starts, ends, layers = [], [], []
+        for i, layer in enumerate(geometry.layers):
+            starts.append(layer)
+            ends.append(np.roll(layer, -1, axis=0))
+            layers.append(np.full(len(layer), i))
+        starts, ends, layers = np.vstack(starts), np.vstack(ends), np.hstack(layers)
+
+        # vertical edges are never crossed by a vertical line
+        keep = starts[:, 0] != ends[:, 0]
+        vertical_x = starts[~keep, 0]
+        vertical_z1 = starts[~keep, 1]
+        vertical_z2 = ends[~keep, 1]
+        starts, ends, layers = starts[keep], ends[keep], layers[keep]
+
+        # let all edges run from left to right
+        swap = starts[:, 0] > ends[:, 0]
+        left = np.where(swap[:, None], ends, starts)
+        right = np.where(swap[:, None], starts, ends)
+
+        breaks = np.unique(np.hstack([left[:, 0], right[:, 0]]))
+        mids = (breaks[:-1] + breaks[1:]) / 2.0
+
+        slab_intervals = []
+        for x_start, x_end, x_mid in zip(breaks[:-1], breaks[1:], mids):
+            edges = np.flatnonzero((left[:, 0] <= x_start) & (right[:, 0] >= x_end))
+            z_mid = left[edges, 1] + (x_mid - left[edges, 0]) / (
+                right[edges, 0] - left[edges, 0]
+            ) * (right[edges, 1] - left[edges, 1])
+
+            # sort per layer from top to bottom, every two edges form an interval
+            order = np.lexsort((-z_mid, layers[edges]))
+            edges, z_mid = edges[order], z_mid[order]
+            edge_layers = layers[edges]
+            intervals = []
+            for layer in np.unique(edge_layers):
+                layer_edges = np.flatnonzero(edge_layers == layer)
+                for j in range(0, len(layer_edges) - 1, 2):
+                    top, bottom = layer_edges[j], layer_edges[j + 1]
+                    intervals.append((edges[top], edges[bottom], layer, z_mid[top]))
+
+            intervals = sorted(intervals, key=lambda x: -x[3])
+            slab_intervals.append(
+                np.array([iv[:3] for iv in intervals], dtype=int).reshape(-1, 3)
+            )
+
+        return cls(
+            x1=left[:, 0],
+            z1=left[:, 1],
+            x2=right[:, 0],
+            z2=right[:, 1],
+            vertical_x=vertical_x,
+            vertical_z1=vertical_z1,
+            vertical_z2=vertical_z2,
+            breaks=breaks,
+            slab_intervals=slab_intervals,
+        )
+
+    @property
+    def num_slabs(self) -> int:
+        return len(self.slab_intervals)
+
+    @property
+    def max_intervals(self) -> int:
+        if self.num_slabs == 0:
+            return 0
+        return max([len(iv) for iv in self.slab_intervals])
+
+    def slabs_at(self, xs: np.ndarray) -> np.ndarray:
+        """Get the slab index for each x coordinate, a coordinate on a slab limit
+        belongs to the slab on the right side (except for the rightmost limit)
+
+        Args:
+            xs (np.ndarray): The x coordinates
+
+        Returns:
+            np.ndarray: The slab indices, -1 if the coordinate is outside the geometry
+        """
+        xs = np.asarray(xs, dtype=float)
+        if self.num_slabs == 0:
+            return np.full(xs.shape, -1)
+
+        slabs = np.searchsorted(self.breaks, xs, side="right") - 1
+        slabs[xs == self.breaks[-1]] = self.num_slabs - 1
+        slabs[(xs < self.breaks[0]) | (xs > self.breaks[-1]) | np.isnan(xs)] = -1
+        return slabs
+
+    def _z(self, edges: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        x1, z1 = self.x1[edges], self.z1[edges]
+        x2, z2 = self.x2[edges], self.z2[edges]
+        return z1 + (xs - x1) / (x2 - x1) * (z2 - z1)
+
+    def layers_at(self, xs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the layers at the given x coordinates
+
+        Args:
+            xs (np.ndarray): The x coordinates
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Three (len(xs), max_intervals) arrays
+            with the tops, the bottoms and the layer indices sorted from top to bottom, the
+            unused positions are filled with nan (tops and bottoms) and -1 (layers)
+        """
+        xs = np.asarray(xs, dtype=float).ravel()
+        tops = np.full((len(xs), self.max_intervals), np.nan)
+        bottoms = np.full((len(xs), self.max_intervals), np.nan)
+        layers = np.full((len(xs), self.max_intervals), -1, dtype=int)
+
+        slabs = self.slabs_at(xs)
+        for slab in np.unique(slabs[slabs >= 0]):
+            intervals = self.slab_intervals[slab]
+            if len(intervals) == 0:
+                continue
+            rows = np.flatnonzero(slabs == slab)
+            x = xs[rows][:, None]
+            n = len(intervals)
+            tops[rows, :n] = self._z(intervals[:, 0], x)
+            bottoms[rows, :n] = self._z(intervals[:, 1], x)
+            layers[rows, :n] = intervals[:, 2]
+
+        return tops, bottoms, layers
+
+    def layer_at(
+        self, xs: np.ndarray, zs: np.ndarray, tolerance: float = 1e-6
+    ) -> np.ndarray:
+        """Get the index of the layer that contains each of the given points
+
+        A point on the edge between two layers belongs to the upper layer and a point
+        on a vertical edge belongs to the layer on the right side (except on the right
+        limit of the geometry).
+
+        Args:
+            xs (np.ndarray): The x coordinates
+            zs (np.ndarray): The z coordinates
+            tolerance (float, optional): The tolerance for points on an edge. Defaults to 1e-6.
+
+        Returns:
+            np.ndarray: The layer index for each point, -1 if the point is not in any layer
+        """
+        xs = np.asarray(xs, dtype=float).ravel()
+        zs = np.asarray(zs, dtype=float).ravel()
+        if xs.shape != zs.shape:
+            raise ValueError(
+                f"Got {len(xs)} x coordinates and {len(zs)} z coordinates, these should be equal"
+            )
+
+        tops, bottoms, layers = self.layers_at(xs)
+        inside = (bottoms - tolerance <= zs[:, None]) & (
+            zs[:, None] <= tops + tolerance
+        )
+        found = inside.any(axis=1)
+        first = np.argmax(inside, axis=1)
+
+        result = np.full(len(xs), -1, dtype=int)
+        result[found] = layers[found, first[found]]
+        return result
@@ -0,0 +1,169 @@
+from pydantic import BaseModel
+from typing import List, Tuple
+from shapely.geometry import Polygon
+from shapely.geometry.polygon import orient
+from shapely.ops import unary_union
+import numpy as np
+import shapely
+
+from .topology import TopologyReport, build_boundary
+
+
+class GeometryStore(BaseModel):
+    """Stores all coordinates of the geometry of one stage in one numpy array
+
+    The array contains the points of all layers followed by the points of the boundary.
+    The layers are found using the layer offsets, the boundary starts at the top left
+    point and runs clockwise so the surface is the first part of the boundary. All
+    the layer, boundary and surface arrays are views on the same array.
+
+    Args:
+        coordinates (np.ndarray): the (n,2) array with the x and z coordinates
+        layer_ids (List[str]): the ids of the layers
+        layer_offsets (np.ndarray): the index of the first point of each layer, the last item is the start of the boundary
+        surface_length (int): the number of points of the surface
+        left, right, top, bottom (float): the extents of the layer points
+        topology (TopologyReport): the topology problems found while creating the boundary
+    """
+
+    coordinates: np.ndarray = np.zeros((0, 2))
+    layer_ids: List[str] = []
+    layer_offsets: np.ndarray = np.zeros(1, dtype=int)
+    surface_length: int = 0
+    left: float = 0.0
+    right: float = 0.0
+    top: float = 0.0
+    bottom: float = 0.0
+    topology: TopologyReport = TopologyReport()
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_layers(
+        cls, layers: List[Tuple[str, List[Tuple[float, float]]]]
+    ) -> "GeometryStore":
+        """Create the store from the given layers
+
+        Args:
+            layers (List[Tuple[str, List[Tuple[float, float]]]]): The layer ids and points
+
+        Returns:
+            GeometryStore: The geometry store
+        """
+        if len(layers) == 0:
+            return cls()
+
+        layer_ids = [layer[0] for layer in layers]
+        layer_coordinates = [np.array(layer[1], dtype=float) for layer in layers]
+        layer_offsets = np.zeros(len(layers) + 1, dtype=int)
+        layer_offsets[1:] = np.cumsum([len(c) for c in layer_coordinates])
+
+        # the boundary consists of the edges that are used by one layer, if layers
+        # overlap this is not true so then fall back to merging the polygons
+        boundary, topology = build_boundary(layer_coordinates)
+        if (
+            len(boundary) == 0
+            or topology.has_overlaps
+            or len(topology.dangling_nodes) > 0
+        ):
+            polygon = orient(
+                unary_union([Polygon(c) for c in layer_coordinates]), sign=-1
+            )
+            boundary = np.round(np.array(polygon.exterior.coords)[:-1], 3)
+
+        # start the boundary at the top left point
+        left, right = boundary[:, 0].min(), boundary[:, 0].max()
+        idx_left = np.flatnonzero(boundary[:, 0] == left)
+        idx_left = idx_left[np.argmax(boundary[idx_left, 1])]
+        boundary = np.roll(boundary, -idx_left, axis=0)
+
+        # the surface runs to the top right point
+        idx_right = np.flatnonzero(boundary[:, 0] == right)
+        idx_right = idx_right[np.argmax(boundary[idx_right, 1])]
+
+        coordinates = np.vstack(layer_coordinates + [boundary])
+        points = coordinates[: layer_offsets[-1]]
+
+        return cls(
+            coordinates=coordinates,
+            layer_ids=layer_ids,
+            layer_offsets=layer_offsets,
+            surface_length=int(idx_right) + 1,
+            left=float(points[:, 0].min()),
+            right=float(points[:, 0].max()),
+            top=float(points[:, 1].max()),
+            bottom=float(points[:, 1].min()),
+            topology=topology,
+        )
+
+    @property
+    def num_layers(self) -> int:
+        return len(self.layer_ids)
+
+    @property
+    def points(self) -> np.ndarray:
+        """Get the points of all layers
+
+        Returns:
+            np.ndarray: The (n,2) array of the points
+        """
+        return self.coordinates[: self.layer_offsets[-1]]
+
+    @property
+    def boundary(self) -> np.ndarray:
+        """Get the boundary points (clockwise, starting at the top left point)
+
+        Returns:
+            np.ndarray: The (n,2) array of the boundary points
+        """
+        return self.coordinates[self.layer_offsets[-1] :]
+
+    @property
+    def surface(self) -> np.ndarray:
+        """Get the surface points from left to right
+
+        Returns:
+            np.ndarray: The (n,2) array of the surface points
+        """
+        return self.boundary[: self.surface_length]
+
+    def layer(self, index: int) -> np.ndarray:
+        """Get the points of the layer with the given index
+
+        Args:
+            index (int): The index of the layer
+
+        Returns:
+            np.ndarray: The (n,2) array of the layer points
+        """
+        return self.coordinates[
+            self.layer_offsets[index] : self.layer_offsets[index + 1]
+        ]
+
+    @property
+    def layers(self) -> List[np.ndarray]:
+        return [self.layer(i) for i in range(self.num_layers)]
+
+    def layer_polygons(self) -> np.ndarray:
+        """Get the layers as shapely polygons, all polygons are created in one call
+
+        Returns:
+            np.ndarray: The array with a polygon for each layer
+        """
+        if self.num_layers == 0:
+            return np.empty(0, dtype=object)
+        indices = np.repeat(np.arange(self.num_layers), np.diff(self.layer_offsets))
+        return shapely.polygons(shapely.linearrings(self.points, indices=indices))
+
+    @staticmethod
+    def to_list(coordinates: np.ndarray) -> List[Tuple[float, float]]:
+        """Convert the coordinates to a list of tuples
+
+        Args:
+            coordinates (np.ndarray): The (n,2) array
+
+        Returns:
+            List[Tuple[float, float]]: The list of (x,z) tuples
+        """
+        return [(x, z) for x, z in coordinates.tolist()]
@@ -0,0 +1,131 @@
+from pydantic import BaseModel
+import numpy as np
+import shapely
+
+from .edge_index import EdgeIndex
+
+MIXED_CELL = -2
+
+
+class LayerRaster(BaseModel):
+    """A raster with the layer index of each cell of a geometry
+
+    Cells that are crossed by an edge of a layer get the value MIXED_CELL, the points
+    in these cells are looked up in the edge index so the result is always exact.
+
+    Args:
+        edge_index (EdgeIndex): the edge index of the geometry
+        cell_size (float): the width and height of a cell
+        left (float): the x coordinate of the left side of the raster
+        bottom (float): the z coordinate of the bottom side of the raster
+        cells (np.ndarray): the (rows, columns) array with the layer indices, -1 outside the geometry
+    """
+
+    edge_index: EdgeIndex
+    cell_size: float
+    left: float
+    bottom: float
+    cells: np.ndarray
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_edge_index(
+        cls, edge_index: EdgeIndex, bottom: float, top: float, cell_size: float
+    ) -> "LayerRaster":
+        """Create the raster for the given edge index
+
+        Args:
+            edge_index (EdgeIndex): The edge index
+            bottom (float): The bottom of the geometry
+            top (float): The top of the geometry
+            cell_size (float): The width and height of a cell
+
+        Returns:
+            LayerRaster: The raster
+        """
+        if cell_size <= 0.0:
+            raise ValueError(f"The cell size should be positive, got {cell_size}")
+
+        if edge_index.num_slabs == 0:
+            return cls(
+                edge_index=edge_index,
+                cell_size=cell_size,
+                left=0.0,
+                bottom=0.0,
+                cells=np.full((0, 0), -1, dtype=int),
+            )
+
+        left, right = edge_index.breaks[0], edge_index.breaks[-1]
+        num_columns = max(int(np.ceil((right - left) / cell_size)), 1)
+        num_rows = max(int(np.ceil((top - bottom) / cell_size)), 1)
+
+        # label every cell with the layer at the center of the cell
+        xs = left + (np.arange(num_columns) + 0.5) * cell_size
+        zs = bottom + (np.arange(num_rows) + 0.5) * cell_size
+        xx, zz = np.meshgrid(xs, zs)
+        cells = edge_index.layer_at(xx.ravel(), zz.ravel()).reshape(
+            num_rows, num_columns
+        )
+
+        # the cells that touch an edge (including the vertical ones) are mixed
+        x1 = np.hstack([edge_index.x1, edge_index.vertical_x])
+        z1 = np.hstack([edge_index.z1, edge_index.vertical_z1])
+        x2 = np.hstack([edge_index.x2, edge_index.vertical_x])
+        z2 = np.hstack([edge_index.z2, edge_index.vertical_z2])
+        edges = shapely.linestrings(
+            np.stack([np.stack([x1, z1], axis=1), np.stack([x2, z2], axis=1)], axis=1)
+        )
+        boxes = shapely.box(
+            xx.ravel() - cell_size / 2.0,
+            zz.ravel() - cell_size / 2.0,
+            xx.ravel() + cell_size / 2.0,
+            zz.ravel() + cell_size / 2.0,
+        )
+        tree = shapely.STRtree(edges)
+        mixed = np.unique(tree.query(boxes, predicate="intersects")[0])
+        cells.ravel()[mixed] = MIXED_CELL
+
+        return cls(
+            edge_index=edge_index,
+            cell_size=cell_size,
+            left=left,
+            bottom=bottom,
+            cells=cells,
+        )
+
+    def layer_at(self, xs: np.ndarray, zs: np.ndarray) -> np.ndarray:
+        """Get the index of the layer that contains each of the given points, see
+        EdgeIndex.layer_at for the rules for points on an edge
+
+        Args:
+            xs (np.ndarray): The x coordinates
+            zs (np.ndarray): The z coordinates
+
+        Returns:
+            np.ndarray: The layer index for each point, -1 if the point is not in any layer
+        """
+        xs = np.asarray(xs, dtype=float).ravel()
+        zs = np.asarray(zs, dtype=float).ravel()
+        if xs.shape != zs.shape:
+            raise ValueError(
+                f"Got {len(xs)} x coordinates and {len(zs)} z coordinates, these should be equal"
+            )
+
+        # points outside the raster are also looked up in the edge index
+        result = np.full(len(xs), MIXED_CELL, dtype=int)
+        num_rows, num_columns = self.cells.shape
+        columns = np.floor((xs - self.left) / self.cell_size)
+        rows = np.floor((zs - self.bottom) / self.cell_size)
+        inside = (
+            (columns >= 0) & (columns < num_columns) & (rows >= 0) & (rows < num_rows)
+        )
+        result[inside] = self.cells[
+            rows[inside].astype(int), columns[inside].astype(int)
+        ]
+
+        mixed = result == MIXED_CELL
+        if mixed.any():
+            result[mixed] = self.edge_index.layer_at(xs[mixed], zs[mixed])
+        return result
@@ -0,0 +1,234 @@
+from pydantic import BaseModel
+from typing import List, Tuple
+import numpy as np
+
+# tolerance for points on the start or end of a segment
+SEGMENT_TOLERANCE = 1e-9
+
+
+class SurfaceIndex(BaseModel):
+    """An index on the surface line backed by arrays sorted on x
+
+    Args:
+        xs (np.ndarray): the x coordinates of the surface points sorted from left to right
+        zs (np.ndarray): the z coordinates of the surface points
+        unique_xs (np.ndarray): the unique x coordinates
+        max_zs (np.ndarray): the highest z coordinate for each unique x coordinate
+    """
+
+    xs: np.ndarray = np.zeros(0)
+    zs: np.ndarray = np.zeros(0)
+    unique_xs: np.ndarray = np.zeros(0)
+    max_zs: np.ndarray = np.zeros(0)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_surface(cls, surface: np.ndarray) -> "SurfaceIndex":
+        """Create the index from the surface points
+
+        Args:
+            surface (np.ndarray): The (n,2) array of the surface from left to right
+
+        Returns:
+            SurfaceIndex: The surface index
+        """
+        surface = np.asarray(surface, dtype=float).reshape(-1, 2)
+        # stable so points with the same x (vertical parts) keep the surface order
+        order = np.argsort(surface[:, 0], kind="stable")
+        xs, zs = surface[order, 0], surface[order, 1]
+        unique_xs, inverse = np.unique(xs, return_inverse=True)
+        max_zs = np.full(len(unique_xs), -np.inf)
+        np.maximum.at(max_zs, inverse, zs)
+        return cls(xs=xs, zs=zs, unique_xs=unique_xs, max_zs=max_zs)
+
+    @property
+    def points(self) -> List[Tuple[float, float]]:
+        return list(zip(self.xs.tolist(), self.zs.tolist()))
+
+    def nearest_indices(self, xs: np.ndarray) -> np.ndarray:
+        """Get the index of the surface point closest to each x coordinate, if two points
+        are equally close the first one (from left to right) is used
+
+        Args:
+            xs (np.ndarray): The x coordinates
+
+        Returns:
+            np.ndarray: The indices of the closest points
+        """
+        xs = np.asarray(xs, dtype=float)
+        right = np.clip(np.searchsorted(self.xs, xs, side="left"), 0, len(self.xs) - 1)
+        right = np.searchsorted(self.xs, self.xs[right], side="left")
+        # the first point of the group of points with the same x on the left side
+        left = np.searchsorted(
+            self.xs, self.xs[np.clip(right - 1, 0, None)], side="left"
+        )
+        use_left = np.abs(xs - self.xs[left]) <= np.abs(self.xs[right] - xs)
+        return np.where(use_left, left, right)
+
+    def nearest(self, x: float) -> Tuple[float, float]:
+        """Get the surface point closest to the given x coordinate
+
+        Args:
+            x (float): The x coordinate
+
+        Returns:
+            Tuple[float, float]: The closest surface point
+        """
+        if len(self.xs) == 0:
+            return None
+        i = int(self.nearest_indices([x])[0])
+        return (float(self.xs[i]), float(self.zs[i]))
+
+    def points_between(self, left: float, right: float) -> List[Tuple[float, float]]:
+        """Get the surface points between the given limits (the limits excluded)
+
+        Args:
+            left (float): The left limit
+            right (float): The right limit
+
+        Returns:
+            List[Tuple[float, float]]: The surface points from left to right
+        """
+        start = np.searchsorted(self.xs, left, side="right")
+        end = np.searchsorted(self.xs, right, side="left")
+        return list(zip(self.xs[start:end].tolist(), self.zs[start:end].tolist()))
+
+    def z_at(self, xs: np.ndarray) -> np.ndarray:
+        """Get the surface level at the given x coordinates, on a vertical part of the
+        surface the highest point is used
+
+        Args:
+            xs (np.ndarray): The x coordinates
+
+        Returns:
+            np.ndarray: The z coordinates, nan if x is outside the surface
+        """
+        xs = np.asarray(xs, dtype=float)
+        result = np.full(xs.shape, np.nan)
+        if len(self.xs) == 0:
+            return result
+
+        inside = (xs >= self.xs[0]) & (xs <= self.xs[-1])
+        x = xs[inside]
+
+        # interpolate between the last point left of x and the first point right of x
+        i1 = np.clip(np.searchsorted(self.xs, x, side="right") - 1, 0, len(self.xs) - 2)
+        i2 = i1 + 1
+        dx = self.xs[i2] - self.xs[i1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where(
+                dx > 0,
+                self.zs[i1] + (x - self.xs[i1]) / dx * (self.zs[i2] - self.zs[i1]),
+                self.zs[i1],
+            )
+
+        # on the surface points use the highest point
+        j = np.clip(np.searchsorted(self.unique_xs, x), 0, len(self.unique_xs) - 1)
+        on_point = self.unique_xs[j] == x
+        z[on_point] = self.max_zs[j[on_point]]
+
+        result[inside] = z
+        return result
+
+    def intersections_many(
+        self, polylines: List[List[Tuple[float, float]]]
+    ) -> List[List[Tuple[float, float]]]:
+        """Get the intersections of many polylines with the surface in one call
+
+        Like helpers.polyline_polyline_intersections the points of a polyline are not
+        included unless they are also surface points.
+
+        Args:
+            polylines (List[List[Tuple[float, float]]]): The polylines
+
+        Returns:
+            List[List[Tuple[float, float]]]: The intersections per polyline sorted on x
+        """
+        result = [[] for _ in polylines]
+        if len(self.xs) < 2:
+            return result
+
+        starts, ends, line_ids = [], [], []
+        for i, polyline in enumerate(polylines):
+            p = np.asarray(polyline, dtype=float).reshape(-1, 2)
+            starts.append(p[:-1])
+            ends.append(p[1:])
+            line_ids.append(np.full(len(p) - 1, i))
+        a, b, line_ids = np.vstack(starts), np.vstack(ends), np.hstack(line_ids)
+
+        c = np.stack([self.xs[:-1], self.zs[:-1]], axis=1)
+        d = np.stack([self.xs[1:], self.zs[1:]], axis=1)
+
+        # all line segments against all surface segments
+        r = (b - a)[:, None, :]
+        s = (d - c)[None, :, :]
+        ca = c[None, :, :] - a[:, None, :]
+        denom = r[..., 0] * s[..., 1] - r[..., 1] * s[..., 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = (ca[..., 0] * s[..., 1] - ca[..., 1] * s[..., 0]) / denom
+            u = (ca[..., 0] * r[..., 1] - ca[..., 1] * r[..., 0]) / denom
+
+        tol = SEGMENT_TOLERANCE
+        hit = (denom != 0) & (t >= -tol) & (t <= 1 + tol) & (u >= -tol) & (u <= 1 + tol)
+        segments, surface_segments = np.nonzero(hit)
+        t, u = t[hit], u[hit]
+
+        points = a[segments] + t[:, None] * (b[segments] - a[segments])
+        # snap to the exact points to avoid rounding errors
+        on_surface_start = np.abs(u) <= tol
+        on_surface_end = np.abs(u - 1.0) <= tol
+        points[on_surface_start] = c[surface_segments[on_surface_start]]
+        points[on_surface_end] = d[surface_segments[on_surface_end]]
+        on_surface_point = on_surface_start | on_surface_end
+        on_line_start = np.abs(t) <= tol
+        on_line_end = np.abs(t - 1.0) <= tol
+        points[on_line_start & ~on_surface_point] = a[
+            segments[on_line_start & ~on_surface_point]
+        ]
+        points[on_line_end & ~on_surface_point] = b[
+            segments[on_line_end & ~on_surface_point]
+        ]
+
+        # skip the points of the polyline that are not surface points
+        keep = ~((on_line_start | on_line_end) & ~on_surface_point)
+
+        for line_id, point in zip(line_ids[segments[keep]], points[keep]):
+            p = (float(point[0]), float(point[1]))
+            if not p in result[line_id]:
+                result[line_id].append(p)
+
+        return [sorted(r, key=lambda x: x[0]) for r in result]
+
+    def intersections(
+        self, polyline: List[Tuple[float, float]]
+    ) -> List[Tuple[float, float]]:
+        """Get the intersections of the polyline with the surface
+
+        Args:
+            polyline (List[Tuple[float, float]]): The polyline
+
+        Returns:
+            List[Tuple[float, float]]: The intersections sorted on x
+        """
+        return self.intersections_many([polyline])[0]
+
+    def level_intersections(self, levels: List[float]) -> List[List[float]]:
+        """Get the x coordinates of the intersections of horizontal lines with the surface
+
+        Args:
+            levels (List[float]): The z coordinates of the horizontal lines
+
+        Returns:
+            List[List[float]]: The x coordinates of the intersections per level from left to right
+        """
+        if len(self.xs) == 0:
+            return [[] for _ in levels]
+        left, right = self.xs[0], self.xs[-1]
+        return [
+            [p[0] for p in intersections]
+            for intersections in self.intersections_many(
+                [[(left, z), (right, z)] for z in levels]
+            )
+        ]
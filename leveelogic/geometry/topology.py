@@ -0,0 +1,595 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import shapely
+
+# the number of decimals used to match the points of the layers
+TOPOLOGY_DECIMALS = 3
+
+Point = Tuple[float, float]
+Edge = Tuple[Point, Point]
+
+
+class TopologyReport(BaseModel):
+    """The topology problems found while creating the boundary of a geometry
+
+    Args:
+        gaps (List[List[Point]]): the rings around the areas inside the geometry that are not part of any layer
+        overlaps (List[Edge]): the edges that are used by more than one layer on the same side
+        crossings (List[Edge]): the outer edges of layers that cross an edge of another layer
+        dangling_nodes (List[Point]): the nodes where the boundary could not be closed
+        unshared_nodes (List[Point]): the nodes that lie on an edge of another layer without being a point of that layer
+    """
+
+    gaps: List[List[Point]] = []
+    overlaps: List[Edge] = []
+    crossings: List[Edge] = []
+    dangling_nodes: List[Point] = []
+    unshared_nodes: List[Point] = []
+
+    @property
+    def has_overlaps(self) -> bool:
+        return len(self.overlaps) > 0 or len(self.crossings) > 0
+
+    @property
+    def is_valid(self) -> bool:
+        return (
+            len(self.gaps) == 0
+            and not self.has_overlaps
+            and len(self.dangling_nodes) == 0
+            and len(self.unshared_nodes) == 0
+        )
+
+
+class SimplificationReport(BaseModel):
+    """The points that were removed by simplifying the layers of a geometry
+
+    Args:
+        tolerance (float): the maximum distance between a removed point and the simplified edge
+        num_points_before (int): the number of points of all layers before the simplification
+        num_points_after (int): the number of points of all layers after the simplification
+        removed_points (Dict[str, List[Point]]): the removed points by the id of the layer
+    """
+
+    tolerance: float
+    num_points_before: int = 0
+    num_points_after: int = 0
+    removed_points: Dict[str, List[Point]] = {}
+
+    @property
+    def num_points_removed(self) -> int:
+        return self.num_points_before - self.num_points_after
+
+
+def signed_area(points: np.ndarray) -> float:
+    """Get the signed area of a ring (positive for counterclockwise rings)
+
+    Args:
+        points (np.ndarray): The (n,2) array of the ring without the closing point
+
+    Returns:
+        float: The signed area
+    """
+    if len(points) < 3:
+        return 0.0
+    x, z = points[:, 0], points[:, 1]
+    return 0.5 * float(
+        np.dot(x[:-1], z[1:]) - np.dot(x[1:], z[:-1]) + x[-1] * z[0] - x[0] * z[-1]
+    )
+
+
+def _node_ids(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # number the rounded points, returns the nodes sorted on x and then z and the node
+    # id of each point
+    points = np.round(points, TOPOLOGY_DECIMALS)
+    # integer keys on the grid of the rounded points are sorted on x and then z
+    grid = np.rint(points * 10**TOPOLOGY_DECIMALS).astype(np.int64)
+    grid -= grid.min(axis=0)
+    keys = grid[:, 0] * (grid[:, 1].max() + 1) + grid[:, 1]
+    _, index, ids = np.unique(keys, return_index=True, return_inverse=True)
+    return points[index], ids.ravel()
+
+
+def _layer_edges(layers: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # number the (rounded) points of all layers and get the clockwise edges as pairs
+    # of node ids, returns the nodes sorted on x and the start and end of the edges
+    layers = [np.asarray(layer, dtype=float).reshape(-1, 2) for layer in layers]
+    layers = [layer for layer in layers if len(layer) > 0]
+    if len(layers) == 0:
+        return np.zeros((0, 2)), np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    sizes = np.array([len(layer) for layer in layers])
+    ring = np.repeat(np.arange(len(layers)), sizes)
+    nodes, ids = _node_ids(np.vstack(layers))
+
+    # remove the closing points and duplicate consecutive points
+    offsets = np.cumsum(sizes) - sizes
+    previous = np.arange(len(ids)) - 1
+    previous[offsets] = offsets + sizes - 1
+    keep = ids != ids[previous]
+    ids, ring = ids[keep], ring[keep]
+    sizes = np.bincount(ring, minlength=len(layers))
+    offsets = np.cumsum(sizes) - sizes
+    following = np.arange(len(ids)) + 1
+    used = sizes > 0
+    following[(offsets + sizes - 1)[used]] = offsets[used]
+
+    # turn the counterclockwise layers around so all layers are clockwise
+    p, q = nodes[ids], nodes[ids[following]]
+    areas = 0.5 * np.bincount(
+        ring, weights=p[:, 0] * q[:, 1] - q[:, 0] * p[:, 1], minlength=len(layers)
+    )
+    ccw = areas[ring] > 0
+    starts = np.where(ccw, ids[following], ids)
+    ends = np.where(ccw, ids, ids[following])
+
+    valid = (sizes >= 3)[ring]
+    return nodes, starts[valid], ends[valid]
+
+
+def _nodes_on_edges(
+    starts: np.ndarray, ends: np.ndarray, nodes: np.ndarray
+) -> Dict[int, List[int]]:
+    # the indices of the nodes (sorted on x) that lie strictly between the start and
+    # end of an edge sorted from start to end for the edges that contain any nodes,
+    # only the nodes within the x range of an edge are checked
+    tolerance = 0.5 * 10**-TOPOLOGY_DECIMALS
+    lo = np.searchsorted(
+        nodes[:, 0], np.minimum(starts[:, 0], ends[:, 0]) - tolerance, side="left"
+    )
+    hi = np.searchsorted(
+        nodes[:, 0], np.maximum(starts[:, 0], ends[:, 0]) + tolerance, side="right"
+    )
+    counts = hi - lo
+    edge = np.repeat(np.arange(len(starts)), counts)
+    node = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    node += np.repeat(lo, counts)
+
+    d = ends[edge] - starts[edge]
+    v = nodes[node] - starts[edge]
+    length2 = np.einsum("ij,ij->i", d, d)
+    t = np.einsum("ij,ij->i", v, d) / length2
+    distance = np.abs(v[:, 0] * d[:, 1] - v[:, 1] * d[:, 0]) / np.sqrt(length2)
+    inside = (t > 0.0) & (t < 1.0) & (distance <= tolerance)
+    inside &= np.any(nodes[node] != starts[edge], axis=1)
+    inside &= np.any(nodes[node] != ends[edge], axis=1)
+
+    result = {}
+    order = np.lexsort((t[inside], edge[inside]))
+    for i, j in zip(edge[inside][order].tolist(), node[inside][order].tolist()):
+        result.setdefault(i, []).append(j)
+    return result
+
+
+def _orientation(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    # positive if c is left of the line from a to b, negative if right and 0 if on it
+    return (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+        c[:, 0] - a[:, 0]
+    )
+
+
+def _crossing_edges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # the indices of the edges that properly cross another edge, edges that only touch
+    # (on an end point or because they are collinear) do not cross
+    lines = shapely.linestrings(np.stack([starts, ends], axis=1))
+    i, j = shapely.STRtree(lines).query(lines)
+    i, j = i[i < j], j[i < j]
+    a, b, c, d = starts[i], ends[i], starts[j], ends[j]
+    crosses = (_orientation(a, b, c) * _orientation(a, b, d) < 0) & (
+        _orientation(c, d, a) * _orientation(c, d, b) < 0
+    )
+    return np.unique(np.hstack([i[crosses], j[crosses]]))
+
+
+def _turn(incoming: np.ndarray, outgoing: np.ndarray) -> float:
+    return float(
+        np.arctan2(
+            incoming[0] * outgoing[1] - incoming[1] * outgoing[0],
+            incoming[0] * outgoing[0] + incoming[1] * outgoing[1],
+        )
+    )
+
+
+def _chain_rings(
+    starts: np.ndarray, ends: np.ndarray, nodes: np.ndarray
+) -> Tuple[List[np.ndarray], List[int]]:
+    # chain the directed edges into closed rings, returns the rings and the nodes
+    # where a ring could not be closed
+    rings, dangling_nodes = [], []
+
+    # mostly every node has one outgoing edge so simply follow the successors
+    if len(np.unique(starts)) == len(starts):
+        successor = np.full(len(nodes), -1)
+        successor[starts] = ends
+        successor = successor.tolist()
+        remaining = set(starts.tolist())
+        while len(remaining) > 0:
+            start = remaining.pop()
+            ring = [start]
+            current = successor[start]
+            while current != start:
+                if not current in remaining:
+                    dangling_nodes.append(current)
+                    ring = None
+                    break
+                remaining.remove(current)
+                ring.append(current)
+                current = successor[current]
+            if ring is not None and len(ring) >= 3:
+                rings.append(nodes[ring])
+        return rings, dangling_nodes
+
+    # on a node with more than one outgoing edge follow the leftmost turn so the
+    # rings do not cross
+    outgoing: Dict[int, List[int]] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        outgoing.setdefault(start, []).append(end)
+
+    while len(outgoing) > 0:
+        start = next(iter(outgoing))
+        ring = [start]
+        current = start
+        while True:
+            candidates = outgoing.get(current, [])
+            if len(candidates) == 0:
+                dangling_nodes.append(current)
+                ring = None
+                break
+            if len(candidates) == 1 or len(ring) == 1:
+                i = 0
+            else:
+                incoming = nodes[current] - nodes[ring[-2]]
+                i = int(
+                    np.argmax(
+                        [_turn(incoming, nodes[c] - nodes[current]) for c in candidates]
+                    )
+                )
+            next_node = candidates.pop(i)
+            if len(candidates) == 0:
+                del outgoing[current]
+            if next_node == start:
+                break
+            ring.append(next_node)
+            current = next_node
+        if ring is not None and len(ring) >= 3:
+            rings.append(nodes[ring])
+
+    return rings, dangling_nodes
+
+
+def build_boundary(layers: List[np.ndarray]) -> Tuple[np.ndarray, TopologyReport]:
+    """Get the clockwise boundary of the given layers using the topology of the edges
+
+    Layers in D-Stability share their edges so the boundary consists of the edges that
+    are used by exactly one layer. The (rounded) points are numbered and the edges are
+    counted using the pairs of point numbers as a key so the boundary is found without
+    any polygon operations. Edges of a layer that contain points of another layer are
+    split on these points.
+
+    Args:
+        layers (List[np.ndarray]): The (n,2) arrays with the points of the layers
+
+    Returns:
+        Tuple[np.ndarray, TopologyReport]: The (n,2) array of the boundary without the
+        closing point (empty if no closed boundary could be found) and the report with
+        the topology problems
+    """
+    report = TopologyReport()
+    nodes, starts, ends = _layer_edges(layers)
+    if len(starts) == 0:
+        return np.zeros((0, 2)), report
+
+    # both directions of an edge share the same key
+    def count_edges(starts, ends):
+        keys = np.minimum(starts, ends) * len(nodes) + np.maximum(starts, ends)
+        keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+        return keys, inverse.ravel(), counts
+
+    # edges used once can contain points of other layers, split them on these points
+    keys, inverse, counts = count_edges(starts, ends)
+    once = np.flatnonzero(counts[inverse] == 1)
+    unshared_nodes = []
+    keep = np.ones(len(starts), dtype=bool)
+    split_starts, split_ends = [], []
+    for i, splits in _nodes_on_edges(
+        nodes[starts[once]], nodes[ends[once]], nodes
+    ).items():
+        edge = int(once[i])
+        keep[edge] = False
+        unshared_nodes += splits
+        chain = [int(starts[edge])] + splits + [int(ends[edge])]
+        split_starts += chain[:-1]
+        split_ends += chain[1:]
+    if len(split_starts) > 0:
+        starts = np.hstack([starts[keep], split_starts]).astype(int)
+        ends = np.hstack([ends[keep], split_ends]).astype(int)
+        keys, inverse, counts = count_edges(starts, ends)
+
+    # edges used by more than two layers or twice in the same direction overlap
+    forward = np.bincount(inverse, weights=starts < ends, minlength=len(keys))
+    overlaps = (counts > 2) | ((counts == 2) & (forward != 1))
+    report.overlaps = [
+        (
+            tuple(nodes[key // len(nodes)].tolist()),
+            tuple(nodes[key % len(nodes)].tolist()),
+        )
+        for key in keys[overlaps].tolist()
+    ]
+
+    # the edges used once are the outer edges of the layers, these should only touch
+    # each other on their end points unless layers cross each other
+    once = np.flatnonzero(counts[inverse] == 1)
+    crossing = _crossing_edges(nodes[starts[once]], nodes[ends[once]])
+    report.crossings = [
+        (tuple(nodes[starts[i]].tolist()), tuple(nodes[ends[i]].tolist()))
+        for i in once[crossing].tolist()
+    ]
+
+    closed_rings, dangling_nodes = _chain_rings(starts[once], ends[once], nodes)
+    report.dangling_nodes = [
+        tuple(p) for p in nodes[sorted(set(dangling_nodes))].tolist()
+    ]
+    report.unshared_nodes = [
+        tuple(p) for p in nodes[sorted(set(unshared_nodes))].tolist()
+    ]
+
+    # the clockwise rings are outer boundaries, the counterclockwise rings are gaps
+    areas = [signed_area(ring) for ring in closed_rings]
+    outer = [i for i, area in enumerate(areas) if area < 0]
+    report.gaps = [
+        [(float(x), float(z)) for x, z in closed_rings[i]]
+        for i, area in enumerate(areas)
+        if area > 0
+    ]
+
+    if len(outer) == 0:
+        return np.zeros((0, 2)), report
+
+    return closed_rings[min(outer, key=lambda i: areas[i])], report
+
+
+def insert_nodes(layers: List[np.ndarray], nodes: np.ndarray) -> Dict[int, np.ndarray]:
+    """Add the nodes that lie on an edge of a layer to the points of that layer
+
+    Layers in D-Stability share their points so if a layer gets a new point on an edge
+    it shares with another layer that layer needs the point too. Nodes within the
+    tolerance of an existing point of the edge are not added.
+
+    Args:
+        layers (List[np.ndarray]): The (n,2) arrays with the points of the layers without the closing point
+        nodes (np.ndarray): The (m,2) array of the nodes
+
+    Returns:
+        Dict[int, np.ndarray]: The new points of the layers that changed by the index of the layer
+    """
+    tolerance = 0.5 * 10**-TOPOLOGY_DECIMALS
+    layers = [np.asarray(layer, dtype=float).reshape(-1, 2) for layer in layers]
+    # sorted on x as required by _nodes_on_edges
+    nodes = np.unique(np.asarray(nodes, dtype=float).reshape(-1, 2), axis=0)
+    sizes = np.array([len(layer) for layer in layers], dtype=int)
+    if len(nodes) == 0 or sizes.sum() == 0:
+        return {}
+
+    points = np.vstack(layers)
+    offsets = np.cumsum(sizes) - sizes
+    following = np.arange(len(points)) + 1
+    used = sizes > 0
+    following[(offsets + sizes - 1)[used]] = offsets[used]
+    starts, ends = points, points[following]
+
+    inserts = {}
+    for edge, splits in _nodes_on_edges(starts, ends, nodes).items():
+        splits = [
+            j
+            for j in splits
+            if np.hypot(*(nodes[j] - starts[edge])) > tolerance
+            and np.hypot(*(nodes[j] - ends[edge])) > tolerance
+        ]
+        if len(splits) > 0:
+            inserts[edge] = splits
+
+    layer_index = np.repeat(np.arange(len(layers)), sizes)
+    result = {}
+    for i in sorted(set(layer_index[list(inserts.keys())].tolist())):
+        new_points = []
+        for edge in range(offsets[i], offsets[i] + sizes[i]):
+            new_points.append(points[edge])
+            new_points += [nodes[j] for j in inserts.get(edge, [])]
+        result[i] = np.array(new_points)
+    return result
+
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    # mask of the points of a line that are kept by the Douglas-Peucker algorithm, the
+    # distance is measured to the segment so spikes beyond its end points are kept
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while len(stack) > 0:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, d = points[first], points[last] - points[first]
+        v = points[first + 1 : last] - a
+        length2 = float(np.dot(d, d))
+        t = np.zeros(len(v)) if length2 == 0.0 else np.clip(v @ d / length2, 0, 1)
+        distances = np.hypot(*(v - t[:, None] * d).T)
+        k = int(np.argmax(distances))
+        if distances[k] > tolerance:
+            k += first + 1
+            keep[k] = True
+            stack += [(first, k), (k, last)]
+    return keep
+
+
+def _arcs(edges: np.ndarray, fixed: np.ndarray, nodes: np.ndarray) -> List[List[int]]:
+    # split the (undirected) edges in arcs of node ids that run from a fixed node to a
+    # fixed node, rings without a fixed node get two fixed nodes (the first and the
+    # farthest node) which are marked in fixed
+    adjacency = [[] for _ in range(len(nodes))]
+    for p, q in edges.tolist():
+        adjacency[p].append(q)
+        adjacency[q].append(p)
+
+    visited, arcs = set(), []
+
+    def trace(start: int, second: int):
+        arc = [start, second]
+        while not fixed[arc[-1]]:
+            p, q = adjacency[arc[-1]]
+            arc.append(q if p == arc[-2] else p)
+        visited.update((min(p, q), max(p, q)) for p, q in zip(arc[:-1], arc[1:]))
+        arcs.append(arc)
+
+    for start in np.flatnonzero(fixed).tolist():
+        for second in adjacency[start]:
+            if (min(start, second), max(start, second)) not in visited:
+                trace(start, second)
+
+    for p, q in edges.tolist():
+        if (p, q) in visited:
+            continue
+        ring = [p, q]
+        while ring[-1] != p:
+            a, b = adjacency[ring[-1]]
+            ring.append(b if a == ring[-2] else a)
+        distances = np.hypot(*(nodes[ring] - nodes[p]).T)
+        fixed[ring[int(np.argmax(distances))]] = fixed[p] = True
+        for second in adjacency[p]:
+            if (min(p, second), max(p, second)) not in visited:
+                trace(p, second)
+    return arcs
+
+
+def _invalid_arcs(nodes: np.ndarray, arcs: List[np.ndarray]) -> np.ndarray:
+    # the indices of the arcs that cross, touch or overlap another arc anywhere else
+    # than on their shared end points and of the arcs that are not simple
+    lines = shapely.linestrings(
+        nodes[np.concatenate(arcs)],
+        indices=np.repeat(np.arange(len(arcs)), [len(arc) for arc in arcs]),
+    )
+    invalid = set(np.flatnonzero(~shapely.is_simple(lines)).tolist())
+    i, j = shapely.STRtree(lines).query(lines, predicate="intersects")
+    i, j = i[i < j], j[i < j]
+    for a, b, shared in zip(
+        i.tolist(), j.tolist(), shapely.intersection(lines[i], lines[j])
+    ):
+        allowed = {arcs[a][0], arcs[a][-1]} & {arcs[b][0], arcs[b][-1]}
+        if shapely.get_type_id(shared) in (
+            shapely.GeometryType.POINT,
+            shapely.GeometryType.MULTIPOINT,
+        ) and all(
+            np.any(np.all(np.abs(nodes[list(allowed)] - point) < 1e-9, axis=1))
+            for point in shapely.get_coordinates(shared)
+        ):
+            continue
+        invalid.update((a, b))
+    return np.array(sorted(invalid), dtype=int)
+
+
+def _polygons(points: np.ndarray, ring: np.ndarray, selected: np.ndarray) -> np.ndarray:
+    # the polygons of the selected rings from the points and the ring of each point
+    selected = selected[ring]
+    _, indices = np.unique(ring[selected], return_inverse=True)
+    return shapely.polygons(shapely.linearrings(points[selected], indices=indices))
+
+
+def simplify_layers(
+    layers: List[np.ndarray],
+    tolerance: float,
+    fixed_points: Optional[np.ndarray] = None,
+) -> Dict[int, np.ndarray]:
+    """Find the points of the layers that can be removed without moving the edges of
+    the layers more than the tolerance
+
+    The edges of the layers are split in arcs that run between the nodes where three
+    or more layers meet, the fixed points and the nodes that lie on an edge of another
+    layer. Each arc is simplified once with the Douglas-Peucker algorithm so layers that
+    share an edge keep sharing exactly the same points. The simplification of an arc is
+    undone if it crosses another arc or makes a valid layer invalid.
+
+    Args:
+        layers (List[np.ndarray]): The (n,2) arrays with the points of the layers without the closing point
+        tolerance (float): The maximum distance between a removed point and the simplified edge
+        fixed_points (np.ndarray, optional): The (m,2) array of the points that may not be removed. Defaults to None.
+
+    Returns:
+        Dict[int, np.ndarray]: The masks of the points that are kept by the index of the layers that change
+    """
+    layers = [np.asarray(layer, dtype=float).reshape(-1, 2) for layer in layers]
+    sizes = np.array([len(layer) for layer in layers], dtype=int)
+    if sizes.sum() == 0:
+        return {}
+
+    points = np.vstack(layers)
+    nodes, ids = _node_ids(points)
+    offsets = np.cumsum(sizes) - sizes
+    following = np.arange(len(points)) + 1
+    used = sizes > 0
+    following[(offsets + sizes - 1)[used]] = offsets[used]
+
+    # the nodes where the edges of more than two layers meet or end are fixed
+    edges = np.sort(np.stack([ids, ids[following]], axis=1), axis=1)
+    edges = np.unique(edges[edges[:, 0] != edges[:, 1]], axis=0)
+    fixed = np.bincount(edges.ravel(), minlength=len(nodes)) != 2
+    # and the nodes on an edge of a layer that does not have this node
+    for splits in _nodes_on_edges(nodes[ids], nodes[ids[following]], nodes).values():
+        fixed[splits] = True
+    if fixed_points is not None and len(fixed_points) > 0:
+        index = {p: i for i, p in enumerate(map(tuple, nodes.tolist()))}
+        for p in np.round(np.reshape(fixed_points, (-1, 2)), TOPOLOGY_DECIMALS):
+            if tuple(p.tolist()) in index:
+                fixed[index[tuple(p.tolist())]] = True
+
+    arcs = [np.array(arc) for arc in _arcs(edges, fixed, nodes)]
+    simplified = [arc[_douglas_peucker(nodes[arc], tolerance)] for arc in arcs]
+    changed = np.array([len(a) < len(b) for a, b in zip(simplified, arcs)], dtype=bool)
+    arc_of_node = np.full(len(nodes), -1)
+    for i, arc in enumerate(arcs):
+        arc_of_node[arc[1:-1]] = i
+
+    ring = np.repeat(np.arange(len(layers)), sizes)
+    was_valid = np.zeros(len(layers), dtype=bool)
+    was_valid[sizes >= 3] = shapely.is_valid(_polygons(points, ring, sizes >= 3))
+
+    while True:
+        removed = np.zeros(len(nodes), dtype=bool)
+        for i in np.flatnonzero(changed).tolist():
+            removed[np.setdiff1d(arcs[i], simplified[i])] = True
+
+        # keep the remaining points without consecutive duplicates
+        keep = ~removed[ids]
+        for i in np.flatnonzero(used).tolist():
+            kept = offsets[i] + np.flatnonzero(keep[offsets[i] : offsets[i] + sizes[i]])
+            if len(kept) > 1:
+                keep[kept[ids[kept] == ids[np.roll(kept, 1)]]] = False
+
+        # undo the changes of the arcs that cross another arc or of the layers that
+        # became invalid
+        undo = set(
+            _invalid_arcs(
+                nodes,
+                [simplified[i] if changed[i] else arcs[i] for i in range(len(arcs))],
+            ).tolist()
+        )
+        counts = np.bincount(ring[keep], minlength=len(layers))
+        polygons = _polygons(points[keep], ring[keep], counts >= 3)
+        is_valid = np.zeros(len(layers), dtype=bool)
+        is_valid[counts >= 3] = shapely.is_valid(polygons) & (
+            shapely.area(polygons) > 0
+        )
+        for i in np.flatnonzero(was_valid & ~is_valid).tolist():
+            layer_arcs = arc_of_node[ids[offsets[i] : offsets[i] + sizes[i]]]
+            undo.update(layer_arcs[layer_arcs >= 0].tolist())
+        undo = [i for i in undo if changed[i]]
+        if len(undo) == 0:
+            break
+        changed[undo] = False
+
+    # layers with less than three points left are not changed
+    result = {}
+    for i in np.flatnonzero(used).tolist():
+        mask = keep[offsets[i] : offsets[i] + sizes[i]]
+        if not np.all(mask) and mask.sum() >= 3:
+            result[i] = mask
+    return result
@@ -0,0 +1,68 @@
+from leveelogic.deltares.algorithms.algorithm import AlgorithmInputCheckError
+from leveelogic.deltares.algorithms.algorithm_tree import AlgorithmTree
+from leveelogic.deltares.algorithms.algorithm_excavation import AlgorithmExcavation
+from leveelogic.deltares.algorithms.algorithm_fc_phreatic_line_wsbd import (
+    AlgorithmFCPhreaticLineWSBD,
+)
+from leveelogic.deltares.dstability import DStability
+
+
+class TestAlgorithm:
+    def test_map(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        parameters = dict(
+            x=20.0,
+            tree_height=10.0,
+            width_of_root_zone=6.0,
+            load=10.0,
+            wind_force=15.0,
+            angle_of_distribution=30,
+        )
+        # the tree does not fit on the last model
+        models = [ds, ds.fork(), DStability()]
+        results = sorted(
+            AlgorithmTree.map(models, max_workers=2, **parameters),
+            key=lambda r: r.index,
+        )
+        assert [r.index for r in results] == [0, 1, 2]
+
+        expected = AlgorithmTree(ds=ds, **parameters).execute()
+        for result in results[:2]:
+            assert result.is_valid
+            assert (
+                result.model.model.datastructure.json()
+                == expected.model.datastructure.json()
+            )
+        assert results[2].model is None
+        assert isinstance(results[2].error, AlgorithmInputCheckError)
+
+    def test_map_multiple_results(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        results = list(
+            AlgorithmFCPhreaticLineWSBD.map(
+                [ds],
+                max_workers=1,
+                multiple_results=True,
+                min_level=2.0,
+                max_level=5.0,
+                step=0.5,
+            )
+        )
+        assert len(results) == 1
+        assert len(results[0].models) == 7
+
+    def test_input_unchanged_multiple_stages(self):
+        # the algorithms change the current stage of their own copy of the model, not
+        # the last stage of the input model
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        expected = ds.model.datastructure.json()
+        num_trees = len(ds.model._get_loads(0, 0).Trees)
+        num_excavations = len(ds.model._get_excavations(0, 0))
+
+        result = AlgorithmTree(ds=ds, x=100.0).execute()
+        assert ds.model.datastructure.json() == expected
+        assert len(result.model._get_loads(0, 0).Trees) == num_trees + 1
+
+        result = AlgorithmExcavation(ds=ds, x=100.0).execute()
+        assert ds.model.datastructure.json() == expected
+        assert len(result.model._get_excavations(0, 0)) == num_excavations + 1
@@ -0,0 +1,65 @@
+from leveelogic.deltares.algorithms.algorithm_cache import AlgorithmCache
+from leveelogic.deltares.algorithms.algorithm_tree import AlgorithmTree
+from leveelogic.deltares.dstability import DStability
+
+
+def _tree(ds, x):
+    return AlgorithmTree(
+        ds=ds, x=x, tree_height=10.0, width_of_root_zone=6.0, load=10.0
+    )
+
+
+class TestAlgorithmCache:
+    def test_memory(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        cache = AlgorithmCache(max_items=1)
+        expected = _tree(ds, 20.0).execute()
+
+        result1 = _tree(ds, 20.0).execute(cache=cache)
+        result2 = _tree(ds, 20.0).execute(cache=cache)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert result1 is not result2
+        assert result2.model.datastructure.json() == expected.model.datastructure.json()
+
+        # other parameters or another input model give another key
+        assert cache.key(_tree(ds, 20.0)) != cache.key(_tree(ds, 22.0))
+        assert cache.key(_tree(ds, 20.0)) != cache.key(_tree(result1, 20.0))
+
+        # only the last result is kept
+        _tree(ds, 22.0).execute(cache=cache)
+        _tree(ds, 20.0).execute(cache=cache)
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_key_per_stage(self):
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        fork1, fork2 = ds.fork(), ds.fork()
+        fork1.set_scenario_and_stage(1, 0)
+        fork2.set_scenario_and_stage(1, 1)
+        cache = AlgorithmCache()
+        assert cache.key(_tree(fork1, 100.0)) != cache.key(_tree(fork2, 100.0))
+        # the same stage gives the same key
+        fork2.set_scenario_and_stage(1, 0)
+        assert cache.key(_tree(fork1, 100.0)) == cache.key(_tree(fork2, 100.0))
+
+    def test_disk(self, tmp_path):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        cache = AlgorithmCache(folder=tmp_path)
+        expected = _tree(ds, 20.0).execute(cache=cache)
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+        # a new cache (like in a new session) reads the result from disk
+        cache = AlgorithmCache(folder=tmp_path)
+        result = _tree(ds, 20.0).execute(cache=cache)
+        assert cache.hits == 1
+        assert result.model.datastructure.json() == expected.model.datastructure.json()
+
+        # the least recently used file is removed if the folder gets too big
+        cache.max_disk_size = int(cache.disk_size * 1.5)
+        _tree(ds, 22.0).execute(cache=cache)
+        assert len(list(tmp_path.glob("*.pkl"))) == 1
+        assert cache.get(cache.key(_tree(ds, 22.0))) is not None
+        cache.clear()
+        assert cache.get(cache.key(_tree(ds, 20.0))) is None
+
+        cache.clear(disk=True)
+        assert cache.disk_size == 0
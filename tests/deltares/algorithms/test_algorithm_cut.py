@@ -11,6 +11,41 @@ class TestAlgorithmCut:
 
     def test_complex_geometry(self):
         ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        content_hash = ds.content_hash()
         alg = AlgorithmCut(ds=ds, points=[(-100, 3), (40, -1.5), (130.496, -1.5)])
-        ds = alg.execute()
-        ds.serialize("tests/testdata/output/fc_alg_pl_wsbd_cut.stix")
+        ds_cut = alg.execute()
+        ds_cut.serialize("tests/testdata/output/fc_alg_pl_wsbd_cut.stix")
+
+        assert ds_cut.geometry.topology.is_valid
+        assert ds_cut.top < ds.top
+        # the rest of the model is kept and the original model is not changed
+        assert ds_cut.model.datastructure.waternets == ds.model.datastructure.waternets
+        assert (
+            ds_cut.model.datastructure.calculationsettings
+            == ds.model.datastructure.calculationsettings
+        )
+        assert ds.content_hash() == content_hash
+
+    def test_split_layers(self):
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        # a narrow and deep cut splits the layers above the bottom sand layer
+        alg = AlgorithmCut(
+            ds=ds,
+            points=[
+                (ds.left, 6.5),
+                (100, 6.5),
+                (102, -8),
+                (108, -8),
+                (110, 6.5),
+                (ds.right, 6.5),
+            ],
+        )
+        ds_cut = alg.execute()
+        assert len(ds.soillayers) == 6
+        assert len(ds_cut.soillayers) == 10
+        assert ds_cut.geometry.topology.is_valid
+
+        # the new layers get the consolidation degrees of the layers they came from
+        layer_ids = {sl["layer_id"] for sl in ds_cut.soillayers}
+        earthquake = ds_cut.model.datastructure.loads[0].Earthquake
+        assert {c.LayerId for c in earthquake.Consolidations} == layer_ids
@@ -1,3 +1,4 @@
+from typing import Iterator
 from leveelogic.deltares.algorithms.algorithm_fc_phreatic_line_wsbd import (
     AlgorithmFCPhreaticLineWSBD,
 )
@@ -14,3 +15,16 @@ class TestAlgorithmFCPhreaticLineWSBD:
             ds.serialize(f"tests/testdata/output/fc_phreatic_line_wsbd_{i}.stix")
 
         assert len(result) == 7
+
+    def test_iter_results(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        alg = AlgorithmFCPhreaticLineWSBD(ds=ds, min_level=2.0, max_level=5.0, step=0.5)
+        results = alg.iter_results()
+        assert isinstance(results, Iterator)
+        first = next(results)
+        assert len(list(results)) == 6
+
+        expected = alg.execute_multiple_results()
+        assert (
+            first.model.datastructure.json() == expected[0].model.datastructure.json()
+        )
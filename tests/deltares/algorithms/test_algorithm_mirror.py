@@ -0,0 +1,30 @@
+from leveelogic.deltares.algorithms.algorithm_mirror import AlgorithmMirror
+from leveelogic.deltares.dstability import DStability
+
+
+class TestAlgorithmMirror:
+    def test_execute(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        ds_mirrored = AlgorithmMirror(ds=ds, x=0.0).execute()
+        assert ds_mirrored.left == -ds.right
+        assert ds_mirrored.right == -ds.left
+
+        # the phreatic line still goes from left to right
+        pl = ds.phreatic_line_points
+        pl_mirrored = ds_mirrored.phreatic_line_points
+        assert pl_mirrored == [(-p[0] + 0.0, p[1]) for p in reversed(pl)]
+
+        # the left side of the search area is the mirrored right side
+        sa = ds.model.datastructure.calculationsettings[
+            0
+        ].UpliftVanParticleSwarm.SearchAreaA
+        sa_mirrored = ds_mirrored.model.datastructure.calculationsettings[
+            0
+        ].UpliftVanParticleSwarm.SearchAreaA
+        assert sa_mirrored.TopLeft.X == -(sa.TopLeft.X + sa.Width)
+        assert sa_mirrored.Width == sa.Width
+
+    def test_execute_twice(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        ds_mirrored = AlgorithmMirror(ds=AlgorithmMirror(ds=ds).execute()).execute()
+        assert ds_mirrored.input_hash(decimals=6) == ds.input_hash(decimals=6)
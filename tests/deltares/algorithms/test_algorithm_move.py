@@ -13,3 +13,18 @@ class TestAlgorithmMove:
         xs_moved = [p[0] for p in ds.points]
         assert xs_moved == [p + dx for p in xs]
         ds.serialize("tests/testdata/output/moved.stix")
+
+    def test_execute_waternet_creator_settings(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        wcs = ds.model.datastructure.waternetcreatorsettings[0]
+        ds_moved = AlgorithmMove(ds=ds, dx=3.0, dz=-1.0).execute()
+        wcs_moved = ds_moved.model.datastructure.waternetcreatorsettings[0]
+        assert wcs_moved.EmbankmentCharacteristics.EmbankmentToeLandSide == (
+            wcs.EmbankmentCharacteristics.EmbankmentToeLandSide + 3.0
+        )
+        assert wcs_moved.DitchCharacteristics.DitchLandSide == (
+            wcs.DitchCharacteristics.DitchLandSide + 3.0
+        )
+        assert ds_moved.top == ds.top - 1.0
+        # the original model is unchanged
+        assert wcs.EmbankmentCharacteristics.EmbankmentToeLandSide == 40.0
@@ -0,0 +1,43 @@
+import pytest
+
+from leveelogic.deltares.algorithms.algorithm import AlgorithmExecutionError
+from leveelogic.deltares.algorithms.algorithm_phreatic_line import AlgorithmPhreaticLine
+from leveelogic.deltares.algorithms.algorithm_phreatic_lines import (
+    AlgorithmPhreaticLines,
+)
+from leveelogic.deltares.dstability import DStability
+
+
+class TestAlgorithmPhreaticLines:
+    def test_execute_multiple_results(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        waterlevels = [2.0, 3.0, 4.0]
+        alg = AlgorithmPhreaticLines(
+            ds=ds,
+            x_ref=10.0,
+            waterlevels=waterlevels,
+            waterlevels_polder=-1.0,
+            offset_points=[(2.0, -1.0), (3.0, -1.5)],
+        )
+        xs, zs = alg.lines()
+        assert zs.shape == (3, len(xs))
+
+        models = alg.execute_multiple_results()
+        assert len(models) == 3
+        for waterlevel, model in zip(waterlevels, models):
+            ds_single = AlgorithmPhreaticLine(
+                ds=ds,
+                x_ref=10.0,
+                waterlevel=waterlevel,
+                waterlevel_polder=-1.0,
+                offset_points=[(2.0, -1.0), (3.0, -1.5)],
+            ).execute()
+            assert model.phreatic_line_points == ds_single.phreatic_line_points
+
+    def test_invalid_polder_levels(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        alg = AlgorithmPhreaticLines(
+            ds=ds, x_ref=10.0, waterlevels=[2.0, 3.0], waterlevels_polder=[-1.0]
+        )
+        with pytest.raises(AlgorithmExecutionError):
+            alg.execute_multiple_results()
@@ -0,0 +1,43 @@
+import pytest
+import numpy as np
+
+from leveelogic.deltares.algorithms.algorithm import AlgorithmInputCheckError
+from leveelogic.deltares.algorithms.algorithm_simplify import AlgorithmSimplify
+from leveelogic.deltares.dstability import DStability
+
+
+class TestAlgorithmSimplify:
+    def test_execute(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_pl_sample.stix")
+        alg = AlgorithmSimplify(ds=ds, tolerance=0.1)
+        report = alg.report()
+        ds_simplified = alg.execute()
+        assert report.num_points_before == len(ds.geometry.points)
+        assert report.num_points_after == len(ds_simplified.geometry.points)
+        assert report.num_points_removed == sum(
+            len(points) for points in report.removed_points.values()
+        )
+        assert report.num_points_after < report.num_points_before
+        assert len(ds_simplified.soillayers) == len(ds.soillayers)
+        assert ds_simplified.geometry.topology.is_valid
+
+        # the surface level at the characteristic points does not change
+        assert np.allclose(
+            ds_simplified.characteristic_point_table().zs,
+            ds.characteristic_point_table().zs,
+            equal_nan=True,
+        )
+
+        # the original model is not changed
+        assert len(ds.geometry.points) == report.num_points_before
+
+    def test_execute_keeps_straight_layers(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        report = AlgorithmSimplify(ds=ds, tolerance=0.1).report()
+        assert report.num_points_removed == 0
+        assert report.removed_points == {}
+
+    def test_invalid_tolerance(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        with pytest.raises(AlgorithmInputCheckError):
+            AlgorithmSimplify(ds=ds, tolerance=0.0).execute()
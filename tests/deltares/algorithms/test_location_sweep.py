@@ -0,0 +1,45 @@
+import pytest
+
+from leveelogic.deltares.algorithms.algorithm_tree import AlgorithmTree
+from leveelogic.deltares.algorithms.location_sweep import LocationSweep
+from leveelogic.deltares.dseries_calculator import DStabilityCalculationResult
+from leveelogic.deltares.dstability import DStability
+
+
+def _fake_calculate(models, names):
+    # a safety factor with a minimum for a tree at x=23.3
+    results = []
+    for ds in models:
+        x = ds.model.datastructure.loads[0].Trees[-1].Location.X
+        results.append(
+            DStabilityCalculationResult(safety_factor=1.0 + (x - 23.3) ** 2 / 100.0)
+        )
+    return results
+
+
+class TestLocationSweep:
+    def test_execute(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        sweep = LocationSweep(
+            algorithm=AlgorithmTree,
+            parameters={"tree_height": 10.0, "width_of_root_zone": 6.0},
+            x_start=0.0,
+            x_end=55.0,
+            num_positions=12,
+        )
+        result = sweep.execute(ds, calculate=_fake_calculate)
+
+        # the root zone does not fit on the first and last position
+        assert len(result.points) == 16
+        assert result.points[0].error != ""
+        assert result.points[-1].error != ""
+        assert len(result.xs) == 14
+        assert result.xs == sorted(result.xs)
+
+        # the coarse minimum is at x=25, the refinement between x=20 and x=30
+        assert result.critical_x == pytest.approx(24.0)
+        assert result.critical_safety_factor == pytest.approx(1.0049)
+
+        sweep.refine_iterations = 2
+        result = sweep.execute(ds, calculate=_fake_calculate)
+        assert result.critical_x == pytest.approx(23.2)
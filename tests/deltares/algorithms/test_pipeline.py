@@ -0,0 +1,71 @@
+import pytest
+
+from leveelogic.deltares.algorithms.algorithm import AlgorithmInputCheckError
+from leveelogic.deltares.algorithms.algorithm_fill import AlgorithmFill
+from leveelogic.deltares.algorithms.algorithm_berm_wsbd import AlgorithmBermWSBD
+from leveelogic.deltares.algorithms.algorithm_tree import AlgorithmTree
+from leveelogic.deltares.algorithms.algorithm_phreatic_line import (
+    AlgorithmPhreaticLine,
+)
+from leveelogic.deltares.algorithms.pipeline import Pipeline
+from leveelogic.deltares.dstability import DStability
+
+STEPS = [
+    (
+        AlgorithmFill,
+        {"points": [(-90.0, 2.0), (-60.0, 2.0)], "soilcode": "K3_d_CPhi"},
+    ),
+    (
+        AlgorithmBermWSBD,
+        {
+            "soilcode": "Dijksmateriaal (klei)_K3_CPhi",
+            "slope_top": 10,
+            "slope_bottom": 1,
+            "height": 2.0,
+            "width": 6.0,
+            "fill_ditch": True,
+            "ditch_soilcode": "Dijksmateriaal (klei)_K3_CPhi",
+        },
+    ),
+    (
+        AlgorithmTree,
+        {
+            "x": 22.0,
+            "tree_height": 10.0,
+            "width_of_root_zone": 6.0,
+            "load": 10.0,
+            "wind_force": 15.0,
+            "angle_of_distribution": 30,
+        },
+    ),
+    (
+        AlgorithmPhreaticLine,
+        {"x_ref": 19.5, "waterlevel": 4.0, "waterlevel_polder": -1.0},
+    ),
+]
+
+
+class TestPipeline:
+    def test_execute(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        original = ds.model.datastructure.json()
+
+        expected = ds
+        for algorithm, parameters in STEPS:
+            expected = algorithm(ds=expected, **parameters).execute()
+
+        result = Pipeline(STEPS).execute(ds)
+        assert result.model.datastructure.json() == expected.model.datastructure.json()
+        assert result.surface == expected.surface
+        assert ds.model.datastructure.json() == original
+
+        # the pipeline can be executed again
+        result = Pipeline(STEPS).execute(ds)
+        assert result.model.datastructure.json() == expected.model.datastructure.json()
+
+    def test_add(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_alg_pl_wsbd.stix")
+        pipeline = Pipeline().add(AlgorithmTree, x=22.0).add(AlgorithmTree, x=500.0)
+        assert len(pipeline.steps) == 2
+        with pytest.raises(AlgorithmInputCheckError):
+            pipeline.execute(ds)
@@ -0,0 +1,50 @@
+import pytest
+
+from leveelogic.deltares.algorithms.algorithm_tree import AlgorithmTree
+from leveelogic.deltares.algorithms.sweep import (
+    Sweep,
+    latin_hypercube,
+    parameter_grid,
+)
+from leveelogic.deltares.dstability import DStability
+
+
+class TestSweep:
+    def test_parameter_grid(self):
+        assert list(parameter_grid(width=[4.0, 6.0], height=[1.0, 2.0])) == [
+            {"width": 4.0, "height": 1.0},
+            {"width": 4.0, "height": 2.0},
+            {"width": 6.0, "height": 1.0},
+            {"width": 6.0, "height": 2.0},
+        ]
+
+    def test_latin_hypercube(self):
+        samples = list(latin_hypercube(10, seed=1, width=(2.0, 6.0), height=(0.0, 1.0)))
+        assert len(samples) == 10
+        # every interval of every parameter is used once
+        widths = sorted(int((s["width"] - 2.0) / 0.4) for s in samples)
+        heights = sorted(int(s["height"] / 0.1) for s in samples)
+        assert widths == list(range(10))
+        assert heights == list(range(10))
+        assert samples == list(
+            latin_hypercube(10, seed=1, width=(2.0, 6.0), height=(0.0, 1.0))
+        )
+
+    def test_execute(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        sweep = Sweep(
+            algorithm=AlgorithmTree,
+            parameters={"tree_height": 10.0, "width_of_root_zone": 6.0},
+        )
+        # x=20.0001 gives the same model after rounding and x=100 is outside the geometry
+        variants = list(
+            sweep.execute(
+                ds, parameter_grid(x=[20.0, 20.0001, 22.0, 100.0], load=[10.0])
+            )
+        )
+        assert [v.id for v in variants] == [0, 1]
+        assert variants[1].parameters == {"x": 22.0, "load": 10.0}
+        assert [e.variant_id for e in sweep.entries] == [0, 0, 1, None]
+        assert sweep.entries[3].error != ""
+        assert len(sweep.entries_for_variant(0)) == 2
+        assert sweep.num_variants == 2
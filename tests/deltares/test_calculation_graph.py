@@ -0,0 +1,130 @@
+import pytest
+import os
+import numpy as np
+from pathlib import Path
+
+from leveelogic.deltares.calculation_graph import (
+    CalculationGraph,
+    CalculationGraphError,
+)
+from leveelogic.deltares.algorithms.algorithm_move import AlgorithmMove
+from leveelogic.deltares.dstability import DStability
+
+
+class TestCalculationGraph:
+    def test_run(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        graph = CalculationGraph()
+        graph.add_model("base", ds)
+        graph.add_algorithm("left", "base", AlgorithmMove, dx=-5.0)
+        graph.add_algorithm("right", "base", AlgorithmMove, dx=5.0)
+        graph.add_node(
+            "width", lambda l, r: r.right - l.left, dependencies=["left", "right"]
+        )
+        results = graph.run()
+
+        assert graph.errors == {}
+        assert results["left"].left == ds.left - 5.0
+        assert results["right"].left == ds.left + 5.0
+        assert results["width"] == pytest.approx(ds.right - ds.left + 10.0)
+
+    def test_rerun_only_changed_nodes(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        calls = []
+
+        def count(ds, label):
+            calls.append(label)
+            return ds.left
+
+        graph = CalculationGraph()
+        graph.add_model("base", ds)
+        graph.add_algorithm("moved", "base", AlgorithmMove, dx=1.0)
+        graph.add_node("a", count, ["base"], {"label": "a"})
+        graph.add_node("b", count, ["moved"], {"label": "b"})
+        graph.run()
+        assert sorted(calls) == ["a", "b"]
+
+        graph.run()
+        assert sorted(calls) == ["a", "b"]
+
+        graph.update_node("moved", dx=2.0)
+        graph.run()
+        assert sorted(calls) == ["a", "b", "b"]
+        assert graph.result("b") == ds.left + 2.0
+
+    def test_rerun_changed_function_parameters(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        calls = []
+
+        def apply(ds, f):
+            calls.append(1)
+            return f(ds)
+
+        graph = CalculationGraph()
+        graph.add_model("base", ds)
+        graph.add_node("apply", apply, ["base"], {"f": lambda ds: ds.left})
+        graph.run()
+        graph.run()
+        assert len(calls) == 1
+
+        # a lambda with another body has the same name but is recalculated
+        graph.update_node("apply", f=lambda ds: ds.right)
+        graph.run()
+        assert len(calls) == 2
+        assert graph.result("apply") == ds.right
+
+        # and so is a closure with another value
+        def offset(dx):
+            return lambda ds: ds.right + dx
+
+        graph.update_node("apply", f=offset(1.0))
+        graph.run()
+        graph.update_node("apply", f=offset(2.0))
+        graph.run()
+        assert len(calls) == 4
+        assert graph.result("apply") == ds.right + 2.0
+
+    def test_rerun_changed_array_parameters(self):
+        values = np.arange(2000.0)
+        changed = values.copy()
+        changed[1000] = -1.0
+
+        graph = CalculationGraph()
+        graph.add_node(
+            "sum", lambda values: values.sum(), parameters={"values": values}
+        )
+        graph.run()
+        graph.update_node("sum", values=changed)
+        graph.run()
+        assert graph.result("sum") == values.sum() - 1001.0
+
+    def test_failing_node_skips_dependents(self):
+        def fail(ds):
+            raise ValueError("failed")
+
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        graph = CalculationGraph()
+        graph.add_model("base", ds)
+        graph.add_node("fail", fail, ["base"])
+        graph.add_algorithm("moved", "fail", AlgorithmMove, dx=1.0)
+        graph.run()
+        assert list(graph.errors.keys()) == ["fail", "moved"]
+
+    def test_cycle_raises(self):
+        graph = CalculationGraph()
+        graph.add_node("a", lambda b: b, ["b"])
+        graph.add_node("b", lambda a: a, ["a"])
+        with pytest.raises(CalculationGraphError):
+            graph.run()
+
+    def test_calculation(self):
+        envfile = Path(os.getcwd()) / "leveelogic.env"
+        if envfile.exists():
+            ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+            graph = CalculationGraph()
+            graph.add_model("base", ds)
+            graph.add_calculation("calculated", "base")
+            graph.run()
+            assert graph.result("calculated").model.output[
+                0
+            ].FactorOfSafety == pytest.approx(0.382, abs=1e-3)
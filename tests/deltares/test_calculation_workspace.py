@@ -0,0 +1,55 @@
+import pytest
+
+from leveelogic.deltares.calculation_workspace import (
+    CalculationWorkspace,
+    RAM_DISK_FOLDER,
+)
+
+
+class TestCalculationWorkspace:
+    def test_new_file(self, tmp_path):
+        ws = CalculationWorkspace(root=tmp_path, worker="worker_1", num_shards=4)
+        filenames = [ws.new_file() for _ in range(20)]
+        assert len(set(filenames)) == 20
+        for f in filenames:
+            assert f.suffix == ".stix"
+            assert f.parent.parent == tmp_path / "worker_1"
+        assert len(list((tmp_path / "worker_1").iterdir())) <= 4
+
+    def test_release(self, tmp_path):
+        ws = CalculationWorkspace(root=tmp_path)
+        filename = ws.new_file()
+        filename.write_text("stix")
+        filename.with_suffix(".err").write_text("error")
+        other = ws.new_file()
+        other.write_text("stix")
+
+        assert len(ws.related_files(filename)) == 2
+        ws.release(filename)
+        assert ws.related_files(filename) == []
+        assert other.exists()
+
+    def test_keep_on_failure(self, tmp_path):
+        ws = CalculationWorkspace(root=tmp_path, keep_on_failure=True)
+        filename = ws.new_file()
+        filename.write_text("stix")
+        ws.release(filename, failed=True)
+        assert filename.exists()
+        ws.release(filename, failed=False)
+        assert not filename.exists()
+
+    def test_no_cleanup(self, tmp_path):
+        ws = CalculationWorkspace(root=tmp_path, cleanup=False)
+        filename = ws.new_file()
+        filename.write_text("stix")
+        ws.release(filename)
+        assert filename.exists()
+        ws.clear()
+        assert not ws.worker_folder.exists()
+
+    def test_in_memory(self):
+        if RAM_DISK_FOLDER.is_dir():
+            ws = CalculationWorkspace.in_memory(worker="test_in_memory")
+            filename = ws.new_file()
+            assert str(filename).startswith(str(RAM_DISK_FOLDER))
+            ws.clear()
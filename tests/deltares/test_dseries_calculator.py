@@ -1,10 +1,16 @@
 import pytest
 import os
+import shutil
+import simplejson as json
 from pathlib import Path
+from time import time
 
 from leveelogic.deltares.dseries_calculator import (
     DSeriesCalculator,
+    CalculationModel,
     CalculationModelType,
+    CalculationTiming,
+    calculate,
 )
 from leveelogic.deltares.dstability import DStability
 from leveelogic.deltares.dgeoflow import DGeoFlow
@@ -51,3 +57,62 @@ class TestDSeriesCalculator:
             assert dsc.calculation_models[1].result.safety_factor == pytest.approx(
                 0.382, abs=1e-3
             )
+
+    def test_failed_calculation_removes_log_handler(self, tmp_path, monkeypatch):
+        from leveelogic.deltares.dseries_calculator import logger
+
+        # an environment variable is not overwritten by the env file
+        monkeypatch.setenv("DSTABILITY_CONSOLE_EXE", str(tmp_path / "missing.exe"))
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        dsc = DSeriesCalculator(logfile=tmp_path / "calculation.log")
+        dsc.add_model(ds, "model")
+        num_handlers = len(logger.handlers)
+        with pytest.raises(ValueError):
+            dsc.calculate()
+        assert len(logger.handlers) == num_handlers
+
+    def test_timing(self, tmp_path):
+        """Testing the timing records using a console that does nothing"""
+        exe = shutil.which("true")
+        if exe is not None:
+            ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+            cm = CalculationModel(
+                model=ds, name="model 1", filename=str(tmp_path / "model1.stix")
+            )
+            ds.serialize(cm.filename)
+            cm.timing = CalculationTiming(
+                name=cm.name, queued_at=time(), serialize_time=0.0
+            )
+            calculate(exe, cm)
+            assert cm.result.error == ""
+            assert cm.timing.exit_code == 0
+            assert cm.timing.console_time >= 0.0
+            assert cm.timing.parse_time > 0.0
+            assert cm.timing.result_size > 0
+            assert cm.timing.total_time >= cm.timing.parse_time
+
+    def test_timing_summary(self, tmp_path):
+        dsc = DSeriesCalculator()
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        for i in range(10):
+            dsc.add_model(ds, f"model {i}")
+            dsc.calculation_models[-1].timing = CalculationTiming(
+                name=f"model {i}",
+                queued_at=0.0,
+                finished_at=10.0 + i,
+                serialize_time=0.1,
+                queue_time=0.0,
+                console_time=9.0 + i,
+                parse_time=0.2,
+                exit_code=0,
+            )
+        summary = dsc.timing_summary()
+        assert summary["count"] == 10
+        assert summary["wall_time"] == 19.0
+        assert summary["console_time"]["p50"] == pytest.approx(13.5)
+        assert summary["throughput_per_hour"] == pytest.approx(10 / 19.0 * 3600)
+
+        dsc.write_timings(tmp_path / "timings.jsonl")
+        lines = open(tmp_path / "timings.jsonl").readlines()
+        assert len(lines) == 10
+        assert json.loads(lines[0])["total_time"] == 10.0
@@ -1,6 +1,10 @@
 import pytest
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+import pickle
 
 from leveelogic.deltares.dstability import DStability
+from leveelogic.geometry.characteristic_point import CharacteristicPointType
 
 
 class TestDStability:
@@ -65,3 +69,261 @@ class TestDStability:
     def test_soilprofile1_at(self):
         ds = DStability.from_stix("tests/testdata/stix/fc_pl_sample.stix")
         sp1 = ds.soilprofile1_at(x=256)
+
+    def test_derived_properties_are_cached(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        surface = ds.surface
+        assert ds.surface is surface
+        assert ds.points is ds.points
+
+        # changing the waternet does not touch the geometry
+        ds.set_phreatic_line([(ds.left, 0.0), (ds.right, 0.0)])
+        assert ds.surface is surface
+        assert len([hl for hl in ds.headlines if hl["is_phreatic"]]) == 1
+
+        # adding a layer changes the geometry
+        num_layers = len(ds.soillayers)
+        top = ds.top
+        ds.add_layer(
+            [
+                (ds.left, top),
+                (ds.right, top),
+                (ds.right, top + 1.0),
+                (ds.left, top + 1.0),
+            ],
+            ds.soils[0]["code"],
+        )
+        assert ds.surface is not surface
+        assert len(ds.soillayers) == num_layers + 1
+        assert ds.top == top + 1.0
+
+    def test_derived_properties_per_stage(self):
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        ds.set_scenario_and_stage(0, 0)
+        surface_0 = ds.surface
+        ds.set_scenario_and_stage(1, 0)
+        assert ds.surface is not surface_0
+        assert len(ds.soillayers) == len(ds.model._get_geometry(1, 0).Layers)
+        ds.set_scenario_and_stage(0, 0)
+        assert ds.surface is surface_0
+
+    def test_invalidate(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        left = ds.left
+        for layer in ds.model._get_geometry(0, 0).Layers:
+            for p in layer.Points:
+                p.X = float(p.X) + 10.0
+        assert ds.left == left
+        ds.invalidate()
+        assert ds.left == left + 10.0
+
+    def test_geometry_store(self):
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        assert ds.geometry.num_layers == len(ds.soillayers)
+        assert ds.geometry.left == min([p[0] for p in ds.points])
+        assert ds.geometry.bottom == min([p[1] for p in ds.points])
+        assert ds.surface[0][0] == ds.left
+        assert ds.surface[-1][0] == ds.right
+        assert len(ds.geometry.surface) == len(ds.surface)
+
+    def test_z_at_many(self):
+        ds = DStability.from_stix("tests/testdata/stix/fc_pl_sample.stix")
+        xs = np.linspace(ds.left, ds.right, 1000)
+        tops = ds.z_at_many(xs)
+        assert tops.shape[0] == 1000
+        assert list(tops[500][~np.isnan(tops[500])]) == ds.z_at(xs[500])
+
+        sps = ds.soilprofiles_at(xs[1:3])
+        assert len(sps) == 2
+        assert sps[0].soillayers[-1].bottom == -999.0
+
+        tops, bottoms, soilcodes = ds.layers_at_many([256.0])
+        assert soilcodes[0][0] == ds.soilprofile1_at(256.0).soillayers[0].soilcode
+
+    def test_soil_at(self):
+        ds = DStability.from_stix("tests/testdata/stix/complex_geometry.stix")
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(ds.left, ds.right, 500)
+        zs = rng.uniform(ds.bottom, ds.top, 500)
+        soils = ds.soil_at(xs, zs)
+        assert soils == ds.soil_at(xs, zs, cell_size=0.5)
+        sp1 = ds.soilprofile1_at(xs[0])
+        for layer in sp1.soillayers[:-1]:
+            z = (layer.top + layer.bottom) / 2.0
+            assert ds.soil_at([xs[0]], [z])[0]["code"] == layer.soilcode
+        assert ds.soil_at([ds.left - 1.0], [0.0]) == [None]
+
+    def test_surface_index(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        zs = ds.surface_z_at([p[0] for p in ds.surface])
+        assert list(zs) == pytest.approx([p[1] for p in ds.surface])
+        intersections = ds.surface_intersections_many(
+            [[(ds.left, z), (ds.right, z)] for z in [1.0, 2.0, 3.0]]
+        )
+        assert intersections[2] == ds.surface_intersections(
+            [(ds.left, 3.0), (ds.right, 3.0)]
+        )
+        assert ds.get_closest_point_from_x(ds.left - 1.0) == ds.surface[0]
+
+    def test_characteristic_point_table(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        table = ds.characteristic_point_table()
+        assert table is ds.characteristic_point_table()
+        assert len(table.to_records()) == 9
+        p = ds.get_characteristic_point(
+            CharacteristicPointType.EMBANKEMENT_TOP_LAND_SIDE
+        )
+        assert (p.x, p.z) == (15.0, 5.0)
+        assert ds.ditch_points == [
+            (30.0, -10.0),
+            (32.0, -12.0),
+            (34.0, -12.0),
+            (36.0, -10.0),
+        ]
+        with pytest.raises(ValueError):
+            ds.get_characteristic_point(CharacteristicPointType.NONE)
+
+        # the table is only recalculated if the settings or the geometry change
+        ds.set_phreatic_line([(ds.left, 0.0), (ds.right, 0.0)])
+        assert table is ds.characteristic_point_table()
+        ds.model.datastructure.waternetcreatorsettings[
+            0
+        ].DitchCharacteristics.DitchLandSide = "NaN"
+        ds.invalidate(geometry=False, soils=False, waternet=False)
+        assert ds.ditch_points == []
+        assert not ds.has_ditch
+
+    def test_add_layers(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        num_layers = len(ds.soillayers)
+        top, xm = ds.top, (ds.left + ds.right) / 2.0
+        # two layers on top of the geometry and one on top of both of them
+        layer_ids = ds.add_layers(
+            [
+                [(ds.left, top), (xm, top), (xm, top + 1.0), (ds.left, top + 1.0)],
+                [(xm, top), (ds.right, top), (ds.right, top + 0.5), (xm, top + 0.5)],
+                [
+                    (ds.left, top + 1.0),
+                    (xm, top + 1.0),
+                    (xm, top + 0.5),
+                    (ds.right, top + 0.5),
+                    (ds.right, top + 2.0),
+                    (ds.left, top + 2.0),
+                ],
+            ],
+            ["H_Ro_z&k"] * 3,
+            labels=["a", "b", "c"],
+        )
+        assert len(layer_ids) == 3
+        assert len(ds.soillayers) == num_layers + 3
+        assert ds.top == top + 2.0
+        assert ds.geometry.topology.is_valid
+
+        # the layers share their points with the layers they touch
+        layers = {
+            layer.Id: [(p.X, p.Z) for p in layer.Points]
+            for layer in ds.model.datastructure.geometries[0].Layers
+        }
+        assert (xm, top + 0.5) in layers[str(layer_ids[0])]
+        assert (xm, top) in layers[str(layer_ids[0])]
+        assert len(layers[str(layer_ids[2])]) == 6
+
+        # the same points as adding the layers one by one
+        ds2 = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        for points, label in zip(
+            [
+                [(ds.left, top), (xm, top), (xm, top + 1.0), (ds.left, top + 1.0)],
+                [(xm, top), (ds.right, top), (ds.right, top + 0.5), (xm, top + 0.5)],
+            ],
+            ["a", "b"],
+        ):
+            ds2.add_layer(points, "H_Ro_z&k", label=label)
+        layers2 = {
+            layer.Label: set((p.X, p.Z) for p in layer.Points)
+            for layer in ds2.model.datastructure.geometries[0].Layers
+        }
+        assert layers2["b"] == set(layers[str(layer_ids[1])])
+
+    def test_add_layers_unknown_soil(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        num_layers = len(ds.soillayers)
+        with pytest.raises(ValueError):
+            ds.add_layers(
+                [
+                    [(0.0, 10.0), (1.0, 10.0), (1.0, 11.0)],
+                    [(2.0, 10.0), (3.0, 10.0), (3.0, 11.0)],
+                ],
+                ["H_Ro_z&k", "unknown"],
+            )
+        assert len(ds.soillayers) == num_layers
+
+    def test_fork(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        surface = ds.surface
+        fork = ds.fork()
+
+        # the substructures are shared until they are changed
+        assert fork.model.datastructure.soils is ds.model.datastructure.soils
+        assert (
+            fork.model.datastructure.geometries[0]
+            is ds.model.datastructure.geometries[0]
+        )
+
+        fork.add_layer(
+            points=[(ds.left, 5.0), (ds.right, 5.0), (ds.right, 6.0), (ds.left, 6.0)],
+            soil_code="H_Ro_z&k",
+        )
+        fork.set_phreatic_line([(ds.left, 0.0), (ds.right, 0.0)])
+        assert (
+            fork.model.datastructure.geometries[0]
+            is not ds.model.datastructure.geometries[0]
+        )
+        assert ds.surface == surface
+        assert len(ds.soillayers) + 1 == len(fork.soillayers)
+        assert ds.phreatic_line_points != fork.phreatic_line_points
+
+        # changes to the original do not affect the fork
+        ds.set_phreatic_line([(ds.left, 1.0), (ds.right, 1.0)])
+        assert fork.phreatic_line_points == [(ds.left, 0.0), (ds.right, 0.0)]
+
+    def test_default_instances(self):
+        # every model gets its own datastructure
+        ds1, ds2 = DStability(), DStability()
+        assert ds1.model is not ds2.model
+        d1, d2 = ds1.model.datastructure, ds2.model.datastructure
+        for name in ["geometries", "soillayers", "waternets", "scenarios", "soils"]:
+            assert getattr(d1, name) is not getattr(d2, name)
+        assert d1.geometries[0] is not d2.geometries[0]
+
+    def test_concurrent_forks(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        num_layers = len(ds.soillayers)
+        levels = [float(z) for z in range(-2, 6)]
+
+        def edit(level):
+            fork = ds.fork()
+            fork.add_layer(
+                points=[
+                    (ds.left, 5.0 + level),
+                    (ds.right, 5.0 + level),
+                    (ds.right, 6.0 + level),
+                    (ds.left, 6.0 + level),
+                ],
+                soil_code="H_Ro_z&k",
+            )
+            fork.set_phreatic_line([(ds.left, level), (ds.right, level)])
+            return fork.model.datastructure.json()
+
+        expected = [edit(level) for level in levels]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            assert list(executor.map(edit, levels)) == expected
+        assert len(ds.soillayers) == num_layers
+
+    def test_pickle(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        surface = ds.surface
+        fork = pickle.loads(pickle.dumps(ds.fork()))
+        # the caches are not pickled but recalculated
+        assert fork._stage_caches == {}
+        assert fork.surface == surface
+        assert fork.model.datastructure.json() == ds.model.datastructure.json()
@@ -0,0 +1,56 @@
+import pytest
+import shutil
+
+from leveelogic.deltares.results_store import ResultsStore
+from leveelogic.deltares.dstability import DStability
+
+
+class TestResultsStore:
+    def test_add_model_and_query(self, tmp_path):
+        store = ResultsStore(filename=tmp_path / "results.sqlite", project="test")
+        for analysis in ["bbf", "bishop", "sga", "spencer", "uplift", "uvps"]:
+            ds = DStability.from_stix(f"tests/testdata/stix/2024/{analysis}.stix")
+            ids = store.add_model(ds, parameters={"analysis": analysis})
+            assert len(ids) == 1
+
+        results = store.query(project="test")
+        assert len(results) == 6
+        sfs = [r.safety_factor for r in results]
+        assert sfs == sorted(sfs)
+
+        results = store.query(analysis_type="BishopBruteForce")
+        assert len(results) == 1
+        assert results[0].parameters == {"analysis": "bbf"}
+        assert "circle" in results[0].slip_plane.keys()
+
+        results = store.query(parameters={"analysis": "spencer"})
+        assert len(results) == 1
+        assert len(results[0].slip_plane["slip_plane"]) > 0
+
+        assert store.query(project="other") == []
+        assert store.remove_project("test") == 6
+
+    def test_add_stix_and_delete(self, tmp_path):
+        stix_file = tmp_path / "complex_geometry.stix"
+        shutil.copy("tests/testdata/stix/complex_geometry.stix", stix_file)
+
+        store = ResultsStore(filename=tmp_path / "results.sqlite")
+        ids = store.add_stix(stix_file, parameters={"width": 6.0}, delete_stix=True)
+        assert len(ids) == 2
+        assert not stix_file.exists()
+
+        results = store.query(parameters={"width": 6.0}, max_safety_factor=10.0)
+        assert len(results) == 2
+        assert results[0].name == "complex_geometry"
+
+    def test_input_hash(self, tmp_path):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        store = ResultsStore(filename=tmp_path / "results.sqlite")
+        assert not store.has_input(ds.input_hash())
+        store.add_model(ds)
+        assert store.has_input(ds.input_hash())
+
+        # removing the results does not change the input hash
+        input_hash = ds.input_hash()
+        ds.model.datastructure.bishop_bruteforce_results = []
+        assert ds.input_hash() == input_hash
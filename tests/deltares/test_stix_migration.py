@@ -0,0 +1,85 @@
+import pytest
+import os
+import shutil
+from pathlib import Path
+from zipfile import ZipFile
+
+from leveelogic.deltares.stix_migration import (
+    StixMigrator,
+    is_old_stix,
+    stix_hash,
+)
+from leveelogic.deltares.dstability import DStability
+
+CURRENT_STIX = "tests/testdata/stix/simple_geometry.stix"
+
+
+def create_old_stix(filename: Path, content: str = "old"):
+    with ZipFile(filename, "w") as z:
+        z.writestr("stages/stage.json", content)
+        z.writestr("geometries/geometry.json", content)
+
+
+def create_fake_console(folder: Path) -> Path:
+    # the fake console copies a current stix file to the output and logs the call
+    console = folder / "fake_console.sh"
+    console.write_text(
+        f'#!/bin/sh\necho "$1" >> "{folder / "calls.log"}"\ncp "{Path(CURRENT_STIX).absolute()}" "$2"\n'
+    )
+    console.chmod(0o755)
+    return console
+
+
+class TestStixMigration:
+    def test_is_old_stix(self, tmp_path):
+        assert not is_old_stix(CURRENT_STIX)
+        old_stix = tmp_path / "old.stix"
+        create_old_stix(old_stix)
+        assert is_old_stix(old_stix)
+        not_a_zip = tmp_path / "not_a_zip.stix"
+        not_a_zip.write_text("no zip")
+        assert not is_old_stix(not_a_zip)
+
+    def test_cached_file(self, tmp_path):
+        old_stix = tmp_path / "old.stix"
+        create_old_stix(old_stix)
+        migrator = StixMigrator(cache_folder=tmp_path / "cache")
+        assert migrator.cached_file(old_stix).name == f"{stix_hash(old_stix)}.stix"
+
+    def test_migrate_without_console(self, tmp_path):
+        old_stix = tmp_path / "old.stix"
+        create_old_stix(old_stix)
+        migrator = StixMigrator(cache_folder=tmp_path / "cache", console_path=None)
+        with pytest.raises(ValueError):
+            migrator.migrate(old_stix)
+        result = migrator.migrate_files([old_stix])[0]
+        assert result.error != ""
+        assert not result.migrated
+
+    @pytest.mark.skipif(os.name != "posix", reason="fake console is a shell script")
+    def test_migrate_files(self, tmp_path):
+        console = create_fake_console(tmp_path)
+        old_files = []
+        for i in range(4):
+            old_files.append(tmp_path / f"old_{i}.stix")
+            create_old_stix(old_files[-1], content=f"old_{i}")
+
+        migrator = StixMigrator(
+            cache_folder=tmp_path / "cache", console_path=str(console)
+        )
+        results = migrator.migrate_files(old_files + [CURRENT_STIX], max_workers=4)
+        assert [r.error for r in results] == [""] * 5
+        assert [r.migrated for r in results] == [True] * 4 + [False]
+        assert results[-1].filename == CURRENT_STIX
+        for old_file, result in zip(old_files, results):
+            assert is_old_stix(old_file)  # the original is left untouched
+            assert not is_old_stix(result.filename)
+
+        # the second time the cached files are used
+        migrator.migrate_files(old_files)
+        assert len((tmp_path / "calls.log").read_text().splitlines()) == 4
+
+        ds = DStability.from_stix(str(old_files[0]), migration_cache=tmp_path / "cache")
+        assert ds.name == "old_0"
+        assert len(ds.soillayers) > 0
+        assert len((tmp_path / "calls.log").read_text().splitlines()) == 4
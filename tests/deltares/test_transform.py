@@ -0,0 +1,66 @@
+import pytest
+import numpy as np
+
+from leveelogic.deltares.dstability import DStability
+from leveelogic.deltares.transform import AffineTransform
+from leveelogic.geolib.models.dstability.internal import (
+    PersistableNail,
+    PersistablePoint,
+    PersistableStressAtDistance,
+)
+
+
+def _nail() -> PersistableNail:
+    return PersistableNail(
+        Location=PersistablePoint(X=0.0, Z=0.0),
+        Direction=30.0,
+        Length=10.0,
+        Diameter=0.1,
+        LateralStresses=[PersistableStressAtDistance(Distance=5.0, Stress=1.0)],
+        ShearStresses=[PersistableStressAtDistance(Distance=10.0, Stress=1.0)],
+    )
+
+
+class TestAffineTransform:
+    def test_then(self):
+        t = AffineTransform.translation(dx=2.0, dz=1.0).then(
+            AffineTransform.scale(2.0, 0.5)
+        )
+        assert t.apply_x(np.array([1.0])).tolist() == [6.0]
+        assert t.apply_z(np.array([3.0])).tolist() == [2.0]
+
+    def test_invalid_z_factor(self):
+        with pytest.raises(ValueError):
+            AffineTransform(z_factor=-1.0)
+
+    def test_dstability_scale(self):
+        ds = DStability.from_stix("tests/testdata/stix/simple_geometry.stix")
+        ds_scaled = ds.fork()
+        ds_scaled.transform(AffineTransform.scale(2.0, 1.0, x=ds.left))
+        assert ds_scaled.left == ds.left
+        assert ds_scaled.right == ds.left + 2.0 * (ds.right - ds.left)
+        assert ds_scaled.top == ds.top
+        # the fork does not change the original model
+        assert ds.right != ds_scaled.right
+
+    def test_nail_length(self):
+        # the end of the nail is transformed like every other point
+        nail = _nail()
+        AffineTransform.scale(2.0, 0.5).apply([nail])
+        angle = np.radians(30.0)
+        end = (2.0 * 10.0 * np.cos(angle), 0.5 * 10.0 * np.sin(angle))
+        assert nail.Length == pytest.approx(np.hypot(*end))
+        assert nail.Direction == pytest.approx(np.degrees(np.arctan2(end[1], end[0])))
+        assert nail.LateralStresses[0].Distance == pytest.approx(nail.Length / 2.0)
+        assert nail.ShearStresses[0].Distance == pytest.approx(nail.Length)
+
+        # a uniform scale keeps the direction
+        nail = _nail()
+        AffineTransform.scale(2.0, 2.0).apply([nail])
+        assert (nail.Length, nail.Direction) == (20.0, 30.0)
+
+        # translating or mirroring keeps the length
+        nail = _nail()
+        AffineTransform.mirror(5.0).apply([nail])
+        assert (nail.Length, nail.Direction) == (10.0, 150.0)
+        assert nail.Location.X == 10.0
@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+
+from leveelogic.geometry.geometry_store import GeometryStore
+from leveelogic.geometry.edge_index import EdgeIndex
+
+
+class TestEdgeIndex:
+    def test_layers_at(self):
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        ei = EdgeIndex.from_geometry(gs)
+        assert ei.max_intervals == 2
+
+        tops, bottoms, layers = ei.layers_at([1.0, 3.0, 5.0, 10.0, 11.0])
+        assert tops.shape == (5, 2)
+        assert list(layers[0]) == [0, -1]
+        assert list(layers[2]) == [1, 0]
+        assert tops[1, 0] == pytest.approx(1.0)
+        assert bottoms[1, 0] == pytest.approx(0.0)
+        assert tops[2, 0] == pytest.approx(2.0)
+        assert bottoms[2, 1] == pytest.approx(-5.0)
+        assert tops[3, 0] == pytest.approx(0.0)  # rightmost limit
+        assert list(layers[4]) == [-1, -1]  # outside the geometry
+        assert np.isnan(tops[4]).all()
+
+    def test_layer_at(self):
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        ei = EdgeIndex.from_geometry(gs)
+        layers = ei.layer_at(
+            [1.0, 5.0, 5.0, 5.0, 1.0, 12.0], [-1.0, 1.0, 0.0, -1.0, 1.0, 0.0]
+        )
+        # on the edge between two layers the upper layer is used
+        assert list(layers) == [0, 1, 1, 0, -1, -1]
+
+        with pytest.raises(ValueError):
+            ei.layer_at([1.0], [1.0, 2.0])
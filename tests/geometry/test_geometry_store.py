@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+
+from leveelogic.geometry.geometry_store import GeometryStore
+
+
+class TestGeometryStore:
+    def test_from_layers(self):
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        assert gs.num_layers == 2
+        assert gs.layer_ids == ["1", "2"]
+        assert gs.layer(1).shape == (4, 2)
+        assert gs.points.shape == (8, 2)
+        assert (gs.left, gs.right, gs.top, gs.bottom) == (0.0, 10.0, 2.0, -5.0)
+        assert GeometryStore.to_list(gs.surface) == [
+            (0.0, 0.0),
+            (2.0, 0.0),
+            (4.0, 2.0),
+            (6.0, 2.0),
+            (8.0, 0.0),
+            (10.0, 0.0),
+        ]
+        assert len(gs.boundary) == 8
+        assert gs.topology.unshared_nodes == [(2.0, 0.0), (8.0, 0.0)]
+
+        # all views share the same memory
+        assert np.shares_memory(gs.layer(0), gs.coordinates)
+        assert np.shares_memory(gs.surface, gs.coordinates)
+
+    def test_layer_polygons(self):
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        polygons = gs.layer_polygons()
+        assert len(polygons) == 2
+        assert [p.area for p in polygons] == [50.0, 8.0]
+
+    def test_empty(self):
+        gs = GeometryStore.from_layers([])
+        assert gs.num_layers == 0
+        assert len(gs.surface) == 0
+
+    def test_overlapping_layers(self):
+        # crossing layers fall back to merging the polygons
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (5.0, 0.0), (5.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 1.0), (7.0, 1.0), (7.0, -1.0), (2.0, -1.0)]),
+            ]
+        )
+        assert gs.topology.has_overlaps
+        assert GeometryStore.to_list(gs.surface) == [
+            (0.0, 0.0),
+            (2.0, 0.0),
+            (2.0, 1.0),
+            (7.0, 1.0),
+        ]
@@ -0,0 +1,32 @@
+import pytest
+import numpy as np
+
+from leveelogic.geometry.geometry_store import GeometryStore
+from leveelogic.geometry.edge_index import EdgeIndex
+from leveelogic.geometry.layer_raster import LayerRaster, MIXED_CELL
+
+
+class TestLayerRaster:
+    def test_layer_at(self):
+        gs = GeometryStore.from_layers(
+            [
+                ("1", [(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                ("2", [(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        ei = EdgeIndex.from_geometry(gs)
+        lr = LayerRaster.from_edge_index(
+            ei, bottom=gs.bottom, top=gs.top, cell_size=0.5
+        )
+        assert (lr.cells == MIXED_CELL).any()
+        assert (lr.cells == 0).any()
+
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-1.0, 11.0, 1000)
+        zs = rng.uniform(-6.0, 3.0, 1000)
+        assert (lr.layer_at(xs, zs) == ei.layer_at(xs, zs)).all()
+
+    def test_invalid_cell_size(self):
+        ei = EdgeIndex.from_geometry(GeometryStore())
+        with pytest.raises(ValueError):
+            LayerRaster.from_edge_index(ei, bottom=0.0, top=1.0, cell_size=0.0)
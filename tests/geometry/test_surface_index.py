@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+
+from leveelogic.geometry.surface_index import SurfaceIndex
+
+SURFACE = [(0.0, 0.0), (5.0, 0.0), (5.0, 1.0), (10.0, 5.0), (15.0, 5.0), (20.0, 0.0)]
+
+
+class TestSurfaceIndex:
+    def test_nearest(self):
+        si = SurfaceIndex.from_surface(SURFACE)
+        assert si.nearest(-1.0) == (0.0, 0.0)
+        assert si.nearest(2.5) == (0.0, 0.0)  # equal distance, first point
+        assert si.nearest(4.0) == (5.0, 0.0)
+        assert si.nearest(12.6) == (15.0, 5.0)
+        assert si.nearest(25.0) == (20.0, 0.0)
+
+    def test_points_between(self):
+        si = SurfaceIndex.from_surface(SURFACE)
+        assert si.points_between(0.0, 10.0) == [(5.0, 0.0), (5.0, 1.0)]
+        assert si.points_between(5.0, 10.0) == []
+
+    def test_z_at(self):
+        si = SurfaceIndex.from_surface(SURFACE)
+        zs = si.z_at([-1.0, 2.5, 5.0, 7.5, 12.0, 17.5])
+        assert np.isnan(zs[0])
+        assert list(zs[1:]) == pytest.approx([0.0, 1.0, 3.0, 5.0, 2.5])
+
+    def test_intersections(self):
+        si = SurfaceIndex.from_surface(SURFACE)
+        assert si.intersections([(0.0, 2.5), (20.0, 2.5)]) == [
+            pytest.approx((6.875, 2.5)),
+            pytest.approx((17.5, 2.5)),
+        ]
+        # the points of the polyline are not included unless they are surface points
+        assert si.intersections([(2.5, 1.0), (5.0, 1.0)]) == [(5.0, 1.0)]
+        assert si.intersections([(2.5, 1.0), (6.0, 1.0)]) == [(5.0, 1.0)]
+        assert si.intersections([(2.5, 1.0), (4.0, 1.0)]) == []
+        result = si.intersections_many(
+            [[(0.0, 6.0), (20.0, 6.0)], [(12.0, 10.0), (12.0, -1.0)]]
+        )
+        assert result[0] == []
+        assert result[1] == [(12.0, 5.0)]
+        assert si.level_intersections([2.5])[0] == pytest.approx([6.875, 17.5])
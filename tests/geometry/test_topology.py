@@ -0,0 +1,143 @@
+import pytest
+import numpy as np
+
+from leveelogic.geometry.topology import (
+    build_boundary,
+    insert_nodes,
+    signed_area,
+    simplify_layers,
+)
+
+
+class TestTopology:
+    def test_boundary(self):
+        boundary, report = build_boundary(
+            [
+                np.array([(0.0, 0.0), (5.0, 0.0), (5.0, -5.0), (0.0, -5.0)]),
+                # counterclockwise layer sharing the edge (5,0)-(5,-5)
+                np.array([(5.0, 0.0), (5.0, -5.0), (10.0, -5.0), (10.0, 0.0)]),
+            ]
+        )
+        assert report.is_valid
+        assert signed_area(boundary) == pytest.approx(-50.0)
+        assert {tuple(p) for p in boundary.tolist()} == {
+            (0.0, 0.0),
+            (5.0, 0.0),
+            (10.0, 0.0),
+            (10.0, -5.0),
+            (5.0, -5.0),
+            (0.0, -5.0),
+        }
+
+    def test_unshared_nodes(self):
+        # the points of the top layer are not part of the bottom layer
+        boundary, report = build_boundary(
+            [
+                np.array([(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+                np.array([(2.0, 0.0), (4.0, 2.0), (6.0, 2.0), (8.0, 0.0)]),
+            ]
+        )
+        assert report.unshared_nodes == [(2.0, 0.0), (8.0, 0.0)]
+        assert report.dangling_nodes == []
+        assert not report.has_overlaps
+        assert not report.is_valid
+        assert len(boundary) == 8
+
+    def test_gaps(self):
+        # a frame of four layers around a hole
+        boundary, report = build_boundary(
+            [
+                np.array([(0.0, 3.0), (3.0, 3.0), (3.0, 2.0), (0.0, 2.0)]),
+                np.array([(0.0, 1.0), (3.0, 1.0), (3.0, 0.0), (0.0, 0.0)]),
+                np.array([(0.0, 2.0), (1.0, 2.0), (1.0, 1.0), (0.0, 1.0)]),
+                np.array([(2.0, 2.0), (3.0, 2.0), (3.0, 1.0), (2.0, 1.0)]),
+            ]
+        )
+        assert len(report.gaps) == 1
+        assert signed_area(np.array(report.gaps[0])) == pytest.approx(1.0)
+        assert not report.has_overlaps
+        assert signed_area(boundary) == pytest.approx(-9.0)
+
+    def test_overlaps(self):
+        # the same layer twice
+        layer = np.array([(0.0, 0.0), (5.0, 0.0), (5.0, -5.0), (0.0, -5.0)])
+        _, report = build_boundary([layer, layer])
+        assert len(report.overlaps) == 4
+
+        # crossing layers do not share edges
+        _, report = build_boundary(
+            [
+                layer,
+                np.array([(2.0, 1.0), (7.0, 1.0), (7.0, -1.0), (2.0, -1.0)]),
+            ]
+        )
+        assert len(report.crossings) == 4
+        assert report.has_overlaps
+
+    def test_dangling_nodes(self):
+        # the triangle overlaps the first layer so the boundary can not be closed
+        boundary, report = build_boundary(
+            [
+                np.array([(0.0, 0.0), (5.0, 0.0), (5.0, -5.0), (0.0, -5.0)]),
+                np.array([(5.0, 0.0), (10.0, 0.0), (10.0, -5.0), (5.0, -5.0)]),
+                np.array([(0.0, 0.0), (5.0, -5.0), (0.0, -5.0)]),
+            ]
+        )
+        assert report.overlaps == [
+            ((0.0, -5.0), (0.0, 0.0)),
+            ((0.0, -5.0), (5.0, -5.0)),
+        ]
+        assert report.dangling_nodes == [(5.0, -5.0)]
+        assert len(boundary) == 0
+
+    def test_empty(self):
+        boundary, report = build_boundary([])
+        assert len(boundary) == 0
+        assert report.is_valid
+
+    def test_insert_nodes(self):
+        layers = [
+            np.array([(0.0, 0.0), (10.0, 0.0), (10.0, -5.0), (0.0, -5.0)]),
+            np.array([(0.0, -5.0), (10.0, -5.0), (10.0, -10.0), (0.0, -10.0)]),
+        ]
+        # (4,-5) is on the shared edge, (0,0) is already a point, (20,0) is on no edge
+        result = insert_nodes(layers, np.array([(4.0, -5.0), (0.0, 0.0), (20.0, 0.0)]))
+        assert sorted(result.keys()) == [0, 1]
+        assert result[0].tolist() == [
+            [0.0, 0.0],
+            [10.0, 0.0],
+            [10.0, -5.0],
+            [4.0, -5.0],
+            [0.0, -5.0],
+        ]
+        assert result[1].tolist() == [
+            [0.0, -5.0],
+            [4.0, -5.0],
+            [10.0, -5.0],
+            [10.0, -10.0],
+            [0.0, -10.0],
+        ]
+
+    def test_simplify_layers(self):
+        top = np.array([(0.0, 1.0), (10.0, 1.0), (10.0, 0.0), (5.0, 0.03), (0.0, 0.0)])
+        bottom = np.array(
+            [(0.0, 0.0), (5.0, 0.03), (10.0, 0.0), (10.0, -1.0), (0.0, -1.0)]
+        )
+        # the point on the shared edge is removed from both layers
+        result = simplify_layers([top, bottom], 0.05)
+        assert top[result[0]].tolist() == [[0, 1], [10, 1], [10, 0], [0, 0]]
+        assert bottom[result[1]].tolist() == [[0, 0], [10, 0], [10, -1], [0, -1]]
+        # unless it is outside the tolerance or fixed
+        assert simplify_layers([top, bottom], 0.01) == {}
+        assert simplify_layers([top, bottom], 0.05, np.array([(5.0, 0.03)])) == {}
+
+    def test_simplify_layers_keeps_thin_layers(self):
+        # simplifying both edges of the thin layer would collapse it
+        layers = [
+            np.array([(0.0, 1.0), (10.0, 1.0), (10.0, 0.0), (5.0, 0.02), (0.0, 0.0)]),
+            np.array([(0.0, 0.0), (5.0, 0.02), (10.0, 0.0), (5.0, -0.02)]),
+            np.array(
+                [(0.0, 0.0), (5.0, -0.02), (10.0, 0.0), (10.0, -1.0), (0.0, -1.0)]
+            ),
+        ]
+        assert simplify_layers(layers, 0.05) == {}